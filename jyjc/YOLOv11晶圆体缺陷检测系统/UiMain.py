@@ -1,12 +1,13 @@
 # UiMain.py
 import time
 
+import numpy as np
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-                             QLabel, QPushButton, QSlider, QTableWidget,
-                             QTableWidgetItem, QGroupBox, QComboBox,
+                             QLabel, QPushButton, QSlider, QTableView,
+                             QGroupBox, QComboBox,
                              QDoubleSpinBox, QSizeGrip, QToolButton,QGraphicsDropShadowEffect )
-from PyQt5.QtCore import Qt, QPoint
-from PyQt5.QtGui import (QPixmap, QImage, QIcon, QColor)
+from PyQt5.QtCore import Qt, QPoint, QAbstractTableModel, QModelIndex, QTimer
+from PyQt5.QtGui import (QPixmap, QImage, QIcon, QColor, QGuiApplication)
 
 
 
@@ -25,6 +26,92 @@ class FramelessWindow(QMainWindow):
         self.oldPos = event.globalPos()
 
 
+class DetectionTableModel(QAbstractTableModel):
+    # 检测结果表格模型: 数据为(n, 4)数组[类别id, 置信度, x, y], 只通知变化的行
+    headers = ["类别", "置信度", "位置(x)", "位置(y)"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = np.zeros((0, 4), np.float32)
+        self.names = {}
+        self.pending = None
+        self.foreground = QColor("#ffffff")
+
+        # 合并更新: 一个刷新周期内只应用最新一帧的结果
+        screen = QGuiApplication.primaryScreen()
+        refresh_rate = screen.refreshRate() if screen else 60
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(max(int(1000 / (refresh_rate or 60)), 1))
+        self.timer.timeout.connect(self.flush)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            value = self.rows[index.row(), index.column()]
+            if index.column() == 0:
+                return str(self.names.get(int(value), int(value)))
+            return f"{value:.2f}" if index.column() == 1 else f"{value:.1f}"
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role == Qt.ForegroundRole:
+            return self.foreground
+        return None
+
+    def submit_detections(self, detections, names=None):
+        # 暂存最新结果, 等到下一个刷新周期再更新表格
+        self.pending = (detections, names)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        if self.pending is not None:
+            detections, names = self.pending
+            self.pending = None
+            self.set_detections(detections, names)
+
+    def set_detections(self, detections, names=None):
+        # 与当前数据逐行比较: 增删尾部行, 公共部分只对变化的行范围发送dataChanged
+        new = np.asarray(detections, np.float32).reshape(-1, 4)
+        if names is not None and names != self.names:
+            self.names = names
+            self.rows = self.rows.copy()
+            self.rows[:, 0] = -1  # 类别名变化, 强制刷新全部类别列
+        old, n_old, n_new = self.rows, len(self.rows), len(new)
+        if n_new < n_old:
+            self.beginRemoveRows(QModelIndex(), n_new, n_old - 1)
+            self.rows = old[:n_new]
+            self.endRemoveRows()
+        common = min(n_old, n_new)
+        changed = np.flatnonzero((old[:common] != new[:common]).any(1))
+        if n_new > n_old:
+            self.beginInsertRows(QModelIndex(), n_old, n_new - 1)
+            self.rows = new
+            self.endInsertRows()
+        else:
+            self.rows = new
+        if len(changed):
+            self.dataChanged.emit(self.index(int(changed[0]), 0),
+                                  self.index(int(changed[-1]), len(self.headers) - 1))
+
+    def clear(self):
+        self.timer.stop()
+        self.pending = None
+        self.set_detections(np.zeros((0, 4), np.float32))
+
+
 class UiMainWindow(FramelessWindow):
     def __init__(self):
         super().__init__()
@@ -226,12 +313,14 @@ class UiMainWindow(FramelessWindow):
         self.image_btn = self.create_button("图片检测", "#00c8ff")
         self.video_btn = self.create_button("视频检测", "#00a0c0")
         self.camera_btn = self.create_button("摄像头检测", "#00c8a0")
+        self.lot_btn = self.create_button("批量检测", "#00c878")
         self.stop_btn = self.create_button("停止检测", "#ff4a4a")
         self.save_btn = self.create_button("保存结果", "#a04aff")
 
         self.buttons_layout.addWidget(self.image_btn)
         self.buttons_layout.addWidget(self.video_btn)
         self.buttons_layout.addWidget(self.camera_btn)
+        self.buttons_layout.addWidget(self.lot_btn)
         self.buttons_layout.addWidget(self.stop_btn)
         self.buttons_layout.addWidget(self.save_btn)
 
@@ -244,10 +333,10 @@ class UiMainWindow(FramelessWindow):
         self.results_layout = QVBoxLayout()
         self.results_layout.setContentsMargins(12, 15, 12, 12)
 
-        self.results_table = QTableWidget()
+        self.results_model = DetectionTableModel(self)
+        self.results_table = QTableView()
         self.results_table.setStyleSheet(self.get_table_style())
-        self.results_table.setColumnCount(4)
-        self.results_table.setHorizontalHeaderLabels(["类别", "置信度", "位置(x)", "位置(y)"])
+        self.results_table.setModel(self.results_model)
         self.results_table.verticalHeader().setVisible(False)
         self.results_table.setColumnWidth(0, 120)
         self.results_table.setColumnWidth(1, 100)
@@ -423,7 +512,7 @@ class UiMainWindow(FramelessWindow):
 
     def get_table_style(self):
         return """
-            QTableWidget {
+            QTableView {
                 background-color: #0f0f1a;
                 color: #e0e0e0;
                 border: 1px solid #00c8ff;
@@ -431,11 +520,11 @@ class UiMainWindow(FramelessWindow):
                 gridline-color: #1a1a2a;
                 font-size: 12px;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 5px;
                 border-bottom: 1px solid #1a1a2a;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #00a0c0;
                 color: white;
             }
@@ -534,28 +623,22 @@ class UiMainWindow(FramelessWindow):
         if image is not None:
             h, w, ch = image.shape
             bytes_per_line = ch * w
-            q_img = QImage(image.data, w, h, bytes_per_line, QImage.Format_RGB888)
+            q_img = QImage(image.data, w, h, bytes_per_line, QImage.Format_BGR888)
             pixmap = QPixmap.fromImage(q_img)
             label.setPixmap(pixmap.scaled(label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
 
+    def display_buffer(self, label, buffer):
+        # 显示已缩放到标签尺寸的BGR缓冲: 不做颜色转换和二次缩放
+        h, w = buffer.shape[:2]
+        q_img = QImage(buffer.data, w, h, buffer.strides[0], QImage.Format_BGR888)
+        label.setPixmap(QPixmap.fromImage(q_img))
+
     def clear_results(self):
-        self.results_table.setRowCount(0)
-
-    def add_detection_result(self, class_name, confidence, x, y):
-        row = self.results_table.rowCount()
-        self.results_table.insertRow(row)
-
-        items = [
-            QTableWidgetItem(class_name),
-            QTableWidgetItem(f"{confidence:.2f}"),
-            QTableWidgetItem(f"{x:.1f}"),
-            QTableWidgetItem(f"{y:.1f}")
-        ]
-
-        for i, item in enumerate(items):
-            item.setTextAlignment(Qt.AlignCenter)
-            item.setForeground(QColor("#ffffff"))
-            self.results_table.setItem(row, i, item)
+        self.results_model.clear()
+
+    def show_detections(self, detections, names):
+        # detections: (n, 4)数组[类别id, 置信度, x, y], 按显示刷新率合并更新
+        self.results_model.submit_detections(detections, names)
 
     def update_status(self, message):
         self.status_bar.showMessage(f"状态: {message} | 最后更新: {time.strftime('%H:%M:%S')}")
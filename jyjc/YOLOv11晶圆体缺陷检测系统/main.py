@@ -8,90 +8,472 @@ from ultralytics import YOLO
 from UiMain import UiMainWindow
 import time
 import os
+import csv
+import tempfile
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from PyQt5.QtWidgets import QDialog
 from LoginWindow import LoginWindow
 
+
+def put_latest(q, item):
+    # 有界队列写入: 队列满时丢弃最旧的帧, 保证下游总是处理最新画面
+    while True:
+        try:
+            q.put_nowait(item)
+            return
+        except queue.Full:
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                pass
+
+
+class StageTimer:
+    # 各流水线阶段耗时统计(指数滑动平均, 单位ms)
+    def __init__(self, momentum=0.9):
+        self.momentum = momentum
+        self.latency = {}
+        self.lock = threading.Lock()
+
+    def update(self, stage, ms):
+        with self.lock:
+            last = self.latency.get(stage)
+            self.latency[stage] = ms if last is None else last * self.momentum + ms * (1 - self.momentum)
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.latency)
+
+
+class FrameRing:
+    # 预分配的显示缓冲环: 工作线程把原始帧/检测帧一次缩放到标签尺寸写入槽位, GUI线程直接按BGR888显示后归还
+    def __init__(self, slots=4):
+        self.buffers = [None] * slots  # 每个槽位: (原始帧缓冲, 检测帧缓冲)
+        self.free = queue.Queue()
+        for slot in range(slots):
+            self.free.put(slot)
+
+    def acquire(self, timeout=None):
+        # 取一个空闲槽位, 超时返回None
+        try:
+            return self.free.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def release(self, slot):
+        self.free.put(slot)
+
+    def write(self, slot, original, annotated, view_size):
+        # 按标签尺寸等比缩放, 直接写入预分配缓冲(尺寸变化时才重新分配)
+        h0, w0 = original.shape[:2]
+        scale = min(view_size[0] / w0, view_size[1] / h0)
+        w, h = max(int(w0 * scale), 1), max(int(h0 * scale), 1)
+        buffers = self.buffers[slot]
+        if buffers is None or buffers[0].shape[:2] != (h, w):
+            buffers = self.buffers[slot] = (np.empty((h, w, 3), np.uint8), np.empty((h, w, 3), np.uint8))
+        interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+        cv2.resize(original, (w, h), dst=buffers[0], interpolation=interpolation)
+        cv2.resize(annotated, (w, h), dst=buffers[1], interpolation=interpolation)
+        return buffers
+
+
+class ModelCache:
+    # 已加载模型的LRU缓存: 按(权重路径, 修改时间)索引, 缓存的是已融合并预热的模型, 超出内存预算时淘汰最久未用的
+    def __init__(self, budget_mb=1024):
+        self.budget = budget_mb * 1024 ** 2
+        self.models = OrderedDict()  # key -> (模型, 占用字节)
+        self.pending = {}  # key -> 后台预加载Future
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1)  # 单线程后台预加载, 不与检测线程争抢太多CPU
+
+    @staticmethod
+    def key(weights):
+        # 本地文件按绝对路径+修改时间索引, 权重被重新训练覆盖后自动失效; 需下载的官方模型按名称索引
+        path = os.path.abspath(weights)
+        return (path, os.path.getmtime(path)) if os.path.isfile(path) else (weights, 0)
+
+    def build(self, weights):
+        # 加载 -> 空跑一次推理(融合Conv+BN, 建立predictor并预热), 返回模型及其参数/缓冲区占用
+        model = YOLO(weights)
+        imgsz = model.overrides.get("imgsz", 640)  # 按训练时的尺寸预热, 与之后检测时使用的尺寸一致
+        h, w = (imgsz, imgsz) if isinstance(imgsz, int) else imgsz
+        model.predict(np.zeros((h, w, 3), np.uint8), verbose=False)
+        size = sum(t.numel() * t.element_size() for t in model.predictor.model.state_dict().values())
+        return model, size
+
+    def get(self, weights):
+        key = self.key(weights)
+        with self.lock:
+            if key in self.models:
+                self.models.move_to_end(key)
+                return self.models[key][0]
+            future = self.pending.get(key)
+        # 正在后台预加载则等待其完成, 否则在当前线程加载
+        model, size = future.result() if future else self.build(weights)
+        self.put(key, model, size)
+        return model
+
+    def put(self, key, model, size):
+        with self.lock:
+            self.pending.pop(key, None)
+            for stale in [k for k in self.models if k[0] == key[0] and k != key]:
+                del self.models[stale]  # 同一路径的旧版本权重
+            self.models[key] = (model, size)
+            self.models.move_to_end(key)
+            # 超出预算时淘汰最久未用的模型, 至少保留刚放入的一个
+            while len(self.models) > 1 and sum(s for _, s in self.models.values()) > self.budget:
+                self.models.popitem(last=False)
+
+    def preload(self, weights_list):
+        # 后台依次加载尚未缓存的模型, 切换模型时可直接命中
+        for weights in weights_list:
+            try:
+                key = self.key(weights)
+            except OSError:
+                continue
+            with self.lock:
+                if key in self.models or key in self.pending:
+                    continue
+                self.pending[key] = future = self.executor.submit(self.build, weights)
+            future.add_done_callback(lambda f, key=key: self.on_preloaded(key, f))
+
+    def on_preloaded(self, key, future):
+        if future.exception() is not None:
+            with self.lock:
+                self.pending.pop(key, None)  # 预加载失败, 留给get()在前台重试并报错
+            return
+        self.put(key, *future.result())
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
 class DetectionThread(QThread):
-    frame_received = pyqtSignal(np.ndarray, np.ndarray, list)  # 原始帧, 检测帧, 检测结果
+    frame_received = pyqtSignal(int, np.ndarray, np.ndarray)  # 显示缓冲槽位, 检测帧(BGR原尺寸), 检测结果(n, 4)
+    stats_received = pyqtSignal(dict)  # 各阶段耗时(ms)与吞吐(fps)
+    error_signal = pyqtSignal(str)  # 任一阶段出错时的错误信息
     finished_signal = pyqtSignal()  # 线程完成信号
 
-    def __init__(self, model, source, conf, iou, parent=None):
+    def __init__(self, model, source, conf, iou, batch=4, queue_size=4, view_size=(640, 360), parent=None):
         super().__init__(parent)
         self.model = model
+        self.names = model.names  # 类别名只取一次, Model.names每次访问都会新建字典
         self.source = source
         self.conf = conf
         self.iou = iou
+        self.batch = batch  # 推理阶段的最大微批大小
+        self.queue_size = queue_size  # 阶段间队列长度
         self.running = True
+        self.error = None  # 采集/绘制线程中的第一个异常, 由检测线程重新抛出
+        self.timer = StageTimer()
+        self.view_size = view_size  # 显示标签尺寸(宽, 高), GUI线程随窗口变化更新
+        self.ring = FrameRing(queue_size + 2)  # 比队列多两个槽位, GUI正在显示的帧不会被覆盖
 
     def run(self):
         try:
             if isinstance(self.source, int) or self.source.endswith(('.mp4', '.avi', '.mov')):  # 视频或摄像头
-                cap = cv2.VideoCapture(self.source)
-                while self.running and cap.isOpened():
-                    ret, frame = cap.read()
-                    if not ret:
-                        break
-
-                    # 保存原始帧
-                    original_frame = frame.copy()
-
-                    # 检测
-                    results = self.model(frame, conf=self.conf, iou=self.iou)
-                    annotated_frame = results[0].plot()
-
-                    # 提取检测结果
-                    detections = []
-                    for result in results:
-                        for box in result.boxes:
-                            class_id = int(box.cls)
-                            class_name = self.model.names[class_id]
-                            confidence = float(box.conf)
-                            x, y, w, h = box.xywh[0].tolist()
-                            detections.append((class_name, confidence, x, y))
-
-                    # 发送信号
-                    self.frame_received.emit(
-                        cv2.cvtColor(original_frame, cv2.COLOR_BGR2RGB),
-                        cv2.cvtColor(annotated_frame, cv2.COLOR_BGR2RGB),
-                        detections
-                    )
-
-                    # 控制帧率
-                    time.sleep(0.03)  # 约30fps
-
-                cap.release()
+                self.run_stream()
             else:  # 图片
                 frame = cv2.imread(self.source)
                 if frame is not None:
-                    original_frame = frame.copy()
                     results = self.model(frame, conf=self.conf, iou=self.iou)
-                    annotated_frame = results[0].plot()
-
-                    # 提取检测结果
-                    detections = []
-                    for result in results:
-                        for box in result.boxes:
-                            class_id = int(box.cls)
-                            class_name = self.model.names[class_id]
-                            confidence = float(box.conf)
-                            x, y, w, h = box.xywh[0].tolist()
-                            detections.append((class_name, confidence, x, y))
-
-                    self.frame_received.emit(
-                        cv2.cvtColor(original_frame, cv2.COLOR_BGR2RGB),
-                        cv2.cvtColor(annotated_frame, cv2.COLOR_BGR2RGB),
-                        detections
-                    )
+                    self.emit_result(frame, results[0])
 
         except Exception as e:
-            print(f"Detection error: {e}")
+            self.error_signal.emit(f"检测出错: {e}")
         finally:
             self.finished_signal.emit()
 
+    def run_stream(self):
+        # 三级流水线: 采集线程 -> 推理(本线程, 微批) -> 绘制/发送线程
+        cap = cv2.VideoCapture(self.source)
+        live = isinstance(self.source, int)
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        # 摄像头由硬件控制节奏; 视频文件按原始帧率播放
+        frame_interval = 1.0 / fps if not live and fps and fps > 0 else 0.0
+
+        capture_queue = queue.Queue(maxsize=self.queue_size)
+        render_queue = queue.Queue(maxsize=self.queue_size)
+        capture_thread = threading.Thread(
+            target=self.run_stage, args=(self.capture_loop, cap, capture_queue, live), daemon=True)
+        render_thread = threading.Thread(
+            target=self.run_stage, args=(self.render_loop, render_queue, live, frame_interval), daemon=True)
+        capture_thread.start()
+        render_thread.start()
+
+        try:
+            while self.running:
+                frames = self.take_batch(capture_queue)
+                if frames is None:
+                    break
+                if not frames:
+                    continue
+
+                # 检测(微批)
+                t0 = time.perf_counter()
+                results = self.model(frames, conf=self.conf, iou=self.iou, verbose=False)
+                self.timer.update("infer", (time.perf_counter() - t0) * 1000 / len(frames))
+
+                for frame, result in zip(frames, results):
+                    if live:
+                        put_latest(render_queue, (frame, result))
+                    else:
+                        self.put_blocking(render_queue, (frame, result))
+        finally:
+            if self.running:  # 正常结束: 等待绘制线程处理完剩余帧, 绘制线程出错退出时不再等待
+                self.put_blocking(render_queue, None)
+                render_thread.join()
+            else:  # 手动停止或某阶段出错: 丢弃积压帧
+                put_latest(render_queue, None)
+            self.running = False
+            capture_thread.join()
+            render_thread.join()
+            cap.release()
+        if self.error is not None:
+            raise self.error
+
+    def run_stage(self, loop, *args):
+        # 采集/绘制线程入口: 出错时记录异常并停止整条流水线, 其他阶段不会在满队列上一直阻塞
+        try:
+            loop(*args)
+        except Exception as e:
+            if self.error is None:
+                self.error = e
+            self.running = False
+
+    def capture_loop(self, cap, capture_queue, live):
+        try:
+            while self.running and cap.isOpened():
+                t0 = time.perf_counter()
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                self.timer.update("capture", (time.perf_counter() - t0) * 1000)
+                if live:
+                    put_latest(capture_queue, frame)  # 实时源: 丢弃过期帧
+                else:
+                    self.put_blocking(capture_queue, frame)  # 文件源: 反压, 不丢帧
+        finally:
+            self.put_blocking(capture_queue, None)
+
+    def take_batch(self, capture_queue):
+        # 阻塞等待第一帧, 然后非阻塞凑满微批; 返回None表示采集结束
+        try:
+            frame = capture_queue.get(timeout=0.1)
+        except queue.Empty:
+            return []
+        if frame is None:
+            return None
+        frames = [frame]
+        while len(frames) < self.batch:
+            try:
+                frame = capture_queue.get_nowait()
+            except queue.Empty:
+                break
+            if frame is None:
+                capture_queue.put(None)  # 留给下一次调用结束循环
+                break
+            frames.append(frame)
+        return frames
+
+    def put_blocking(self, q, item):
+        # 反压写入; 停止检测后直接放弃
+        while self.running:
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def render_loop(self, render_queue, live, frame_interval):
+        next_due = time.perf_counter()
+        last_report = next_due
+        count = 0
+        while True:
+            item = render_queue.get()
+            if item is None:
+                break
+            frame, result = item
+
+            t0 = time.perf_counter()
+            self.emit_result(frame, result)
+            self.timer.update("render", (time.perf_counter() - t0) * 1000)
+
+            # 控制帧率: 按截止时间调度而不是固定sleep
+            if frame_interval:
+                next_due = max(next_due + frame_interval, time.perf_counter())
+                delay = next_due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+            count += 1
+            now = time.perf_counter()
+            if now - last_report >= 1.0:
+                stats = self.timer.snapshot()
+                stats["fps"] = count / (now - last_report)
+                self.stats_received.emit(stats)
+                last_report, count = now, 0
+
+    def emit_result(self, frame, result):
+        annotated_frame = result.plot()
+
+        # 提取检测结果: (n, 4)数组[类别id, 置信度, 中心x, 中心y]
+        boxes = result.boxes
+        detections = np.column_stack(
+            (boxes.cls.cpu().numpy(), boxes.conf.cpu().numpy(), boxes.xywh[:, :2].cpu().numpy())
+        ).astype(np.float32)
+
+        # 等待空闲显示槽位(GUI归还后才复用), 停止检测后放弃
+        slot = None
+        while slot is None:
+            if not self.running:
+                return
+            slot = self.ring.acquire(timeout=0.1)
+        self.ring.write(slot, frame, annotated_frame, self.view_size)
+
+        # 发送信号: 只传槽位和引用, 不做颜色转换和拷贝
+        self.frame_received.emit(slot, annotated_frame, detections)
+
+    def stop(self):
+        self.running = False
+
+
+class BatchLotThread(QThread):
+    progress_signal = pyqtSignal(int, int, float)  # 已完成数(含无法读取的文件), 总数, 吞吐(张/秒)
+    error_signal = pyqtSignal(str)  # 错误信息: 无法读取的文件或批次异常
+    finished_signal = pyqtSignal(str)  # 结果文件路径, 失败时为空
+
+    IMAGE_EXTS = ('.jpg', '.jpeg', '.png', '.bmp')
+    FIELDS = ["file", "class", "confidence", "detections"]
+
+    def __init__(self, model, folder, save_path, conf, iou, batch=16, workers=4, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.names = model.names
+        self.folder = folder
+        self.save_path = save_path
+        self.conf = conf
+        self.iou = iou
+        self.batch = batch  # 推理批大小
+        self.workers = workers  # JPEG解码线程数
+        self.running = True
+
+    def run(self):
+        listing = None
+        try:
+            files = sorted(f for f in os.listdir(self.folder) if f.lower().endswith(self.IMAGE_EXTS))
+            if not files:
+                raise FileNotFoundError(f"文件夹中没有图片: {self.folder}")
+            paths = [os.path.abspath(os.path.join(self.folder, f)) for f in files]
+            position = {p: i for i, p in enumerate(paths)}
+            # 文件清单交给同一个预测器流式处理: 解码线程预取, 内存只占几个批次
+            with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False, encoding='utf-8') as f:
+                f.write("\n".join(paths))
+                listing = f.name
+
+            skipped, done, written = [], 0, 0
+            t0 = time.perf_counter()
+            with self.open_sink() as sink:
+                results = self.model.predict(listing, stream=True, batch=self.batch, workers=self.workers,
+                                             conf=self.conf, iou=self.iou, verbose=False)
+                for result in results:
+                    if not self.running:
+                        break
+                    index = position[os.path.abspath(result.path)]
+                    skipped.extend(files[done:index])  # 预测器跳过了无法解码的文件
+                    sink.write(self.summarize(files[index], result))
+                    done, written = index + 1, written + 1
+                    if written % self.batch == 0:  # 每批落盘一次, 中途停止或崩溃只丢失当前批
+                        sink.flush()
+                        self.progress_signal.emit(done, len(files), done / (time.perf_counter() - t0))
+                if self.running:
+                    skipped.extend(files[done:])
+                    done = len(files)
+                self.progress_signal.emit(done, len(files), done / (time.perf_counter() - t0))
+
+            if skipped:
+                shown = ", ".join(skipped[:5]) + (" ..." if len(skipped) > 5 else "")
+                self.error_signal.emit(f"{len(skipped)} 张图片无法读取, 已跳过: {shown}")
+            self.finished_signal.emit(self.save_path)
+        except Exception as e:
+            self.error_signal.emit(f"批量检测出错: {e}")
+            self.finished_signal.emit("")
+        finally:
+            if listing:
+                os.remove(listing)
+
+    def summarize(self, name, result):
+        # 每张晶圆取置信度最高的检测作为该片的类别
+        boxes = result.boxes
+        if len(boxes) == 0:
+            return {"file": name, "class": "", "confidence": 0.0, "detections": 0}
+        best = int(boxes.conf.argmax())
+        return {
+            "file": name,
+            "class": self.names[int(boxes.cls[best])],
+            "confidence": round(float(boxes.conf[best]), 5),
+            "detections": len(boxes),
+        }
+
+    def open_sink(self):
+        # 结果按批追加写入: CSV逐行写, Parquet每批一个row group
+        if self.save_path.endswith('.parquet'):
+            return ParquetSink(self.save_path)
+        return CsvSink(self.save_path, self.FIELDS)
+
     def stop(self):
         self.running = False
 
 
+class CsvSink:
+    def __init__(self, path, fields):
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.file, fieldnames=fields)
+        self.writer.writeheader()
+
+    def write(self, row):
+        self.writer.writerow(row)
+
+    def flush(self):
+        self.file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.file.close()
+
+
+class ParquetSink:
+    def __init__(self, path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.schema = pa.schema([("file", pa.string()), ("class", pa.string()),
+                                 ("confidence", pa.float64()), ("detections", pa.int64())])
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.rows = []
+
+    def write(self, row):
+        self.rows.append(row)
+
+    def flush(self):
+        if self.rows:
+            self.writer.write_table(self.pa.Table.from_pylist(self.rows, schema=self.schema))
+            self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.flush()
+        self.writer.close()
+
+
 class MainWindow(UiMainWindow):
     def __init__(self):
         super().__init__()
@@ -110,17 +492,25 @@ class MainWindow(UiMainWindow):
         self.image_btn.clicked.connect(self.detect_image)
         self.video_btn.clicked.connect(self.detect_video)
         self.camera_btn.clicked.connect(self.detect_camera)
+        self.lot_btn.clicked.connect(self.detect_lot)
         self.stop_btn.clicked.connect(self.stop_detection)
         self.save_btn.clicked.connect(self.save_result)
 
-        # 初始化模型
+        # 初始化模型: 下拉框补充当前目录下的其他权重, 切换时从缓存加载
+        self.model_cache = ModelCache()
+        names = [self.model_combo.itemText(i) for i in range(self.model_combo.count())]
+        self.model_combo.addItems(sorted(f[:-3] for f in os.listdir(".") if f.endswith(".pt") and f[:-3] not in names))
         self.load_model()
+        self.model_combo.currentTextChanged.connect(self.load_model)
 
     def load_model(self):
         try:
             model_name = self.model_combo.currentText()
-            self.model = YOLO(f"{model_name}.pt")  # 自动下载或加载本地模型
+            self.model = self.model_cache.get(f"{model_name}.pt")  # 命中缓存则直接返回已预热模型, 否则自动下载或加载本地模型
             self.update_status(f"模型 {model_name} 加载成功")
+            # 后台预加载下拉框中的其他模型
+            others = [self.model_combo.itemText(i) for i in range(self.model_combo.count())]
+            self.model_cache.preload([f"{name}.pt" for name in others if name != model_name])
         except Exception as e:
             QMessageBox.critical(self, "错误", f"模型加载失败: {str(e)}")
             self.update_status("模型加载失败")
@@ -136,14 +526,15 @@ class MainWindow(UiMainWindow):
         if file_path:
             self.clear_results()
             self.current_image = cv2.imread(file_path)
-            self.current_image = cv2.cvtColor(self.current_image, cv2.COLOR_BGR2RGB)
             self.display_image(self.original_image_label, self.current_image)
 
             # 创建检测线程
             conf = self.confidence_spinbox.value()
             iou = self.iou_spinbox.value()
-            self.detection_thread = DetectionThread(self.model, file_path, conf, iou)
+            self.detection_thread = DetectionThread(self.model, file_path, conf, iou, view_size=self.view_size())
             self.detection_thread.frame_received.connect(self.on_frame_received)
+            self.detection_thread.stats_received.connect(self.on_stats_received)
+            self.detection_thread.error_signal.connect(self.on_detection_error)
             self.detection_thread.finished_signal.connect(self.on_detection_finished)
             self.detection_thread.start()
 
@@ -180,8 +571,10 @@ class MainWindow(UiMainWindow):
             # 创建检测线程
             conf = self.confidence_spinbox.value()
             iou = self.iou_spinbox.value()
-            self.detection_thread = DetectionThread(self.model, file_path, conf, iou)
+            self.detection_thread = DetectionThread(self.model, file_path, conf, iou, view_size=self.view_size())
             self.detection_thread.frame_received.connect(self.on_frame_received)
+            self.detection_thread.stats_received.connect(self.on_stats_received)
+            self.detection_thread.error_signal.connect(self.on_detection_error)
             self.detection_thread.finished_signal.connect(self.on_detection_finished)
             self.detection_thread.start()
 
@@ -198,13 +591,56 @@ class MainWindow(UiMainWindow):
         # 创建检测线程 (默认使用摄像头0)
         conf = self.confidence_spinbox.value()
         iou = self.iou_spinbox.value()
-        self.detection_thread = DetectionThread(self.model, 0, conf, iou)
+        self.detection_thread = DetectionThread(self.model, 0, conf, iou, view_size=self.view_size())
         self.detection_thread.frame_received.connect(self.on_frame_received)
+        self.detection_thread.stats_received.connect(self.on_stats_received)
+        self.detection_thread.error_signal.connect(self.on_detection_error)
         self.detection_thread.finished_signal.connect(self.on_detection_finished)
         self.detection_thread.start()
 
         self.update_status("正在从摄像头检测...")
 
+    def detect_lot(self):
+        if self.detection_thread and self.detection_thread.isRunning():
+            QMessageBox.warning(self, "警告", "请先停止当前检测任务")
+            return
+
+        folder = QFileDialog.getExistingDirectory(self, "选择批次文件夹")
+        if not folder:
+            return
+
+        save_dir = "results"
+        os.makedirs(save_dir, exist_ok=True)
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        save_path, _ = QFileDialog.getSaveFileName(
+            self, "保存批次结果", os.path.join(save_dir, f"lot_{timestamp}.csv"),
+            "CSV文件 (*.csv);;Parquet文件 (*.parquet)")
+        if not save_path:
+            return
+
+        self.clear_results()
+        conf = self.confidence_spinbox.value()
+        iou = self.iou_spinbox.value()
+        self.detection_thread = BatchLotThread(self.model, folder, save_path, conf, iou)
+        self.detection_thread.progress_signal.connect(self.on_lot_progress)
+        self.detection_thread.error_signal.connect(self.on_lot_error)
+        self.detection_thread.finished_signal.connect(self.on_lot_finished)
+        self.detection_thread.start()
+
+        self.update_status(f"正在批量检测: {os.path.basename(folder)}")
+
+    def on_lot_progress(self, done, total, throughput):
+        self.update_status(f"批量检测 {done}/{total} | {throughput:.1f} 张/秒")
+
+    def on_lot_error(self, message):
+        QMessageBox.warning(self, "批量检测", message)
+
+    def on_lot_finished(self, save_path):
+        if save_path:
+            self.update_status(f"批量检测完成，结果已保存: {save_path}")
+        else:
+            self.update_status("批量检测失败")
+
     def stop_detection(self):
         if self.detection_thread and self.detection_thread.isRunning():
             self.detection_thread.stop()
@@ -219,22 +655,37 @@ class MainWindow(UiMainWindow):
         self.is_video_running = False
         self.update_status("检测已停止")
 
-    def on_frame_received(self, original_frame, result_frame, detections):
-        # 更新原始图像和结果图像
-        self.display_image(self.original_image_label, original_frame)
-        self.display_image(self.result_image_label, result_frame)
+    def on_frame_received(self, slot, result_frame, detections):
+        # 更新原始图像和结果图像: 缓冲已在工作线程缩放好, 转成QPixmap后立即归还槽位
+        thread = self.sender()
+        original_buffer, result_buffer = thread.ring.buffers[slot]
+        self.display_buffer(self.original_image_label, original_buffer)
+        self.display_buffer(self.result_image_label, result_buffer)
+        thread.ring.release(slot)
+        thread.view_size = (self.result_image_label.width(), self.result_image_label.height())
 
         # 保存当前结果帧用于后续保存
         self.last_detection_result = result_frame  # 新增：保存检测结果
 
-        # 更新表格
-        self.clear_results()
-        for class_name, confidence, x, y in detections:
-            self.add_detection_result(class_name, confidence, x, y)
+        # 更新表格: 只刷新变化的行, 并按显示刷新率合并
+        self.show_detections(detections, thread.names)
 
         # 保存视频帧
         if self.video_writer:
-            self.video_writer.write(cv2.cvtColor(result_frame, cv2.COLOR_RGB2BGR))
+            self.video_writer.write(result_frame)
+
+    def view_size(self):
+        return self.result_image_label.width(), self.result_image_label.height()
+
+    def on_stats_received(self, stats):
+        # 显示流水线各阶段耗时
+        self.update_status(
+            f"{stats.get('fps', 0):.1f} FPS | 采集 {stats.get('capture', 0):.1f}ms"
+            f" | 推理 {stats.get('infer', 0):.1f}ms | 绘制 {stats.get('render', 0):.1f}ms"
+        )
+
+    def on_detection_error(self, message):
+        QMessageBox.warning(self, "检测", message)
 
     def on_detection_finished(self):
         if self.video_writer:
@@ -258,16 +709,17 @@ class MainWindow(UiMainWindow):
         if self.is_camera_running or self.is_video_running:
             # 保存当前帧为图片
             save_path = os.path.join(save_dir, f"snapshot_{timestamp}.jpg")
-            cv2.imwrite(save_path, cv2.cvtColor(self.last_detection_result, cv2.COLOR_RGB2BGR))
+            cv2.imwrite(save_path, self.last_detection_result)
             self.update_status(f"截图已保存: {save_path}")
         else:
             # 保存图片检测结果
             save_path = os.path.join(save_dir, f"result_{timestamp}.jpg")
-            cv2.imwrite(save_path, cv2.cvtColor(self.last_detection_result, cv2.COLOR_RGB2BGR))
+            cv2.imwrite(save_path, self.last_detection_result)
             self.update_status(f"检测结果已保存: {save_path}")
 
     def closeEvent(self, event):
         self.stop_detection()
+        self.model_cache.shutdown()
         event.accept()
 
 
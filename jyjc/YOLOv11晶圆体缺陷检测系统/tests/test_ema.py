@@ -0,0 +1,32 @@
+# Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
+
+from pathlib import Path
+
+import pytest
+import torch
+
+from ultralytics.nn.tasks import DetectionModel
+from ultralytics.utils.torch_utils import ModelEMA
+
+CFG = Path(__file__).resolve().parents[1] / "ultralytics" / "cfg" / "models" / "11"
+
+
+@pytest.mark.parametrize("foreach", [True, False])
+def test_ema_update_after_half_float(foreach):
+    """Test that the EMA keeps updating after half()/float() swap its tensors, as the validator does with AMP."""
+    model = DetectionModel(str(CFG / "yolo11.yaml"), nc=9, verbose=False)
+    ema = ModelEMA(model, foreach=foreach)
+    ema.update(model)
+    ema.ema.half()
+    ema.ema.float()
+    with torch.no_grad():
+        for v in model.state_dict().values():
+            if v.dtype.is_floating_point:
+                v.add_(1)
+    before = {k: v.clone() for k, v in ema.ema.state_dict().items()}
+    ema.update(model)
+    d = ema.decay(ema.updates)
+    for k, v in ema.ema.state_dict().items():
+        if v.dtype.is_floating_point:
+            expected = d * before[k] + (1 - d) * model.state_dict()[k]
+            torch.testing.assert_close(v, expected, msg=f"EMA tensor '{k}' was not updated")
@@ -0,0 +1,64 @@
+# Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
+
+from copy import deepcopy
+from pathlib import Path
+
+import pytest
+import torch
+import torch.nn as nn
+
+from ultralytics.nn.modules.block import ChannelAttention, CoordAtt, myCBAM
+from ultralytics.nn.tasks import DetectionModel
+
+CFG = Path(__file__).resolve().parents[1] / "ultralytics" / "cfg" / "models" / "11"
+
+
+def randomize_bn(model):
+    """Give every BatchNorm non-trivial affine parameters and running statistics so fusing them is not a no-op."""
+    torch.manual_seed(0)
+    for m in model.modules():
+        if isinstance(m, nn.BatchNorm2d):
+            m.weight.data.uniform_(0.5, 1.5)
+            m.bias.data.uniform_(-0.5, 0.5)
+            m.running_mean.uniform_(-0.5, 0.5)
+            m.running_var.uniform_(0.5, 1.5)
+    return model.eval()
+
+
+@pytest.mark.parametrize("channels, h, w", [(64, 20, 20), (128, 13, 17)])
+def test_coordatt_fuse(channels, h, w):
+    """Test that the fused CoordAtt with merged conv_h/conv_w matches the unfused module on non-square inputs."""
+    m = randomize_bn(CoordAtt(channels))
+    x = torch.randn(2, channels, h, w)
+    with torch.no_grad():
+        y = m(x)
+        m.fuse()
+        y_fused = m.forward_fuse(x)
+    assert not hasattr(m, "bn1") and m.conv_hw.out_channels == 2 * channels
+    torch.testing.assert_close(y_fused, y, rtol=1e-4, atol=1e-5)
+
+
+def test_channel_attention_shared_mlp():
+    """Test that myCBAM channel attention running the MLP once on stacked descriptors equals two separate passes."""
+    m = ChannelAttention(64).eval()
+    x = torch.randn(2, 64, 16, 16)
+    with torch.no_grad():
+        expected = torch.sigmoid(m.fc(m.avg_pool(x)) + m.fc(m.max_pool(x)))
+        torch.testing.assert_close(m(x), expected)
+
+
+@pytest.mark.parametrize("cfg", ["yolo11-C3CA.yaml", "yolo11-myCBAM+C3CA.yaml"])
+def test_model_fuse(cfg):
+    """Test that fusing whole CoordAtt/myCBAM detection models keeps their outputs within float tolerance."""
+    model = randomize_bn(DetectionModel(str(CFG / cfg), nc=9, verbose=False))
+    assert any(isinstance(m, CoordAtt) for m in model.modules())
+    assert cfg.startswith("yolo11-C3CA") or any(isinstance(m, myCBAM) for m in model.modules())
+    x = torch.rand(1, 3, 160, 160)
+    with torch.no_grad():
+        y = model(x)[0]
+        fused = deepcopy(model).fuse(verbose=False)
+        y_fused = fused(x)[0]
+    assert not any(isinstance(m, nn.BatchNorm2d) for m in fused.modules())
+    assert all(hasattr(m, "conv_hw") for m in fused.modules() if isinstance(m, CoordAtt))
+    torch.testing.assert_close(y_fused, y, rtol=1e-4, atol=5e-4)
+
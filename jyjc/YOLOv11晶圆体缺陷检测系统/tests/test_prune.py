@@ -0,0 +1,43 @@
+# Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
+
+from pathlib import Path
+
+import pytest
+import torch
+import torch.nn as nn
+
+from ultralytics.nn.tasks import DetectionModel
+from ultralytics.utils.prune import channel_groups, prune_model
+
+CFG = Path(__file__).resolve().parents[1] / "ultralytics" / "cfg" / "models" / "11"
+
+
+@pytest.mark.parametrize("cfg", ["yolo11.yaml", "yolo11-C3CA.yaml", "yolo11-myCBAM+C3CA.yaml"])
+def test_prune_zeroed_channels(cfg):
+    """Test that pruning channels whose BatchNorms output zero leaves the outputs unchanged and slims every block."""
+    torch.manual_seed(0)
+    model = DetectionModel(str(CFG / cfg), nc=9, verbose=False).eval()
+    for m in model.modules():
+        if isinstance(m, nn.BatchNorm2d):
+            m.weight.data.uniform_(0.5, 1.5)
+            m.running_mean.uniform_(-1, 1)
+            m.running_var.uniform_(0.5, 2)
+    groups = channel_groups(model)
+    assert any(g.name.endswith(".qk") for g in groups)  # C2PSA attention
+    assert any(g.depthwise for g in groups)  # block outputs followed through Concat into the Detect branches
+    for g in groups:
+        zero = torch.randperm(g.size)[: int(0.45 * g.size)]
+        for _, bn, offset in g.producers + g.depthwise:
+            if bn is not None:
+                bn.weight.data[offset + zero] = 0
+                bn.bias.data[offset + zero] = 0
+
+    x = torch.rand(1, 3, 128, 128)
+    params = sum(p.numel() for p in model.parameters())
+    with torch.no_grad():
+        y = model(x)[0]
+        counts = prune_model(model, amount=0.4)
+        y_pruned = model(x)[0]
+    assert counts["removed"] > 0.3 * counts["channels"]
+    assert sum(p.numel() for p in model.parameters()) < 0.6 * params
+    torch.testing.assert_close(y_pruned, y, rtol=1e-4, atol=1e-3)
@@ -15,6 +15,7 @@ if __name__ == '__main__':
     zxmodel = YOLO(model_path)
     results = zxmodel.train(data=data_path,
                           epochs=100,
+                          imgsz='auto',  # 按数据集原始尺寸训练(晶圆图为416), 不再放大到640
                           batch=16,
                           device=0,
                           workers=0,
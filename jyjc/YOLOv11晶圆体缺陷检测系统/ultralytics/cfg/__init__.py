@@ -196,6 +196,7 @@ CFG_INT_KEYS = frozenset(
         "line_width",
         "nbs",
         "save_period",
+        "ema_interval",
     }
 )
 CFG_BOOL_KEYS = frozenset(
@@ -223,6 +224,7 @@ CFG_BOOL_KEYS = frozenset(
         "visualize",
         "augment",
         "agnostic_nms",
+        "batched_nms",
         "retina_masks",
         "show_boxes",
         "keras",
@@ -233,6 +235,9 @@ CFG_BOOL_KEYS = frozenset(
         "nms",
         "profile",
         "multi_scale",
+        "batch_mosaic",
+        "ema_foreach",
+        "val_async",
     }
 )
 
@@ -6,6 +6,7 @@ from .dataset import (
     ClassificationDataset,
     GroundingDataset,
     SemanticDataset,
+    WaferMapDataset,
     YOLOConcatDataset,
     YOLODataset,
     YOLOMultiModalDataset,
@@ -18,6 +19,7 @@ __all__ = (
     "YOLODataset",
     "YOLOMultiModalDataset",
     "YOLOConcatDataset",
+    "WaferMapDataset",
     "GroundingDataset",
     "build_yolo_dataset",
     "build_grounding",
@@ -16,7 +16,7 @@ from ultralytics.utils import LOGGER, colorstr
 from ultralytics.utils.checks import check_version
 from ultralytics.utils.instance import Instances
 from ultralytics.utils.metrics import bbox_ioa
-from ultralytics.utils.ops import segment2box, xywh2xyxy, xyxyxyxy2xywhr
+from ultralytics.utils.ops import segment2box, xywh2xyxy, xyxy2xywh, xyxyxyxy2xywhr
 from ultralytics.utils.torch_utils import TORCHVISION_0_10, TORCHVISION_0_11, TORCHVISION_0_13
 
 DEFAULT_MEAN = (0.0, 0.0, 0.0)
@@ -1575,6 +1575,271 @@ class RandomFlip:
         return labels
 
 
+class BaseBatchTransform(BaseTransform):
+    """
+    Base class for augmentations applied to a collated batch of images on the training device.
+
+    Subclasses implement `transform` on a (N, C, H, W) image tensor. Each image of the batch is selected independently
+    with probability `p` and only the selected images are processed, so the cost scales with the number of augmented
+    images and none of it is paid in the dataloader workers.
+
+    Attributes:
+        p (float): Probability of applying the transform to each image of the batch.
+
+    Methods:
+        transform: Apply the transform to a subset of images, implemented by subclasses.
+        __call__: Apply the transform to randomly selected images of a batch.
+
+    Examples:
+        >>> transform = RandomGrayscale(p=0.5)
+        >>> batch = {"img": torch.rand(16, 3, 640, 640)}
+        >>> batch = transform(batch)
+    """
+
+    def __init__(self, p: float = 0.5) -> None:
+        """
+        Initialize the BaseBatchTransform object.
+
+        Args:
+            p (float): Probability of applying the transform to each image, must be in [0, 1].
+        """
+        super().__init__()
+        assert 0 <= p <= 1.0, f"The probability should be in range [0, 1], but got {p}."
+        self.p = p
+
+    def transform(self, img: torch.Tensor) -> torch.Tensor:
+        """Transform a (n, C, H, W) float image tensor, implemented by subclasses."""
+        raise NotImplementedError
+
+    def __call__(self, labels: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Apply the transform to randomly selected images of a collated batch.
+
+        Args:
+            labels (Dict[str, Any]): Batch dictionary with an 'img' tensor of shape (N, C, H, W), either uint8 in
+                [0, 255] or floating point in [0, 1].
+
+        Returns:
+            (Dict[str, Any]): The batch with transformed images, modified in place.
+        """
+        img = labels["img"]
+        if self.p == 0 or not len(img):
+            return labels
+        i = (torch.rand(len(img), device=img.device) < self.p).nonzero().squeeze(1)
+        if len(i):
+            x = self.transform(img[i].float())
+            if img.is_floating_point():
+                img[i] = x.clamp(0, 1).to(img.dtype)
+            else:
+                img[i] = x.clamp(0, 255).round().to(img.dtype)
+        return labels
+
+    def __repr__(self) -> str:
+        """Return a string representation of the transform."""
+        return f"{self.__class__.__name__}(p={self.p})"
+
+
+class RandomGrayscale(BaseBatchTransform):
+    """
+    Randomly convert images of a batch to grayscale while keeping the number of channels.
+
+    Images are expected in RGB channel order, as produced by `Format`.
+
+    Examples:
+        >>> batch = RandomGrayscale(p=0.3)({"img": torch.rand(8, 3, 416, 416)})
+    """
+
+    def transform(self, img: torch.Tensor) -> torch.Tensor:
+        """Replace every channel with the ITU-R 601 luma of the image."""
+        if img.shape[1] != 3:
+            return img
+        weights = img.new_tensor([0.299, 0.587, 0.114]).view(1, 3, 1, 1)
+        return (img * weights).sum(1, keepdim=True).expand_as(img)
+
+
+class RandomSharpen(BaseBatchTransform):
+    """
+    Randomly sharpen images of a batch with a 3x3 Laplacian sharpening kernel, matching PIL's ImageFilter.SHARPEN.
+
+    Examples:
+        >>> batch = RandomSharpen(p=0.4)({"img": torch.rand(8, 3, 416, 416)})
+    """
+
+    KERNEL = ((-2, -2, -2), (-2, 32, -2), (-2, -2, -2))
+    SCALE = 16
+
+    def transform(self, img: torch.Tensor) -> torch.Tensor:
+        """Convolve every channel with the sharpening kernel, replicating the image border."""
+        c = img.shape[1]
+        kernel = (img.new_tensor(self.KERNEL) / self.SCALE).expand(c, 1, 3, 3)
+        return F.conv2d(F.pad(img, (1, 1, 1, 1), mode="replicate"), kernel, groups=c)
+
+
+class RandomEdgeEnhance(RandomSharpen):
+    """
+    Randomly enhance edges of images in a batch with a 3x3 kernel, matching PIL's ImageFilter.EDGE_ENHANCE.
+
+    Examples:
+        >>> batch = RandomEdgeEnhance(p=0.3)({"img": torch.rand(8, 3, 416, 416)})
+    """
+
+    KERNEL = ((-1, -1, -1), (-1, 10, -1), (-1, -1, -1))
+    SCALE = 2
+
+
+class BatchMosaic(BaseBatchTransform):
+    """
+    Combine four images of a collated batch into a 2x2 mosaic on the training device.
+
+    This is the on-device counterpart of `Mosaic` for detection batches. Each selected image is replaced by a mosaic of
+    itself and three random images of the same batch, each downscaled by half, placed around a random center in the
+    middle half of the image. Boxes are moved with their source image, clipped to its quadrant and filtered with the
+    same size and area rules as `RandomPerspective.box_candidates`.
+
+    Attributes:
+        p (float): Probability of replacing each image of the batch with a mosaic.
+        fill (float): Border value in [0, 255] for pixels not covered by a source image.
+
+    Methods:
+        __call__: Build mosaics for randomly selected images and update the batch labels.
+
+    Examples:
+        >>> batch = {"img": torch.rand(8, 3, 416, 416), "cls": torch.zeros(8, 1), "batch_idx": torch.arange(8.0)}
+        >>> batch["bboxes"] = torch.tensor([[0.5, 0.5, 0.2, 0.2]]).repeat(8, 1)
+        >>> batch = BatchMosaic(p=1.0)(batch)
+    """
+
+    def __init__(self, p: float = 1.0, fill: float = 114) -> None:
+        """
+        Initialize the BatchMosaic object.
+
+        Args:
+            p (float): Probability of replacing each image with a mosaic, must be in [0, 1].
+            fill (float): Border value in [0, 255] for pixels not covered by a source image.
+        """
+        super().__init__(p)
+        self.fill = fill
+
+    def __call__(self, labels: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Replace randomly selected images of a collated detection batch with mosaics.
+
+        Args:
+            labels (Dict[str, Any]): Batch dictionary with 'img' (N, C, H, W), 'bboxes' (M, 4) normalized xywh,
+                'cls' (M, 1) and 'batch_idx' (M,) tensors.
+
+        Returns:
+            (Dict[str, Any]): The batch with mosaic images and their boxes, modified in place.
+        """
+        img = labels["img"]
+        n, c, h, w = img.shape
+        if self.p == 0 or n < 2:
+            return labels
+        device = img.device
+        sel = (torch.rand(n, device=device) < self.p).nonzero().squeeze(1)
+        k = len(sel)
+        if not k:
+            return labels
+
+        # Sources per quadrant (top-left, top-right, bottom-left, bottom-right), the image itself goes top-left
+        src = torch.randint(0, n, (k, 4), device=device)
+        src[:, 0] = sel
+        hs, ws = h // 2, w // 2
+        small = F.interpolate(img.float(), size=(hs, ws), mode="area")
+        yc = (torch.rand(k, device=device) * h / 2 + h / 4).long()  # mosaic center
+        xc = (torch.rand(k, device=device) * w / 2 + w / 4).long()
+
+        # Gather mosaic pixels from the downscaled batch with a single flat index
+        ys, xs = torch.arange(h, device=device), torch.arange(w, device=device)
+        top, left = ys < yc[:, None], xs < xc[:, None]  # (k, h), (k, w)
+        sy = ys - yc[:, None] + hs * top  # source row in its quadrant image
+        sx = xs - xc[:, None] + ws * left
+        quadrant = (~top).long()[:, :, None] * 2 + (~left).long()[:, None, :]  # (k, h, w)
+        valid = ((sy >= 0) & (sy < hs))[:, :, None] & ((sx >= 0) & (sx < ws))[:, None, :]
+        index = src.gather(1, quadrant.view(k, -1)).view(k, h, w) * (hs * ws)
+        index += sy.clamp(0, hs - 1)[:, :, None] * ws + sx.clamp(0, ws - 1)[:, None, :]
+        mosaic = small.transpose(0, 1).reshape(c, -1)[:, index].transpose(0, 1)  # (k, c, h, w)
+        fill = self.fill / 255 if img.is_floating_point() else self.fill
+        mosaic = torch.where(valid[:, None], mosaic, mosaic.new_tensor(fill))
+        img[sel] = mosaic.to(img.dtype) if img.is_floating_point() else mosaic.round().to(img.dtype)
+
+        # Move the boxes of every source image into its quadrant
+        batch_idx, bboxes, cls = labels["batch_idx"], labels["bboxes"], labels["cls"]
+        slot, j = (src.view(-1, 1) == batch_idx.long().view(1, -1)).nonzero().unbind(1)
+        m, q = slot // 4, slot % 4
+        right, bottom = (q % 2).bool(), (q // 2).bool()
+        ox = torch.where(right, xc[m], xc[m] - ws).float()
+        oy = torch.where(bottom, yc[m], yc[m] - hs).float()
+        box = xywh2xyxy(bboxes[j].float()) * bboxes.new_tensor([ws, hs, ws, hs])
+        box += torch.stack([ox, oy, ox, oy], 1)
+        lo = torch.stack([torch.where(right, xc[m], 0), torch.where(bottom, yc[m], 0)], 1).float().repeat(1, 2)
+        hi = torch.stack([torch.where(right, w, xc[m]), torch.where(bottom, h, yc[m])], 1).float().repeat(1, 2)
+        clipped = torch.min(torch.max(box, lo), hi)
+        bw, bh = clipped[:, 2] - clipped[:, 0], clipped[:, 3] - clipped[:, 1]
+        area = (box[:, 2] - box[:, 0]) * (box[:, 3] - box[:, 1])
+        keep = (bw > 2) & (bh > 2) & (bw * bh / (area + 1e-16) > 0.1)
+        clipped, m, j = clipped[keep], m[keep], j[keep]
+        new_bboxes = xyxy2xywh(clipped / clipped.new_tensor([w, h, w, h])).to(bboxes.dtype)
+
+        # Replace the labels of the mosaic images, keeping the batch sorted by image
+        old = ~torch.isin(batch_idx.long(), sel)
+        batch_idx = torch.cat([batch_idx[old], sel[m].to(batch_idx.dtype)])
+        order = batch_idx.argsort(stable=True)
+        labels["batch_idx"] = batch_idx[order]
+        labels["bboxes"] = torch.cat([bboxes[old], new_bboxes])[order]
+        labels["cls"] = torch.cat([cls[old], cls[j]])[order]
+        return labels
+
+
+class BatchMixUp(BaseBatchTransform):
+    """
+    Blend images of a collated batch with random partners from the same batch on the training device.
+
+    This is the on-device counterpart of `MixUp` for detection batches: each selected image is blended with another
+    image of the batch using a Beta(32, 32) ratio and receives the boxes of both images.
+
+    Examples:
+        >>> batch = {"img": torch.rand(8, 3, 416, 416), "cls": torch.zeros(8, 1), "batch_idx": torch.arange(8.0)}
+        >>> batch["bboxes"] = torch.tensor([[0.5, 0.5, 0.2, 0.2]]).repeat(8, 1)
+        >>> batch = BatchMixUp(p=0.5)(batch)
+    """
+
+    def __call__(self, labels: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Blend randomly selected images of a collated detection batch with random partners.
+
+        Args:
+            labels (Dict[str, Any]): Batch dictionary with 'img' (N, C, H, W), 'bboxes' (M, 4), 'cls' (M, 1) and
+                'batch_idx' (M,) tensors.
+
+        Returns:
+            (Dict[str, Any]): The batch with blended images and merged boxes, modified in place.
+        """
+        img = labels["img"]
+        n = len(img)
+        if self.p == 0 or n < 2:
+            return labels
+        device = img.device
+        sel = (torch.rand(n, device=device) < self.p).nonzero().squeeze(1)
+        k = len(sel)
+        if not k:
+            return labels
+        partner = torch.randint(0, n - 1, (k,), device=device)
+        partner += partner >= sel  # never blend an image with itself
+        r = torch.distributions.Beta(32.0, 32.0).sample((k, 1, 1, 1)).to(device)
+        mixed = img[sel].float() * r + img[partner].float() * (1 - r)
+        img[sel] = mixed.to(img.dtype) if img.is_floating_point() else mixed.round().to(img.dtype)
+
+        batch_idx = labels["batch_idx"]
+        m, j = (partner.view(-1, 1) == batch_idx.long().view(1, -1)).nonzero().unbind(1)
+        batch_idx = torch.cat([batch_idx, sel[m].to(batch_idx.dtype)])
+        order = batch_idx.argsort(stable=True)
+        labels["batch_idx"] = batch_idx[order]
+        labels["bboxes"] = torch.cat([labels["bboxes"], labels["bboxes"][j]])[order]
+        labels["cls"] = torch.cat([labels["cls"], labels["cls"][j]])[order]
+        return labels
+
+
 class LetterBox:
     """
     Resize image and padding for detection, instance segmentation, pose.
@@ -2550,6 +2815,44 @@ def v8_transforms(dataset, imgsz, hyp, stretch=False):
     )  # transforms
 
 
+def v8_batch_transforms(dataset, hyp=None):
+    """
+    Build the on-device batch augmentations declared under the 'augmentation' key of the dataset YAML.
+
+    These transforms run on the collated batch on the training device (see `DetectionTrainer.preprocess_batch`), after
+    the per-sample `v8_transforms` pipeline, so they add no CPU cost to the dataloader workers. With `hyp.batch_mosaic`
+    enabled, mosaic and mixup are also moved here as `BatchMosaic` and `BatchMixUp`.
+
+    Args:
+        dataset (Dataset): The dataset object whose `data` dictionary holds the YAML contents.
+        hyp (Namespace, optional): Training hyperparameters, used for `batch_mosaic`, `mosaic` and `mixup`.
+
+    Returns:
+        (Compose): A composition of batch transforms, empty if none are declared.
+
+    Examples:
+        >>> # data.yaml: augmentation: {grayscale_prob: 0.3, sharpen_prob: 0.4, edge_enhance_prob: 0.3}
+        >>> batch_transforms = v8_batch_transforms(dataset)
+        >>> batch = batch_transforms({"img": torch.rand(16, 3, 416, 416)})
+    """
+    cfg = dataset.data.get("augmentation") or {}
+    transforms = []
+    if hyp is not None and hyp.batch_mosaic:
+        transforms += [BatchMosaic(p=hyp.mosaic), BatchMixUp(p=hyp.mixup)]
+    for key, transform in (
+        ("grayscale_prob", RandomGrayscale),
+        ("sharpen_prob", RandomSharpen),
+        ("edge_enhance_prob", RandomEdgeEnhance),
+    ):
+        p = float(cfg.get(key, 0.0))
+        if p > 0:
+            transforms.append(transform(p=p))
+    unknown = set(cfg) - {"grayscale_prob", "sharpen_prob", "edge_enhance_prob"}
+    if unknown:
+        LOGGER.warning(f"Ignoring unsupported data.yaml augmentation keys {sorted(unknown)}")
+    return Compose(transforms)
+
+
 # Classification augmentations -----------------------------------------------------------------------------------------
 def classify_transforms(
     size=224,
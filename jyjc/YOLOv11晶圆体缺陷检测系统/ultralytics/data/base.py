@@ -1,9 +1,12 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
 import glob
+import json
 import math
 import os
 import random
+import shutil
+import time
 from copy import deepcopy
 from multiprocessing.pool import ThreadPool
 from pathlib import Path
@@ -13,7 +16,7 @@ import cv2
 import numpy as np
 from torch.utils.data import Dataset
 
-from ultralytics.data.utils import FORMATS_HELP_MSG, HELP_URL, IMG_FORMATS, check_file_speeds
+from ultralytics.data.utils import FORMATS_HELP_MSG, HELP_URL, IMG_FORMATS, LabelStore, check_file_speeds, get_hash
 from ultralytics.utils import DEFAULT_CFG, LOCAL_RANK, LOGGER, NUM_THREADS, TQDM
 from ultralytics.utils.patches import imread
 
@@ -35,7 +38,7 @@ class BaseDataset(Dataset):
         channels (int): Number of channels in the images (1 for grayscale, 3 for RGB).
         cv2_flag (int): OpenCV flag for reading images.
         im_files (List[str]): List of image file paths.
-        labels (List[Dict]): List of label data dictionaries.
+        labels (List[Dict] | LabelStore): Label data dictionaries, or a columnar LabelStore yielding them.
         ni (int): Number of images in the dataset.
         rect (bool): Whether to use rectangular training.
         batch_size (int): Size of batches.
@@ -47,7 +50,9 @@ class BaseDataset(Dataset):
         im_hw0 (list): List of original image dimensions (h, w).
         im_hw (list): List of resized image dimensions (h, w).
         npy_files (List[Path]): List of numpy file paths.
-        cache (str): Cache images to RAM or disk during training.
+        cache (str): Cache images to RAM, disk or a shared memory-mapped file during training.
+        mmap_dir (Path | None): Directory of the packed memory-mapped image cache used with cache='mmap'.
+        mmap_index (np.ndarray): Per-image (offset, h, w, h0, w0) rows into the memory-mapped cache.
         transforms (callable): Image transformation function.
         batch_shapes (np.ndarray): Batch shapes for rectangular training.
         batch (np.ndarray): Batch index of each image.
@@ -58,6 +63,7 @@ class BaseDataset(Dataset):
         load_image: Load an image from the dataset.
         cache_images: Cache images to memory or disk.
         cache_images_to_disk: Save an image as an *.npy file for faster loading.
+        cache_images_to_mmap: Pack all resized images into a single memory-mapped file.
         check_cache_disk: Check image caching requirements vs available disk space.
         check_cache_ram: Check image caching requirements vs available memory.
         set_rectangle: Set the shape of bounding boxes as rectangles.
@@ -90,7 +96,7 @@ class BaseDataset(Dataset):
         Args:
             img_path (str | List[str]): Path to the folder containing images or list of image paths.
             imgsz (int): Image size for resizing.
-            cache (bool | str): Cache images to RAM or disk during training.
+            cache (bool | str): Cache images to RAM, disk or 'mmap' (one packed file shared by all workers and ranks).
             augment (bool): If True, data augmentation is applied.
             hyp (Dict[str, Any]): Hyperparameters to apply data augmentation.
             prefix (str): Prefix to print in log messages.
@@ -128,9 +134,10 @@ class BaseDataset(Dataset):
         self.buffer = []  # buffer size = batch size
         self.max_buffer_length = min((self.ni, self.batch_size * 8, 1000)) if self.augment else 0
 
-        # Cache images (options are cache = True, False, None, "ram", "disk")
+        # Cache images (options are cache = True, False, None, "ram", "disk", "mmap")
         self.ims, self.im_hw0, self.im_hw = [None] * self.ni, [None] * self.ni, [None] * self.ni
         self.npy_files = [Path(f).with_suffix(".npy") for f in self.im_files]
+        self.mmap_dir, self.mmap_index, self.mmap_data = None, None, None
         self.cache = cache.lower() if isinstance(cache, str) else "ram" if cache is True else None
         if self.cache == "ram" and self.check_cache_ram():
             if hyp.deterministic:
@@ -141,6 +148,12 @@ class BaseDataset(Dataset):
             self.cache_images()
         elif self.cache == "disk" and self.check_cache_disk():
             self.cache_images()
+        elif self.cache == "mmap":
+            # one store per image set and size, so building a store never replaces one another run has mapped
+            im_dir, key = Path(self.im_files[0]).parent, get_hash(sorted(self.im_files))[:16]
+            self.mmap_dir = im_dir.parent / f"{im_dir.name}.{self.imgsz}.{self.channels}ch.{key}.imcache"
+            if self.mmap_dir.is_dir() or self.check_cache_disk():
+                self.cache_images_to_mmap()
 
         # Transforms
         self.transforms = self.build_transforms(hyp=hyp)
@@ -190,6 +203,10 @@ class BaseDataset(Dataset):
         Args:
             include_class (List[int], optional): List of classes to include. If None, all classes are included.
         """
+        if isinstance(self.labels, LabelStore):  # columnar labels are filtered without materializing them
+            if include_class is not None or self.single_cls:
+                self.labels = self.labels.filter(include_class, single_cls=self.single_cls)
+            return
         include_class_array = np.array(include_class).reshape(1, -1)
         for i in range(len(self.labels)):
             if include_class is not None:
@@ -225,7 +242,10 @@ class BaseDataset(Dataset):
         """
         im, f, fn = self.ims[i], self.im_files[i], self.npy_files[i]
         if im is None:  # not cached in RAM
-            if fn.exists():  # load npy
+            hw0 = None
+            if self.mmap_index is not None:  # copy out of the shared read-only mmap cache, already resized
+                im, hw0 = self.load_image_from_mmap(i)
+            elif fn.exists():  # load npy
                 try:
                     im = np.load(fn)
                 except Exception as e:
@@ -237,16 +257,8 @@ class BaseDataset(Dataset):
             if im is None:
                 raise FileNotFoundError(f"Image Not Found {f}")
 
-            h0, w0 = im.shape[:2]  # orig hw
-            if rect_mode:  # resize long side to imgsz while maintaining aspect ratio
-                r = self.imgsz / max(h0, w0)  # ratio
-                if r != 1:  # if sizes are not equal
-                    w, h = (min(math.ceil(w0 * r), self.imgsz), min(math.ceil(h0 * r), self.imgsz))
-                    im = cv2.resize(im, (w, h), interpolation=cv2.INTER_LINEAR)
-            elif not (h0 == w0 == self.imgsz):  # resize by stretching image to square imgsz
-                im = cv2.resize(im, (self.imgsz, self.imgsz), interpolation=cv2.INTER_LINEAR)
-            if im.ndim == 2:
-                im = im[..., None]
+            h0, w0 = hw0 or im.shape[:2]  # orig hw
+            im = self.resize_image(im, rect_mode)
 
             # Add to buffer if training with augmentations
             if self.augment:
@@ -261,6 +273,27 @@ class BaseDataset(Dataset):
 
         return self.ims[i], self.im_hw0[i], self.im_hw[i]
 
+    def resize_image(self, im: np.ndarray, rect_mode: bool = True) -> np.ndarray:
+        """
+        Resize an image to the dataset image size.
+
+        Args:
+            im (np.ndarray): Image in (h, w) or (h, w, c) layout.
+            rect_mode (bool): Whether to resize the long side to imgsz, otherwise stretch to a square imgsz.
+
+        Returns:
+            (np.ndarray): Resized image in (h, w, c) layout.
+        """
+        h0, w0 = im.shape[:2]
+        if rect_mode:  # resize long side to imgsz while maintaining aspect ratio
+            r = self.imgsz / max(h0, w0)  # ratio
+            if r != 1:  # if sizes are not equal
+                w, h = (min(math.ceil(w0 * r), self.imgsz), min(math.ceil(h0 * r), self.imgsz))
+                im = cv2.resize(im, (w, h), interpolation=cv2.INTER_LINEAR)
+        elif not (h0 == w0 == self.imgsz):  # resize by stretching image to square imgsz
+            im = cv2.resize(im, (self.imgsz, self.imgsz), interpolation=cv2.INTER_LINEAR)
+        return im[..., None] if im.ndim == 2 else im
+
     def cache_images(self) -> None:
         """Cache images to memory or disk for faster training."""
         b, gb = 0, 1 << 30  # bytes of cached images, bytes per gigabytes
@@ -283,6 +316,98 @@ class BaseDataset(Dataset):
         if not f.exists():
             np.save(f.as_posix(), imread(self.im_files[i]), allow_pickle=False)
 
+    def cache_images_to_mmap(self, timeout: float = 10800) -> None:
+        """
+        Pack all resized images into one contiguous file that every dataloader worker and DDP rank memory-maps.
+
+        Images are decoded and resized once by a thread pool and appended to `data.bin` inside `mmap_dir`, with an
+        (offset, h, w, h0, w0) row per image in `index.npy`. Only local rank 0 (or a single process) builds the store,
+        writing it to a temporary directory that is renamed into place, and the other ranks wait for it to appear
+        instead of decoding the dataset again. A published store is never deleted or overwritten. Reads go through the
+        OS page cache, giving RAM-cache speed while holding the pixels in memory only once regardless of the number of
+        workers.
+
+        Args:
+            timeout (float): Seconds ranks other than local rank 0 wait for the store, the DDP timeout by default.
+        """
+        meta = {"version": 1, "hash": get_hash(sorted(self.im_files)), "imgsz": self.imgsz, "channels": self.channels}
+        index = self._load_mmap_index(meta)
+        if index is None and LOCAL_RANK > 0:  # built by local rank 0
+            deadline = time.time() + timeout
+            while index is None:
+                if time.time() > deadline:
+                    raise TimeoutError(f"{self.prefix}Timed out waiting for local rank 0 to build {self.mmap_dir}")
+                time.sleep(1)
+                index = self._load_mmap_index(meta)
+        elif index is None:
+            index = self._build_mmap_cache(meta)
+        self.mmap_index = index
+        b, gb = int((index[:, 1] * index[:, 2]).sum()) * self.channels, 1 << 30
+        LOGGER.info(f"{self.prefix}Memory-mapping images from {self.mmap_dir} ({b / gb:.1f}GB)")
+
+    def _load_mmap_index(self, meta: Dict[str, Any]) -> Optional[np.ndarray]:
+        """Return the index of the images of this dataset in the published store in mmap_dir, None if unusable."""
+        try:
+            with open(self.mmap_dir / "meta.json", encoding="utf-8") as f:
+                cached = json.load(f)
+            assert all(cached.get(k) == v for k, v in meta.items())
+            pos = {x: j for j, x in enumerate(cached["files"])}
+            return np.load(self.mmap_dir / "index.npy")[[pos[x] for x in self.im_files]]
+        except (OSError, AssertionError, KeyError, ValueError):
+            return None
+
+    def _build_mmap_cache(self, meta: Dict[str, Any]) -> np.ndarray:
+        """Decode, resize and write all images to a new packed cache and publish it as mmap_dir, returning its index."""
+        tmp = self.mmap_dir.with_name(f"{self.mmap_dir.name}.{os.getpid()}.tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        index, offset, gb = np.zeros((self.ni, 5), dtype=np.int64), 0, 1 << 30
+
+        def read(i):
+            im = imread(self.im_files[i], flags=self.cv2_flag)  # BGR
+            if im is None:
+                raise FileNotFoundError(f"Image Not Found {self.im_files[i]}")
+            return self.resize_image(im), im.shape[:2]
+
+        with ThreadPool(NUM_THREADS) as pool, open(tmp / "data.bin", "wb") as f:
+            pbar = TQDM(enumerate(pool.imap(read, range(self.ni))), total=self.ni, disable=LOCAL_RANK > 0)
+            for i, (im, (h0, w0)) in pbar:
+                f.write(np.ascontiguousarray(im).data)
+                index[i] = offset, im.shape[0], im.shape[1], h0, w0
+                offset += im.nbytes
+                pbar.desc = f"{self.prefix}Caching images ({offset / gb:.1f}GB mmap)"
+            pbar.close()
+        np.save(tmp / "index.npy", index)
+        with open(tmp / "meta.json", "w", encoding="utf-8") as f:
+            json.dump({**meta, "files": self.im_files}, f)
+        if self.mmap_dir.exists() and self._load_mmap_index(meta) is None:
+            # an unusable leftover (e.g. an older store version) that no process can have mapped, move it aside
+            stale = self.mmap_dir.with_name(f"{self.mmap_dir.name}.{os.getpid()}.stale")
+            os.replace(self.mmap_dir, stale)
+            shutil.rmtree(stale, ignore_errors=True)
+        try:
+            os.replace(tmp, self.mmap_dir)
+        except OSError:  # published meanwhile by another process, a non-empty directory is never replaced
+            shutil.rmtree(tmp, ignore_errors=True)
+            index = self._load_mmap_index(meta)
+            if index is None:
+                raise
+        return index
+
+    def load_image_from_mmap(self, i: int) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """Return a writable copy of resized image 'i' from the memory-mapped cache and its original (h, w)."""
+        if self.mmap_data is None:  # map lazily so each worker process opens its own read-only view
+            self.mmap_data = np.memmap(self.mmap_dir / "data.bin", dtype=np.uint8, mode="r")
+        offset, h, w, h0, w0 = (int(x) for x in self.mmap_index[i])
+        im = np.array(self.mmap_data[offset : offset + h * w * self.channels]).reshape(h, w, self.channels)
+        return im, (h0, w0)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Drop the memory map when pickling so spawned workers re-map the cache instead of copying its pages."""
+        state = self.__dict__.copy()
+        state["mmap_data"] = None
+        return state
+
     def check_cache_disk(self, safety_margin: float = 0.5) -> bool:
         """
         Check if there's enough disk space for caching images.
@@ -354,11 +479,14 @@ class BaseDataset(Dataset):
         bi = np.floor(np.arange(self.ni) / self.batch_size).astype(int)  # batch index
         nb = bi[-1] + 1  # number of batches
 
-        s = np.array([x.pop("shape") for x in self.labels])  # hw
+        if isinstance(self.labels, LabelStore):
+            s = self.labels.shapes  # hw
+        else:
+            s = np.array([x.pop("shape") for x in self.labels])  # hw
         ar = s[:, 0] / s[:, 1]  # aspect ratio
         irect = ar.argsort()
         self.im_files = [self.im_files[i] for i in irect]
-        self.labels = [self.labels[i] for i in irect]
+        self.labels = self.labels[irect] if isinstance(self.labels, LabelStore) else [self.labels[i] for i in irect]
         ar = ar[irect]
 
         # Set training image shapes
@@ -10,7 +10,7 @@ import torch
 from PIL import Image
 from torch.utils.data import dataloader, distributed
 
-from ultralytics.data.dataset import GroundingDataset, YOLODataset, YOLOMultiModalDataset
+from ultralytics.data.dataset import GroundingDataset, WaferMapDataset, YOLODataset, YOLOMultiModalDataset
 from ultralytics.data.loaders import (
     LOADERS,
     LoadImagesAndVideos,
@@ -21,7 +21,7 @@ from ultralytics.data.loaders import (
     SourceTypes,
     autocast_list,
 )
-from ultralytics.data.utils import IMG_FORMATS, PIN_MEMORY, VID_FORMATS
+from ultralytics.data.utils import IMG_FORMATS, PIN_MEMORY, VID_FORMATS, is_wafer_map_store
 from ultralytics.utils import RANK, colorstr
 from ultralytics.utils.checks import check_file
 
@@ -113,7 +113,10 @@ def seed_worker(worker_id: int):  # noqa
 
 def build_yolo_dataset(cfg, img_path, batch, data, mode="train", rect=False, stride=32, multi_modal=False):
     """Build and return a YOLO dataset based on configuration parameters."""
-    dataset = YOLOMultiModalDataset if multi_modal else YOLODataset
+    if is_wafer_map_store(img_path):
+        dataset = WaferMapDataset
+    else:
+        dataset = YOLOMultiModalDataset if multi_modal else YOLODataset
     return dataset(
         img_path=img_path,
         imgsz=cfg.imgsz,
@@ -239,7 +242,9 @@ def check_source(source):
     return source, webcam, screenshot, from_img, in_memory, tensor
 
 
-def load_inference_source(source=None, batch: int = 1, vid_stride: int = 1, buffer: bool = False, channels: int = 3):
+def load_inference_source(
+    source=None, batch: int = 1, vid_stride: int = 1, buffer: bool = False, channels: int = 3, workers: int = 0
+):
     """
     Load an inference source for object detection and apply necessary transformations.
 
@@ -249,6 +254,7 @@ def load_inference_source(source=None, batch: int = 1, vid_stride: int = 1, buff
         vid_stride (int, optional): The frame interval for video sources.
         buffer (bool, optional): Whether stream frames will be buffered.
         channels (int, optional): The number of input channels for the model.
+        workers (int, optional): Threads decoding image files ahead of inference.
 
     Returns:
         (Dataset): A dataset object for the specified input source with attached source_type attribute.
@@ -275,7 +281,7 @@ def load_inference_source(source=None, batch: int = 1, vid_stride: int = 1, buff
     elif from_img:
         dataset = LoadPilAndNumpy(source, channels=channels)
     else:
-        dataset = LoadImagesAndVideos(source, batch=batch, vid_stride=vid_stride, channels=channels)
+        dataset = LoadImagesAndVideos(source, batch=batch, vid_stride=vid_stride, channels=channels, workers=workers)
 
     # Attach source types to the dataset
     setattr(dataset, "source_type", source_type)
@@ -1,7 +1,9 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
 import json
+import math
 from collections import defaultdict
+from copy import copy
 from itertools import repeat
 from multiprocessing.pool import ThreadPool
 from pathlib import Path
@@ -13,7 +15,7 @@ import torch
 from PIL import Image
 from torch.utils.data import ConcatDataset
 
-from ultralytics.utils import LOCAL_RANK, LOGGER, NUM_THREADS, TQDM, colorstr
+from ultralytics.utils import LOCAL_RANK, LOGGER, NUM_THREADS, TQDM, colorstr, is_dir_writeable
 from ultralytics.utils.instance import Instances
 from ultralytics.utils.ops import resample_segments, segments2boxes
 from ultralytics.utils.torch_utils import TORCHVISION_0_18
@@ -25,16 +27,20 @@ from .augment import (
     RandomLoadText,
     classify_augmentations,
     classify_transforms,
+    v8_batch_transforms,
     v8_transforms,
 )
 from .base import BaseDataset
 from .converter import merge_multi_segment
 from .utils import (
     HELP_URL,
+    LabelStore,
     check_file_speeds,
+    file_stats,
     get_hash,
     img2label_paths,
     load_dataset_cache_file,
+    load_wafer_maps,
     save_dataset_cache_file,
     verify_image,
     verify_image_label,
@@ -56,6 +62,7 @@ class YOLODataset(BaseDataset):
         use_keypoints (bool): Indicates if keypoints should be used for pose estimation.
         use_obb (bool): Indicates if oriented bounding boxes should be used.
         data (dict): Dataset configuration dictionary.
+        batch_transforms (Compose | None): On-device batch augmentations from the dataset YAML, None if not training.
 
     Methods:
         cache_labels: Cache dataset labels, check images and read shapes.
@@ -87,19 +94,23 @@ class YOLODataset(BaseDataset):
         assert not (self.use_segments and self.use_keypoints), "Can not use both segments and keypoints."
         super().__init__(*args, channels=self.data["channels"], **kwargs)
 
-    def cache_labels(self, path: Path = Path("./labels.cache")) -> Dict:
+    def cache_labels(self, path: Path = Path("./labels.cache"), previous: Optional[Dict] = None) -> Dict:
         """
         Cache dataset labels, check images and read shapes.
 
+        Labels are written as a columnar LabelStore directory next to the cache file (e.g. 'labels.store' beside
+        'labels.cache'), the cache file itself keeps the scan results, messages and a per-file manifest of image and
+        label (mtime, size). Given the previous cache, only new or changed files are verified again and the labels of
+        unchanged files are merged in from the previous store, so appending images does not rescan the dataset.
+
         Args:
             path (Path): Path where to save the cache file.
+            previous (dict, optional): Previously cached dictionary with its LabelStore under 'labels'.
 
         Returns:
-            (dict): Dictionary containing cached labels and related information.
+            (dict): Dictionary containing the cached LabelStore and related information, `previous` itself if no file
+                changed.
         """
-        x = {"labels": []}
-        nm, nf, ne, nc, msgs = 0, 0, 0, 0, []  # number missing, found, empty, corrupt, messages
-        desc = f"{self.prefix}Scanning {path.parent / path.stem}..."
         total = len(self.im_files)
         nkpt, ndim = self.data.get("kpt_shape", (0, 0))
         if self.use_keypoints and (nkpt <= 0 or ndim not in {2, 3}):
@@ -107,12 +118,41 @@ class YOLODataset(BaseDataset):
                 "'kpt_shape' in data.yaml missing or incorrect. Should be a list with [number of "
                 "keypoints, number of dims (2 for x,y or 3 for x,y,visible)], i.e. 'kpt_shape: [17, 3]'"
             )
+        settings = (self.use_keypoints, len(self.data["names"]), nkpt, ndim, self.single_cls)
+        # image and label file (mtime, size) per image
+        stats = np.concatenate((file_stats(self.im_files), file_stats(self.label_files)), 1)
+
+        # Match files against the previous manifest, unchanged files keep their verified labels
+        manifest = previous["manifest"] if previous else None
+        reuse = np.full(total, -1, dtype=np.int64)  # manifest entry of each unchanged file
+        if manifest and manifest["settings"] == settings:
+            entry = {f: j for j, f in enumerate(manifest["im_files"])}
+            j = np.array([entry.get(f, -1) for f in self.im_files], dtype=np.int64)
+            k = np.flatnonzero(j >= 0)
+            k = k[(manifest["stats"][j[k]] == stats[k]).all(1)]
+            reuse[k] = j[k]
+            if len(k) == total == len(manifest["im_files"]):
+                return previous  # nothing changed
+        todo = np.flatnonzero(reuse < 0)
+
+        counts = np.zeros((total, 4), dtype=np.int64)  # number missing, found, empty, corrupt per file
+        msgs, new_msgs, labels = [""] * total, [], []
+        rows = np.full(total, -1, dtype=np.int64)  # row of each file in the old store (reused) or new labels
+        kept = np.flatnonzero(reuse >= 0)
+        if len(kept):
+            counts[kept] = manifest["counts"][reuse[kept]]
+            rows[kept] = manifest["rows"][reuse[kept]]
+            for i in kept:
+                msgs[i] = manifest["msgs"][reuse[i]]
+        desc = f"{self.prefix}Scanning {path.parent / path.stem}..."
+        if manifest:
+            desc += f" {len(todo)} new or changed,"
         with ThreadPool(NUM_THREADS) as pool:
             results = pool.imap(
                 func=verify_image_label,
                 iterable=zip(
-                    self.im_files,
-                    self.label_files,
+                    [self.im_files[i] for i in todo],
+                    [self.label_files[i] for i in todo],
                     repeat(self.prefix),
                     repeat(self.use_keypoints),
                     repeat(len(self.data["names"])),
@@ -121,14 +161,14 @@ class YOLODataset(BaseDataset):
                     repeat(self.single_cls),
                 ),
             )
-            pbar = TQDM(results, desc=desc, total=total)
-            for im_file, lb, shape, segments, keypoint, nm_f, nf_f, ne_f, nc_f, msg in pbar:
-                nm += nm_f
-                nf += nf_f
-                ne += ne_f
-                nc += nc_f
+            nm, nf, ne, nc = counts.sum(0)
+            pbar = TQDM(zip(todo, results), desc=desc, total=len(todo))
+            for i, (im_file, lb, shape, segments, keypoint, nm_f, nf_f, ne_f, nc_f, msg) in pbar:
+                counts[i] = nm_f, nf_f, ne_f, nc_f
+                nm, nf, ne, nc = nm + nm_f, nf + nf_f, ne + ne_f, nc + nc_f
                 if im_file:
-                    x["labels"].append(
+                    rows[i] = len(labels)
+                    labels.append(
                         {
                             "im_file": im_file,
                             "shape": shape,
@@ -141,37 +181,71 @@ class YOLODataset(BaseDataset):
                         }
                     )
                 if msg:
-                    msgs.append(msg)
+                    msgs[i] = msg
+                    new_msgs.append(msg)
                 pbar.desc = f"{desc} {nf} images, {nm + ne} backgrounds, {nc} corrupt"
             pbar.close()
 
-        if msgs:
-            LOGGER.info("\n".join(msgs))
+        if new_msgs:
+            LOGGER.info("\n".join(new_msgs))
         if nf == 0:
             LOGGER.warning(f"{self.prefix}No labels found in {path}. {HELP_URL}")
-        x["hash"] = get_hash(self.label_files + self.im_files)
-        x["results"] = nf, nm, ne, nc, len(self.im_files)
-        x["msgs"] = msgs  # warnings
-        save_dataset_cache_file(self.prefix, path, x, DATASET_CACHE_VERSION)
+
+        # Merge reused rows of the previous store with the newly verified labels, in dataset order
+        valid = rows >= 0
+        old = valid & (reuse >= 0)
+        store = LabelStore.from_labels(labels)
+        if old.any():
+            store = LabelStore.concat([previous.pop("labels")[rows[old]], store])
+            rows[old] = np.arange(old.sum())
+            rows[valid & ~old] += old.sum()
+        store = store[rows[valid]]
+        x = {
+            "results": (int(nf), int(nm), int(ne), int(nc), total),
+            "msgs": [m for m in msgs if m],  # warnings
+            "manifest": {
+                "settings": settings,
+                "im_files": list(self.im_files),
+                "stats": stats,
+                "counts": counts,
+                "rows": np.where(valid, np.cumsum(valid) - 1, -1),  # row in the saved store, -1 if corrupt
+                "msgs": msgs,
+            },
+            "store": path.with_suffix(".store").name,
+        }
+        try:
+            if not is_dir_writeable(path.parent):
+                raise OSError(f"cache directory {path.parent} is not writeable")
+            store = store.save(path.with_suffix(".store"))  # memory-mapped from now on
+            save_dataset_cache_file(self.prefix, path, x, DATASET_CACHE_VERSION)
+        except OSError as e:
+            LOGGER.warning(f"{self.prefix}Label cache not saved: {e}")
+            store = store.filter(None)
+        x["version"] = DATASET_CACHE_VERSION
+        x["labels"] = store
         return x
 
-    def get_labels(self) -> List[Dict]:
+    def get_labels(self) -> LabelStore:
         """
         Return dictionary of labels for YOLO training.
 
         This method loads labels from disk or cache, verifies their integrity, and prepares them for training.
+        Only images and labels that are new or changed since the cache was written are verified again.
 
         Returns:
-            (List[dict]): List of label dictionaries, each containing information about an image and its annotations.
+            (LabelStore): Columnar labels, indexing it returns the label dictionary of an image and its annotations.
         """
         self.label_files = img2label_paths(self.im_files)
         cache_path = Path(self.label_files[0]).parent.with_suffix(".cache")
         try:
-            cache, exists = load_dataset_cache_file(cache_path), True  # attempt to load a *.cache file
-            assert cache["version"] == DATASET_CACHE_VERSION  # matches current version
-            assert cache["hash"] == get_hash(self.label_files + self.im_files)  # identical hash
-        except (FileNotFoundError, AssertionError, AttributeError):
-            cache, exists = self.cache_labels(cache_path), False  # run cache ops
+            previous = load_dataset_cache_file(cache_path)  # attempt to load a *.cache file
+            assert previous["version"] == DATASET_CACHE_VERSION  # matches current version
+            previous["labels"] = LabelStore.load(cache_path.parent / previous["store"])  # memory-map columns
+            assert len(previous["labels"]) == (previous["manifest"]["rows"] >= 0).sum()
+        except (OSError, AssertionError, AttributeError, KeyError, TypeError):
+            previous = None
+        cache = self.cache_labels(cache_path, previous)  # verifies new or changed files only
+        exists = cache is previous
 
         # Display cache
         nf, nm, ne, nc, n = cache.pop("results")  # found, missing, empty, corrupt, total
@@ -182,25 +256,24 @@ class YOLODataset(BaseDataset):
                 LOGGER.info("\n".join(cache["msgs"]))  # display warnings
 
         # Read cache
-        [cache.pop(k) for k in ("hash", "version", "msgs")]  # remove items
+        [cache.pop(k, None) for k in ("hash", "version", "msgs", "store", "manifest")]  # remove items
         labels = cache["labels"]
-        if not labels:
+        if not len(labels):
             raise RuntimeError(
                 f"No valid images found in {cache_path}. Images with incorrectly formatted labels are ignored. {HELP_URL}"
             )
-        self.im_files = [lb["im_file"] for lb in labels]  # update im_files
+        self.im_files = labels.im_files  # update im_files
 
         # Check if the dataset is all boxes or all segments
-        lengths = ((len(lb["cls"]), len(lb["bboxes"]), len(lb["segments"])) for lb in labels)
-        len_cls, len_boxes, len_segments = (sum(x) for x in zip(*lengths))
+        len_cls = len_boxes = labels.num_boxes
+        len_segments = labels.num_segments
         if len_segments and len_boxes != len_segments:
             LOGGER.warning(
                 f"Box and segment counts should be equal, but got len(segments) = {len_segments}, "
                 f"len(boxes) = {len_boxes}. To resolve this only boxes will be used and all segments will be removed. "
                 "To avoid this please supply either a detect or segment dataset, not a detect-segment mixed dataset."
             )
-            for lb in labels:
-                lb["segments"] = []
+            labels = labels.drop_segments()
         if len_cls == 0:
             LOGGER.warning(f"Labels are missing or empty in {cache_path}, training may not work correctly. {HELP_URL}")
         return labels
@@ -219,9 +292,18 @@ class YOLODataset(BaseDataset):
             hyp.mosaic = hyp.mosaic if self.augment and not self.rect else 0.0
             hyp.mixup = hyp.mixup if self.augment and not self.rect else 0.0
             hyp.cutmix = hyp.cutmix if self.augment and not self.rect else 0.0
-            transforms = v8_transforms(self, self.imgsz, hyp)
+            if getattr(hyp, "batch_mosaic", False) and not (self.use_segments or self.use_keypoints or self.use_obb):
+                # Mosaic and mixup run on the collated batch instead, see BatchMosaic and BatchMixUp
+                sample_hyp = copy(hyp)
+                sample_hyp.mosaic = sample_hyp.mixup = 0.0
+                transforms = v8_transforms(self, self.imgsz, sample_hyp)
+                self.batch_transforms = v8_batch_transforms(self, hyp)
+            else:
+                transforms = v8_transforms(self, self.imgsz, hyp)
+                self.batch_transforms = v8_batch_transforms(self)  # applied on-device by the trainer
         else:
             transforms = Compose([LetterBox(new_shape=(self.imgsz, self.imgsz), scaleup=False)])
+            self.batch_transforms = None
         transforms.append(
             Format(
                 bbox_format="xywh",
@@ -314,6 +396,131 @@ class YOLODataset(BaseDataset):
         return new_batch
 
 
+class WaferMapDataset(YOLODataset):
+    """
+    Dataset class for wafer maps stored as compact die-state grids instead of rendered images.
+
+    Wafer maps (e.g. WM-811K) are small grids where every die is 0 (outside the wafer), 1 (normal) or 2 (defective).
+    Rather than decoding 416x416 JPEG renders of these grids, this dataset reads the grids from a packed store written
+    by `save_wafer_maps` and rasterizes them to the network input size on the fly through a color palette. The whole
+    training set fits in a few MB of RAM and image loading costs a nearest-neighbor resize and a table lookup.
+
+    Attributes:
+        store (Dict[str, np.ndarray]): Packed die grids, shapes, labels and file names from `load_wafer_maps`.
+        palette (np.ndarray): BGR color for each die state, shape (num_states, 3).
+
+    Methods:
+        get_img_files: Return the wafer names of the packed store.
+        get_labels: Build label dictionaries from the packed store.
+        load_image: Rasterize a wafer map to the target image size.
+
+    Examples:
+        >>> dataset = WaferMapDataset(img_path="wafers.npz", data={"names": {0: "Center"}, "channels": 3})
+        >>> img, ori_shape, resized_shape = dataset.load_image(0)
+    """
+
+    # matplotlib 'viridis' colors of the 0/1/2 die states in the rendered WM-811K images, BGR order
+    PALETTE = ((84, 1, 68), (140, 145, 33), (37, 231, 253))
+
+    def __init__(self, *args, data: Optional[Dict] = None, task: str = "detect", **kwargs):
+        """
+        Initialize the WaferMapDataset.
+
+        Args:
+            data (dict, optional): Dataset configuration dictionary, an optional 'palette' key overrides the BGR colors
+                used to render die states.
+            task (str): Task type, only 'detect' is supported.
+            *args (Any): Additional positional arguments for the parent class.
+            **kwargs (Any): Additional keyword arguments for the parent class.
+        """
+        assert task == "detect", f"WaferMapDataset only supports the 'detect' task, not '{task}'."
+        self.palette = np.array((data or {}).get("palette", self.PALETTE), dtype=np.uint8).reshape(-1, 3)
+        if (data or {}).get("channels", 3) == 1:
+            self.palette = cv2.cvtColor(self.palette[None], cv2.COLOR_BGR2GRAY).reshape(-1, 1)
+        if kwargs.get("cache"):
+            LOGGER.info(f"{kwargs.get('prefix', '')}Wafer maps are held in memory, ignoring cache={kwargs['cache']}")
+        kwargs["cache"] = None
+        super().__init__(*args, data=data, task=task, **kwargs)
+
+    def get_img_files(self, img_path: str) -> List[str]:
+        """Load the packed store at img_path and return its wafer names."""
+        self.store = load_wafer_maps(img_path)
+        files = self.store["files"].tolist()
+        if self.fraction < 1:
+            files = files[: round(len(files) * self.fraction)]  # retain a fraction of the dataset
+        return files
+
+    def get_labels(self) -> List[Dict]:
+        """
+        Build label dictionaries directly from the packed store, no label files or image verification involved.
+
+        Returns:
+            (List[dict]): List of label dictionaries with an extra 'index' into the store.
+        """
+        shapes, counts = self.store["shapes"], self.store["label_counts"]
+        ends = np.cumsum(counts)
+        nc = len(self.data["names"])
+        labels = []
+        for i in range(len(self.im_files)):
+            lb = np.asarray(self.store["labels"][ends[i] - counts[i] : ends[i]], dtype=np.float32)
+            assert (lb[:, 0] < nc).all(), (
+                f"{self.prefix}{self.im_files[i]}: label class exceeds dataset class count {nc}"
+            )
+            labels.append(
+                {
+                    "im_file": self.im_files[i],
+                    "index": i,
+                    "shape": tuple(int(x) for x in shapes[i]),
+                    "cls": lb[:, 0:1],  # n, 1
+                    "bboxes": lb[:, 1:],  # n, 4
+                    "segments": [],
+                    "keypoints": None,
+                    "normalized": True,
+                    "bbox_format": "xywh",
+                }
+            )
+        if not labels:
+            raise RuntimeError(f"{self.prefix}No wafer maps found in {self.img_path}. {HELP_URL}")
+        return labels
+
+    def load_image(self, i: int, rect_mode: bool = True) -> Tuple[np.ndarray, Tuple[int, int], Tuple[int, int]]:
+        """
+        Rasterize wafer map 'i' to the target image size.
+
+        Args:
+            i (int): Index of the wafer map to load.
+            rect_mode (bool): Whether to resize the long side to imgsz, otherwise stretch to a square imgsz.
+
+        Returns:
+            im (np.ndarray): Rendered BGR (or grayscale) image.
+            hw_original (Tuple[int, int]): Die grid dimensions in (height, width) format.
+            hw_resized (Tuple[int, int]): Rendered image dimensions in (height, width) format.
+        """
+        if self.ims[i] is not None:
+            return self.ims[i], self.im_hw0[i], self.im_hw[i]
+
+        j = self.labels[i]["index"]
+        h0, w0 = (int(x) for x in self.store["shapes"][j])
+        grid = np.asarray(self.store["dies"][self.store["offsets"][j] : self.store["offsets"][j + 1]]).reshape(h0, w0)
+        if rect_mode:  # resize long side to imgsz while maintaining aspect ratio
+            r = self.imgsz / max(h0, w0)
+            w, h = (min(math.ceil(w0 * r), self.imgsz), min(math.ceil(h0 * r), self.imgsz))
+        else:  # stretch to square imgsz
+            w, h = self.imgsz, self.imgsz
+        grid = cv2.resize(grid, (w, h), interpolation=cv2.INTER_NEAREST)  # die states must not be blended
+        im = self.palette[np.minimum(grid, len(self.palette) - 1)]
+
+        # Add to buffer if training with augmentations
+        if self.augment:
+            self.ims[i], self.im_hw0[i], self.im_hw[i] = im, (h0, w0), im.shape[:2]
+            self.buffer.append(i)
+            if 1 < len(self.buffer) >= self.max_buffer_length:  # prevent empty buffer
+                k = self.buffer.pop(0)
+                self.ims[k], self.im_hw0[k], self.im_hw[k] = None, None, None
+
+        return im, (h0, w0), im.shape[:2]
+
+
 class YOLOMultiModalDataset(YOLODataset):
     """
     Dataset class for loading object detection and/or segmentation labels in YOLO format with multi-modal support.
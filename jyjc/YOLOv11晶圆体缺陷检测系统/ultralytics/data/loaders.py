@@ -5,6 +5,7 @@ import math
 import os
 import time
 import urllib
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from threading import Thread
@@ -325,6 +326,8 @@ class LoadImagesAndVideos:
         count (int): Counter for iteration, initialized at 0 during __iter__().
         ni (int): Number of images.
         cv2_flag (int): OpenCV flag for image reading (grayscale or RGB).
+        pool (ThreadPoolExecutor | None): Threads decoding the next images ahead of the consumer, None if disabled.
+        prefetch (int): Maximum number of images decoded ahead of the current one.
 
     Methods:
         __init__: Initialize the LoadImagesAndVideos object.
@@ -345,7 +348,9 @@ class LoadImagesAndVideos:
         - Can read from a text file containing paths to images and videos.
     """
 
-    def __init__(self, path: Union[str, Path, List], batch: int = 1, vid_stride: int = 1, channels: int = 3):
+    def __init__(
+        self, path: Union[str, Path, List], batch: int = 1, vid_stride: int = 1, channels: int = 3, workers: int = 0
+    ):
         """
         Initialize dataloader for images and videos, supporting various input formats.
 
@@ -354,6 +359,7 @@ class LoadImagesAndVideos:
             batch (int): Batch size for processing.
             vid_stride (int): Video frame-rate stride.
             channels (int): Number of image channels (1 for grayscale, 3 for RGB).
+            workers (int): Threads decoding images ahead of the consumer, at most two batches ahead (0 to disable).
         """
         parent = None
         if isinstance(path, str) and Path(path).suffix == ".txt":  # *.txt file with img/vid/dir on each line
@@ -391,6 +397,10 @@ class LoadImagesAndVideos:
         self.vid_stride = vid_stride  # video frame-rate stride
         self.bs = batch
         self.cv2_flag = cv2.IMREAD_GRAYSCALE if channels == 1 else cv2.IMREAD_COLOR  # grayscale or RGB
+        self.workers = workers if ni > 1 else 0
+        self.pool = None  # started by __iter__ and shut down when the images are exhausted
+        self.prefetch = max(2 * batch, workers)  # bounds decoded images held in memory
+        self._pending = {}  # file index -> future of the decoded image
         if any(videos):
             self._new_video(videos[0])  # new video
         else:
@@ -401,6 +411,9 @@ class LoadImagesAndVideos:
     def __iter__(self):
         """Iterate through image/video files, yielding source paths, images, and metadata."""
         self.count = 0
+        self.close()
+        if self.workers:
+            self.pool = ThreadPoolExecutor(self.workers, thread_name_prefix="imread")
         return self
 
     def __next__(self) -> Tuple[List[str], List[np.ndarray], List[str]]:
@@ -408,6 +421,7 @@ class LoadImagesAndVideos:
         paths, imgs, info = [], [], []
         while len(imgs) < self.bs:
             if self.count >= self.nf:  # end of file list
+                self.close()
                 if imgs:
                     return paths, imgs, info  # return last partial batch
                 else:
@@ -448,19 +462,8 @@ class LoadImagesAndVideos:
                     if self.count < self.nf:
                         self._new_video(self.files[self.count])
             else:
-                # Handle image files (including HEIC)
                 self.mode = "image"
-                if path.rpartition(".")[-1].lower() == "heic":
-                    # Load HEIC image using Pillow with pillow-heif
-                    check_requirements("pillow-heif")
-
-                    from pillow_heif import register_heif_opener
-
-                    register_heif_opener()  # Register HEIF opener with Pillow
-                    with Image.open(path) as img:
-                        im0 = cv2.cvtColor(np.asarray(img), cv2.COLOR_RGB2BGR)  # convert image to BGR nparray
-                else:
-                    im0 = imread(path, flags=self.cv2_flag)  # BGR
+                im0 = self._next_image()
                 if im0 is None:
                     LOGGER.warning(f"Image Read Error {path}")
                 else:
@@ -468,11 +471,40 @@ class LoadImagesAndVideos:
                     imgs.append(im0)
                     info.append(f"image {self.count + 1}/{self.nf} {path}: ")
                 self.count += 1  # move to the next file
-                if self.count >= self.ni:  # end of image list
+                if self.count >= self.ni and imgs:  # end of image list, unless only unreadable images were left
                     break
 
         return paths, imgs, info
 
+    def close(self):
+        """Shut down the decode thread pool, dropping images decoded ahead."""
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+        self._pending.clear()
+
+    def _read_image(self, path: str) -> Optional[np.ndarray]:
+        """Decode an image file (including HEIC) into a BGR or grayscale numpy array, None if it cannot be read."""
+        if path.rpartition(".")[-1].lower() == "heic":
+            # Load HEIC image using Pillow with pillow-heif
+            check_requirements("pillow-heif")
+
+            from pillow_heif import register_heif_opener
+
+            register_heif_opener()  # Register HEIF opener with Pillow
+            with Image.open(path) as img:
+                return cv2.cvtColor(np.asarray(img), cv2.COLOR_RGB2BGR)  # convert image to BGR nparray
+        return imread(path, flags=self.cv2_flag)  # BGR
+
+    def _next_image(self) -> Optional[np.ndarray]:
+        """Return the image at `self.count`, queueing the following images for decoding on the thread pool."""
+        if self.pool is None:
+            return self._read_image(self.files[self.count])
+        for j in range(self.count, min(self.count + self.prefetch, self.ni)):
+            if j not in self._pending:
+                self._pending[j] = self.pool.submit(self._read_image, self.files[j])
+        return self._pending.pop(self.count).result()
+
     def _new_video(self, path: str):
         """Create a new video capture object for the given path and initialize video-related attributes."""
         self.frame = 0
@@ -9,7 +9,7 @@ import zipfile
 from multiprocessing.pool import ThreadPool
 from pathlib import Path
 from tarfile import is_tarfile
-from typing import Dict, List, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 import cv2
 import numpy as np
@@ -795,3 +795,426 @@ def save_dataset_cache_file(prefix: str, path: Path, x: Dict, version: str):
         LOGGER.info(f"{prefix}New cache created: {path}")
     else:
         LOGGER.warning(f"{prefix}Cache directory {path.parent} is not writeable, cache not saved.")
+
+
+def file_stats(paths: List[str]) -> np.ndarray:
+    """Return an (n, 2) int64 array of (mtime_ns, size) for each path, (-1, -1) for missing files."""
+    stats = np.full((len(paths), 2), -1, dtype=np.int64)
+    for i, p in enumerate(paths):
+        try:
+            st = os.stat(p)
+            stats[i] = st.st_mtime_ns, st.st_size
+        except OSError:
+            continue
+    return stats
+
+
+def _ranges(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Return the concatenation of arange(start, start + count) for each start and count, without a Python loop."""
+    counts = np.asarray(counts, dtype=np.int64)
+    ends = np.cumsum(counts)
+    first = np.asarray(starts, dtype=np.int64) - ends + counts  # offset turning arange positions into range values
+    return np.repeat(first, counts) + np.arange(ends[-1] if len(ends) else 0)
+
+
+class LabelStore:
+    """
+    Columnar, memory-mappable store of YOLO labels with lazily materialized per-image label dictionaries.
+
+    Instead of one Python dict per image, labels are held as a few flat arrays: per-image `im_files`, `shapes` and box
+    `offsets`, and per-box `cls`, `bboxes`, optional `keypoints` and optional `segments` points with
+    `segment_offsets`. Saved stores are memory-mapped read-only, so dataloader workers and DDP ranks share the same
+    pages instead of each unpickling a private copy of every label.
+
+    Attributes:
+        columns (Dict[str, np.ndarray]): Label arrays keyed by column name.
+        index (np.ndarray | None): Rows of the store exposed by this view, in order, or None for all rows.
+        path (Path | None): Directory the columns were memory-mapped from, None if held in memory.
+
+    Methods:
+        from_labels: Build a store from a list of per-image label dictionaries.
+        load: Memory-map a store saved with save().
+        concat: Concatenate several stores into one in-memory store.
+        save: Write the store to a directory of *.npy files.
+        filter: Return a store keeping only boxes of the given classes, optionally merged into class 0.
+        drop_segments: Return a store without segments.
+
+    Examples:
+        >>> store = LabelStore.from_labels(labels)
+        >>> store = store.save("path/to/labels.store")  # memory-mapped from now on
+        >>> label = store[0]  # dict with im_file, shape, cls, bboxes, segments, keypoints, ...
+        >>> subset = store[np.array([2, 0, 1])]  # reordered view sharing the same columns
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], index: np.ndarray = None, path: Path = None):
+        """
+        Initialize the store from its columns.
+
+        Args:
+            columns (Dict[str, np.ndarray]): Label arrays keyed by column name.
+            index (np.ndarray, optional): Rows of the store exposed by this view, defaults to all rows.
+            path (Path, optional): Directory the columns were memory-mapped from.
+        """
+        self.columns = columns
+        self.index = index
+        self.path = path
+
+    @classmethod
+    def from_labels(cls, labels: List[Dict]) -> "LabelStore":
+        """Build a store from a list of per-image label dictionaries as produced by verify_image_label()."""
+        boxes = [len(lb["cls"]) for lb in labels]
+        columns = {
+            "im_files": np.array([lb["im_file"] for lb in labels], dtype=str),
+            "shapes": np.array([lb["shape"] for lb in labels], dtype=np.int32).reshape(-1, 2),
+            "offsets": np.concatenate(([0], np.cumsum(boxes))).astype(np.int64),
+            "cls": np.concatenate([lb["cls"] for lb in labels] or [np.zeros((0, 1))]).astype(np.float32),
+            "bboxes": np.concatenate([lb["bboxes"] for lb in labels] or [np.zeros((0, 4))]).astype(np.float32),
+        }
+        kpts = [lb["keypoints"] for lb in labels if lb.get("keypoints") is not None]
+        if kpts:
+            columns["keypoints"] = np.concatenate(kpts).astype(np.float32)
+        if any(len(lb["segments"]) for lb in labels):
+            # segments are ragged per box, images without segments get an empty segment for each of their boxes
+            segs = [s for lb, n in zip(labels, boxes) for s in (lb["segments"] or [np.zeros((0, 2))] * n)]
+            columns["segments"] = np.concatenate(segs).astype(np.float32).reshape(-1, 2)
+            columns["segment_offsets"] = np.concatenate(([0], np.cumsum([len(s) for s in segs]))).astype(np.int64)
+        return cls(columns)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "LabelStore":
+        """Memory-map the columns of a store saved with save()."""
+        path = Path(path)
+        return cls({f.stem: np.load(f, mmap_mode="r") for f in path.glob("*.npy")}, path=path)
+
+    @classmethod
+    def concat(cls, stores: List["LabelStore"]) -> "LabelStore":
+        """Concatenate the rows of several stores (or views) into one in-memory store."""
+        stores = [x.filter(None) for x in stores]  # compact views
+        if any("segments" in x.columns for x in stores):  # stores without segments get an empty one per box
+            for x in stores:
+                x.columns.setdefault("segments", np.zeros((0, 2), dtype=np.float32))
+                x.columns.setdefault("segment_offsets", np.zeros(len(x.columns["cls"]) + 1, dtype=np.int64))
+        keys = set.intersection(*(set(x.columns) for x in stores))
+        columns = {k: np.concatenate([x.columns[k] for x in stores]) for k in keys - {"offsets", "segment_offsets"}}
+        for k in {"offsets", "segment_offsets"} & keys:  # shift each store's offsets past the previous stores
+            ends = np.cumsum([0] + [x.columns[k][-1] for x in stores[:-1]])
+            columns[k] = np.concatenate([[0]] + [x.columns[k][1:] + e for x, e in zip(stores, ends)]).astype(np.int64)
+        return cls(columns)
+
+    def save(self, path: Union[str, Path]) -> "LabelStore":
+        """
+        Write the rows of this view to a directory of *.npy files and return the memory-mapped store.
+
+        The directory is written under a temporary name and renamed into place, so readers never see a partial store.
+
+        Args:
+            path (str | Path): Output store directory.
+
+        Returns:
+            (LabelStore): The saved store, memory-mapped from path.
+        """
+        import shutil
+
+        path = Path(path)
+        store = self if self.index is None else self.filter(None)  # compact to the rows of this view
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        for k, v in store.columns.items():
+            np.save(tmp / f"{k}.npy", np.ascontiguousarray(v), allow_pickle=False)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp, path)
+        return LabelStore.load(path)
+
+    def _rows(self) -> np.ndarray:
+        """Return the store rows exposed by this view."""
+        return np.arange(len(self.columns["im_files"])) if self.index is None else self.index
+
+    @property
+    def im_files(self) -> List[str]:
+        """Image file paths of this view."""
+        return self.columns["im_files"][self._rows()].tolist()
+
+    @property
+    def shapes(self) -> np.ndarray:
+        """Original image shapes (h, w) of this view."""
+        return np.asarray(self.columns["shapes"][self._rows()])
+
+    @property
+    def num_boxes(self) -> int:
+        """Total number of boxes in this view."""
+        offsets = np.asarray(self.columns["offsets"])
+        rows = self._rows()
+        return int((offsets[rows + 1] - offsets[rows]).sum())
+
+    @property
+    def num_segments(self) -> int:
+        """Total number of non-empty segments in this view."""
+        if "segments" not in self.columns:
+            return 0
+        offsets, rows = np.asarray(self.columns["offsets"]), self._rows()
+        box = _ranges(offsets[rows], offsets[rows + 1] - offsets[rows])
+        return int((np.diff(self.columns["segment_offsets"])[box] > 0).sum())
+
+    def __len__(self) -> int:
+        """Return the number of images in this view."""
+        return len(self.columns["im_files"]) if self.index is None else len(self.index)
+
+    def __iter__(self):
+        """Iterate over materialized per-image label dictionaries."""
+        return (self[i] for i in range(len(self)))
+
+    def __getitem__(self, i: Union[int, slice, np.ndarray, List[int]]) -> Union[Dict, "LabelStore"]:
+        """Return the label dictionary of image i, or a view of the store for a slice or array of indices."""
+        if not isinstance(i, (int, np.integer)):
+            return LabelStore(self.columns, self._rows()[i], self.path)
+        c = self.columns
+        j = int(self.index[i]) if self.index is not None else int(i)
+        a, b = int(c["offsets"][j]), int(c["offsets"][j + 1])
+        segments = []
+        if "segments" in c:
+            so = c["segment_offsets"][a : b + 1]
+            if so[-1] > so[0]:
+                segments = [np.array(c["segments"][so[k] : so[k + 1]]) for k in range(b - a)]
+        return {
+            "im_file": str(c["im_files"][j]),
+            "shape": tuple(int(x) for x in c["shapes"][j]),
+            "cls": np.array(c["cls"][a:b]),
+            "bboxes": np.array(c["bboxes"][a:b]),
+            "segments": segments,
+            "keypoints": np.array(c["keypoints"][a:b]) if "keypoints" in c else None,
+            "normalized": True,
+            "bbox_format": "xywh",
+        }
+
+    def filter(self, include_class: Optional[List[int]] = None, single_cls: bool = False) -> "LabelStore":
+        """
+        Return an in-memory store with the rows of this view, keeping only boxes of the given classes.
+
+        Args:
+            include_class (List[int], optional): Classes to keep, None keeps all boxes.
+            single_cls (bool): Set the class of every kept box to 0.
+
+        Returns:
+            (LabelStore): Compacted store without an index.
+        """
+        c, rows = self.columns, self._rows()
+        offsets = np.asarray(c["offsets"])
+        counts = offsets[rows + 1] - offsets[rows]
+        box = _ranges(offsets[rows], counts)  # store boxes of this view
+        cls_all = np.asarray(c["cls"])[box]
+        keep = np.ones(len(box), dtype=bool) if include_class is None else np.isin(cls_all[:, 0], include_class)
+        image = np.repeat(np.arange(len(rows)), counts)  # image of each box in this view
+        columns = {
+            "im_files": np.asarray(c["im_files"])[rows],
+            "shapes": np.asarray(c["shapes"])[rows],
+            "offsets": np.concatenate(([0], np.cumsum(np.bincount(image[keep], minlength=len(rows))))).astype(np.int64),
+            "cls": np.zeros_like(cls_all[keep]) if single_cls else cls_all[keep],
+            "bboxes": np.asarray(c["bboxes"])[box][keep],
+        }
+        if "keypoints" in c:
+            columns["keypoints"] = np.asarray(c["keypoints"])[box][keep]
+        if "segments" in c:
+            so = np.asarray(c["segment_offsets"])
+            kept = box[keep]
+            lengths = so[kept + 1] - so[kept]
+            columns["segments"] = np.asarray(c["segments"])[_ranges(so[kept], lengths)].reshape(-1, 2)
+            columns["segment_offsets"] = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+        return LabelStore(columns)
+
+    def drop_segments(self) -> "LabelStore":
+        """Return a view of the store without segments."""
+        columns = {k: v for k, v in self.columns.items() if k not in {"segments", "segment_offsets"}}
+        return LabelStore(columns, self.index)
+
+    def __getstate__(self) -> Dict:
+        """Pickle memory-mapped stores by path so spawned workers re-map the columns instead of copying them."""
+        if self.path is not None:
+            return {"path": self.path, "index": self.index}
+        return self.__dict__.copy()
+
+    def __setstate__(self, state: Dict):
+        """Restore a pickled store, re-mapping its columns from disk when it was pickled by path."""
+        if "columns" not in state:
+            state = {**LabelStore.load(state["path"]).__dict__, "index": state["index"]}
+        self.__dict__.update(state)
+
+
+WAFER_MAP_KEYS = ("dies", "shapes", "labels", "label_counts", "files")  # arrays of a packed wafer-map store
+
+
+def is_wafer_map_store(path: Union[str, Path]) -> bool:
+    """Return True if path is a packed wafer-map store, i.e. a *.npz file or a directory of memory-mappable *.npy."""
+    if isinstance(path, (list, tuple)):
+        return False
+    path = Path(path)
+    return path.suffix == ".npz" or (path / "dies.npy").is_file()
+
+
+def save_wafer_maps(
+    path: Union[str, Path], maps: List[np.ndarray], labels: List[np.ndarray], files: List[str] = None
+) -> Path:
+    """
+    Pack die-state wafer maps and their YOLO labels into a compact store readable by WaferMapDataset.
+
+    Each wafer map is a 2D array of die states (0 = outside wafer, 1 = normal die, 2 = defective die) of arbitrary
+    grid size. Maps are flattened into a single uint8 array with their (h, w) shapes kept alongside, so a full
+    WM-811K-style lot takes a few MB instead of GBs of rendered JPEGs.
+
+    Args:
+        path (str | Path): Output *.npz file, or a directory to write one memory-mappable *.npy file per array.
+        maps (List[np.ndarray]): Die-state grids, one (h, w) array per wafer.
+        labels (List[np.ndarray]): YOLO labels per wafer as (n, 5) arrays of class, x, y, w, h (normalized).
+        files (List[str], optional): Names identifying each wafer, defaults to '<stem>_<index>'.
+
+    Returns:
+        (Path): Path of the written store.
+
+    Examples:
+        >>> maps = [np.random.randint(0, 3, (26, 26), dtype=np.uint8) for _ in range(4)]
+        >>> labels = [np.array([[5, 0.5, 0.5, 1.0, 1.0]], dtype=np.float32)] * 4
+        >>> save_wafer_maps("wafers.npz", maps, labels)
+    """
+    path = Path(path)
+    assert len(maps) == len(labels), f"got {len(maps)} wafer maps but {len(labels)} labels"
+    labels = [np.asarray(lb, dtype=np.float32).reshape(-1, 5) for lb in labels]
+    store = {
+        "dies": np.concatenate([np.asarray(m, dtype=np.uint8).ravel() for m in maps]),
+        "shapes": np.array([np.shape(m)[:2] for m in maps], dtype=np.int32).reshape(-1, 2),
+        "labels": np.concatenate(labels) if labels else np.zeros((0, 5), dtype=np.float32),
+        "label_counts": np.array([len(lb) for lb in labels], dtype=np.int32),
+        "files": np.array(files if files is not None else [f"{path.stem}_{i}" for i in range(len(maps))]),
+    }
+    if path.suffix == ".npz":
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path, **store)
+    else:
+        path.mkdir(parents=True, exist_ok=True)
+        for k, v in store.items():
+            np.save(path / f"{k}.npy", v, allow_pickle=False)
+    return path
+
+
+def load_wafer_maps(path: Union[str, Path]) -> Dict[str, np.ndarray]:
+    """
+    Load a packed wafer-map store written by save_wafer_maps().
+
+    A *.npz store is read into RAM in one pass, a directory store is memory-mapped read-only so all dataloader workers
+    share the same pages.
+
+    Args:
+        path (str | Path): Path to the *.npz file or store directory.
+
+    Returns:
+        (Dict[str, np.ndarray]): Store arrays keyed by WAFER_MAP_KEYS plus 'offsets' into the flat 'dies' array.
+    """
+    path = Path(path)
+    if path.suffix == ".npz":
+        with np.load(path, allow_pickle=False) as f:
+            store = {k: f[k] for k in WAFER_MAP_KEYS}
+    else:
+        store = {k: np.load(path / f"{k}.npy", mmap_mode=None if k == "files" else "r") for k in WAFER_MAP_KEYS}
+    store["offsets"] = np.concatenate(([0], np.cumsum(store["shapes"].prod(1, dtype=np.int64))))
+    return store
+
+
+def is_full_frame_dataset(img_path: Union[str, Path, List[str]], thr: float = 0.95, n: int = 1000) -> bool:
+    """
+    Check whether every image of a detection dataset is labelled with exactly one box covering the whole frame.
+
+    Such datasets (e.g. one defect-pattern box per rendered wafer map) are whole-image classification problems in
+    disguise, and can be trained with a FullFrameDetect head instead of the full Detect head.
+
+    Args:
+        img_path (str | Path | List[str]): Image directory, *.txt image list or packed wafer-map store, or a list of
+            them.
+        thr (float): Minimum normalized box width and height to count as full-frame.
+        n (int): Maximum number of label files to inspect, evenly spaced over the dataset.
+
+    Returns:
+        (bool): True if all inspected images have a single full-frame box.
+
+    Examples:
+        >>> is_full_frame_dataset("path/to/dataset/train/images")
+        True
+    """
+    labels = []
+    for p in img_path if isinstance(img_path, (list, tuple)) else [img_path]:
+        p = Path(p)
+        if is_wafer_map_store(p):
+            store = load_wafer_maps(p)
+            if (store["label_counts"] != 1).any():
+                return False
+            labels.append(np.asarray(store["labels"]))
+            continue
+        if p.is_dir():
+            files = [str(f) for f in p.rglob("*.*") if f.suffix[1:].lower() in IMG_FORMATS]
+        elif p.is_file():
+            files = [x.replace("./", f"{p.parent}{os.sep}") for x in p.read_text(encoding="utf-8").split()]
+        else:
+            return False
+        files = sorted(files)[:: max(len(files) // n, 1)]
+        for lf in img2label_paths(files):
+            if not os.path.isfile(lf):
+                return False
+            with open(lf, encoding="utf-8") as f:
+                lb = [x.split() for x in f.read().strip().splitlines() if len(x.split())]
+            if len(lb) != 1 or len(lb[0]) != 5:  # one plain box per image
+                return False
+            labels.append(np.array(lb, dtype=np.float32))
+    if not labels:
+        return False
+    wh = np.concatenate(labels)[:, 3:5]
+    return bool((wh >= thr).all())
+
+
+def dataset_imgsz(img_path: Union[str, Path, List[str]], stride: int = 32, n: int = 1000) -> Optional[int]:
+    """
+    Return the native training size of a dataset, its median longest image side snapped down to a stride multiple.
+
+    Image shapes are read from the dataset's label cache when present, otherwise from the headers of up to `n` images.
+    Snapping down means the size never upsamples a typical image, e.g. 416x416 wafer images give 416 instead of
+    being enlarged 1.54x to the default 640.
+
+    Args:
+        img_path (str | Path | List[str]): Image directory or *.txt image list, or a list of them.
+        stride (int): Model stride the size must be a multiple of.
+        n (int): Maximum number of image headers to read when there is no label cache.
+
+    Returns:
+        (int | None): Image size, or None for packed wafer-map stores and datasets without readable images.
+
+    Examples:
+        >>> dataset_imgsz("path/to/dataset/train/images")
+        416
+    """
+    shapes = []
+    for p in img_path if isinstance(img_path, (list, tuple)) else [img_path]:
+        p = Path(p)
+        if is_wafer_map_store(p):
+            continue  # die grids are rendered at imgsz, they have no native resolution
+        if p.is_dir():
+            files = [str(f) for f in p.rglob("*.*") if f.suffix[1:].lower() in IMG_FORMATS]
+        elif p.is_file():
+            files = [x.replace("./", f"{p.parent}{os.sep}") for x in p.read_text(encoding="utf-8").split()]
+        else:
+            continue
+        if not files:
+            continue
+        cache_path = Path(img2label_paths(files[:1])[0]).parent.with_suffix(".cache")
+        try:
+            cache = load_dataset_cache_file(cache_path)
+            shapes.append(LabelStore.load(cache_path.parent / cache["store"]).shapes)
+            continue
+        except (OSError, AttributeError, KeyError, TypeError, ValueError):
+            pass
+        for f in sorted(files)[:: max(len(files) // n, 1)]:
+            try:
+                with Image.open(f) as im:
+                    shapes.append(np.array([exif_size(im)[::-1]]))  # (h, w)
+            except Exception:
+                continue
+    if not shapes:
+        return None
+    side = float(np.median(np.concatenate(shapes).max(1)))
+    return max(int(side // stride) * stride, stride)
@@ -344,6 +344,8 @@ class Exporter:
         if self.args.half and onnx and self.device.type == "cpu":
             LOGGER.warning("half=True only compatible with GPU export, i.e. use device=0")
             self.args.half = False
+        if self.args.imgsz == "auto":  # reuse the native dataset size resolved when training
+            self.args.imgsz = dict(getattr(model, "args", {})).get("imgsz", self.args.imgsz)
         self.imgsz = check_imgsz(self.args.imgsz, stride=model.stride, min_dim=2)  # check image size
         if self.args.int8 and engine:
             self.args.dynamic = True  # enforce dynamic to export TensorRT INT8
@@ -9,7 +9,7 @@ import torch
 from PIL import Image
 
 from ultralytics.cfg import TASK2DATA, get_cfg, get_save_dir
-from ultralytics.engine.results import Results
+from ultralytics.engine.results import LotWriter, Results
 from ultralytics.nn.tasks import attempt_load_one_weight, guess_model_task, yaml_model_load
 from ultralytics.utils import (
     ARGV,
@@ -539,7 +539,8 @@ class Model(torch.nn.Module):
             x in ARGV for x in ("predict", "track", "mode=predict", "mode=track")
         )
 
-        custom = {"conf": 0.25, "batch": 1, "save": is_cli, "mode": "predict", "rect": True}  # method defaults
+        # method defaults, images are decoded in the calling thread unless decode `workers` are requested
+        custom = {"conf": 0.25, "batch": 1, "save": is_cli, "mode": "predict", "rect": True, "workers": 0}
         args = {**self.overrides, **custom, **kwargs}  # highest priority args on the right
         prompts = args.pop("prompts", None)  # for SAM-type models
 
@@ -554,6 +555,41 @@ class Model(torch.nn.Module):
             self.predictor.set_prompts(prompts)
         return self.predictor.predict_cli(source=source) if is_cli else self.predictor(source=source, stream=stream)
 
+    def predict_lot(
+        self, source: Union[str, Path, list, tuple], sink: Union[str, Path], **kwargs: Any
+    ) -> Union[str, Path]:
+        """
+        Predict an image lot of any size with bounded memory, writing detections incrementally to a columnar sink.
+
+        Images are decoded by `workers` threads ahead of inference and results are streamed: each one is appended to a
+        `LotWriter` directory and its original image released as soon as it is postprocessed, so peak memory depends
+        on the batch size only, not on the number of images. Detection models return packed `SlimResults` by default.
+
+        Args:
+            source (str | Path | List | Tuple): Directory, glob, *.txt file list or list of image paths.
+            sink (str | Path): Output directory for the columnar results, read back with `LotWriter.read`.
+            **kwargs (Any): Prediction arguments, e.g. `conf`, `imgsz`, `batch` (default 16), `workers` (default 8),
+                `slim` (default True).
+
+        Returns:
+            (str | Path): The sink directory.
+
+        Examples:
+            >>> model = YOLO("best.pt")
+            >>> sink = model.predict_lot("lots/L0423/*.jpg", "runs/L0423", batch=32, conf=0.25)
+            >>> lot = LotWriter.read(sink)
+        """
+        args = {"batch": 16, "workers": DEFAULT_CFG_DICT["workers"], "slim": True, "verbose": False, **kwargs}
+        with LotWriter(sink, names=self.names) as writer:
+            if isinstance(source, (list, tuple)):  # lists are decoded up front, stream them from a file list instead
+                listing = writer.path / "source.txt"
+                listing.write_text("\n".join(str(Path(f).absolute()) for f in source), encoding="utf-8")
+                source = str(listing)
+            for r in self.predict(source, stream=True, **args):
+                writer.write(r)
+                r.orig_img = None  # release the decoded image as soon as its detections are written
+        return sink
+
     def track(
         self,
         source: Union[str, Path, int, list, tuple, np.ndarray, torch.Tensor] = None,
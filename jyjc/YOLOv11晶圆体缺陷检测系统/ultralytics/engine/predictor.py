@@ -47,6 +47,7 @@ from ultralytics.data import load_inference_source
 from ultralytics.data.augment import LetterBox
 from ultralytics.nn.autobackend import AutoBackend
 from ultralytics.utils import DEFAULT_CFG, LOGGER, MACOS, WINDOWS, callbacks, colorstr, ops
+from ultralytics.utils.autobatch import cpu_autotune
 from ultralytics.utils.checks import check_imgsz, check_imshow
 from ultralytics.utils.files import increment_path
 from ultralytics.utils.torch_utils import select_device, smart_inference_mode
@@ -256,12 +257,15 @@ class BasePredictor:
                 Source for inference.
         """
         self.imgsz = check_imgsz(self.args.imgsz, stride=self.model.stride, min_dim=2)  # check image size
+        if self.args.batch < 1:
+            self.autotune()
         self.dataset = load_inference_source(
             source=source,
             batch=self.args.batch,
             vid_stride=self.args.vid_stride,
             buffer=self.args.stream_buffer,
             channels=getattr(self.model, "ch", 3),
+            workers=self.args.workers,
         )
         self.source_type = self.dataset.source_type
         if not getattr(self, "stream", True) and (
@@ -273,6 +277,16 @@ class BasePredictor:
             LOGGER.warning(STREAM_WARNING)
         self.vid_writer = {}
 
+    def autotune(self):
+        """Replace `batch=-1` with the batch size, threads and decode workers of highest CPU throughput."""
+        if self.device.type == "cpu" and self.model.pt:
+            tuned = cpu_autotune(self.model.model, max(self.imgsz), train=False, workers=self.args.workers)
+            torch.set_num_threads(tuned["threads"])
+            self.args.batch, self.args.workers = tuned["batch"], tuned["workers"]
+        else:
+            LOGGER.warning("batch=-1 is tuned for PyTorch models on CPU only, using batch=1")
+            self.args.batch = 1
+
     @smart_inference_mode()
     def stream_inference(self, source=None, model=None, *args, **kwargs):
         """
@@ -397,6 +411,8 @@ class BasePredictor:
         self.args.half = self.model.fp16  # update half
         if hasattr(self.model, "imgsz"):
             self.args.imgsz = self.model.imgsz  # reuse imgsz from export metadata
+        elif self.args.imgsz == "auto":  # reuse the native dataset size resolved when training
+            self.args.imgsz = dict(getattr(self.model.model, "args", {})).get("imgsz", self.args.imgsz)
         self.model.eval()
 
     def write_results(self, i: int, p: Path, im: torch.Tensor, s: List[str]) -> str:
@@ -5,6 +5,7 @@ Ultralytics Results, Boxes and Masks classes for handling inference results.
 Usage: See https://docs.ultralytics.com/modes/predict/
 """
 
+import json
 from copy import deepcopy
 from functools import lru_cache
 from pathlib import Path
@@ -1660,3 +1661,311 @@ class OBB(BaseTensor):
             if isinstance(x, torch.Tensor)
             else np.stack([x.min(1), y.min(1), x.max(1), y.max(1)], -1)
         )
+
+
+# Packed detection record of SlimResults, one row per detection of a batch sorted by image index
+DETECTION_DTYPE = np.dtype([("image", np.int32), ("cls", np.int32), ("conf", np.float32), ("xyxy", np.float32, (4,))])
+
+
+def pack_detections(preds: List[torch.Tensor]) -> np.ndarray:
+    """
+    Pack the detections of a batch into a single structured array.
+
+    Args:
+        preds (List[torch.Tensor]): Per-image (N, 6) tensors of xyxy box, confidence and class.
+
+    Returns:
+        (np.ndarray): DETECTION_DTYPE array with the detections of all images, sorted by image index.
+    """
+    n = [len(p) for p in preds]
+    data = torch.cat(preds)[:, :6].float().cpu().numpy() if sum(n) else np.zeros((0, 6), np.float32)  # one transfer
+    packed = np.empty(len(data), DETECTION_DTYPE)
+    packed["image"] = np.repeat(np.arange(len(preds), dtype=np.int32), n)
+    packed["cls"] = data[:, 5]
+    packed["conf"] = data[:, 4]
+    packed["xyxy"] = data[:, :4]
+    return packed
+
+
+class SlimResults(SimpleClass, DataExportMixin):
+    """
+    Compact detection result of one image, a lazy view into the packed detections of its batch.
+
+    All images of a batch share one DETECTION_DTYPE structured array instead of holding per-image tensors and the
+    original image. `detections` slices this array on first access, `boxes` builds a Boxes object on demand for
+    compatibility with Results, and `summary`/exports are built from the packed columns. The original image is only
+    referenced when requested (`slim="img"`), which enables `plot` and `save_crop` through a full Results.
+
+    Attributes:
+        packed (np.ndarray): DETECTION_DTYPE array shared by all results of the batch.
+        index (int): Image index of this result within the batch.
+        path (str): Path to the image file.
+        names (Dict[int, str]): Class names.
+        orig_shape (Tuple[int, int]): Original image shape as (height, width).
+        orig_img (np.ndarray | None): Reference to the original image, None unless kept.
+        speed (Dict[str, float]): Preprocess, inference and postprocess times in milliseconds per image.
+        save_dir (str | None): Directory to save results to.
+
+    Methods:
+        to_results: Build a full Results object, requires the original image.
+        verbose: Return a log string with the number of detections per class.
+        save_txt: Save detections to a text file in YOLO format.
+        summary: Convert detections to a list of dictionaries.
+
+    Examples:
+        >>> results = model.predict("path/to/lot", slim=True, stream=True)
+        >>> for r in results:
+        ...     d = r.detections  # structured array with 'cls', 'conf' and 'xyxy' fields
+        ...     print(r.path, d["cls"], d["conf"])
+    """
+
+    masks = probs = keypoints = obb = None  # detection results only
+
+    def __init__(
+        self,
+        packed: np.ndarray,
+        index: int,
+        path: str,
+        names: Dict[int, str],
+        orig_shape: Tuple[int, int],
+        orig_img: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Initialize a view of one image into the packed detections of its batch.
+
+        Args:
+            packed (np.ndarray): DETECTION_DTYPE array of the batch from `pack_detections`.
+            index (int): Image index of this result within the batch.
+            path (str): Path to the image file.
+            names (Dict[int, str]): Class names.
+            orig_shape (Tuple[int, int]): Original image shape, extra dimensions are ignored.
+            orig_img (np.ndarray, optional): Original image to keep a reference to.
+        """
+        self.packed = packed
+        self.index = index
+        self.path = path
+        self.names = names
+        self.orig_shape = tuple(orig_shape[:2])
+        self.orig_img = orig_img
+        self.speed = {"preprocess": None, "inference": None, "postprocess": None}
+        self.save_dir = None
+        self._detections = None
+
+    @property
+    def detections(self) -> np.ndarray:
+        """Return the DETECTION_DTYPE rows of this image, a view into the packed batch array."""
+        if self._detections is None:
+            lo, hi = np.searchsorted(self.packed["image"], [self.index, self.index + 1])
+            self._detections = self.packed[lo:hi]
+        return self._detections
+
+    def __len__(self) -> int:
+        """Return the number of detections of this image."""
+        return len(self.detections)
+
+    @property
+    def boxes(self) -> Boxes:
+        """Return the detections as a numpy-backed Boxes object, built on each access."""
+        d = self.detections
+        return Boxes(np.column_stack([d["xyxy"], d["conf"], d["cls"]]), self.orig_shape)
+
+    def to_results(self) -> Results:
+        """
+        Build a full Results object for this image.
+
+        Returns:
+            (Results): Results with the kept original image and the detections as a tensor.
+
+        Raises:
+            ValueError: If the original image was not kept.
+        """
+        if self.orig_img is None:
+            raise ValueError("the original image was not kept, predict with slim='img' to plot or crop slim results")
+        r = Results(self.orig_img, path=self.path, names=self.names, boxes=torch.from_numpy(self.boxes.data))
+        r.speed, r.save_dir = self.speed, self.save_dir
+        return r
+
+    def plot(self, *args, **kwargs) -> np.ndarray:
+        """Plot the detections on the kept original image, see `Results.plot`."""
+        return self.to_results().plot(*args, **kwargs)
+
+    def save_crop(self, *args, **kwargs) -> None:
+        """Save cropped detections from the kept original image, see `Results.save_crop`."""
+        self.to_results().save_crop(*args, **kwargs)
+
+    def verbose(self) -> str:
+        """Return a log string with the number of detections per class, like `Results.verbose`."""
+        if len(self) == 0:
+            return "(no detections), "
+        counts = np.bincount(self.detections["cls"])
+        return "".join(f"{n} {self.names[i]}{'s' * (n > 1)}, " for i, n in enumerate(counts.tolist()) if n > 0)
+
+    def save_txt(self, txt_file: Union[str, Path], save_conf: bool = False) -> str:
+        """
+        Save detections to a text file in YOLO format, like `Results.save_txt`.
+
+        Args:
+            txt_file (str | Path): Path to the output text file, appended to if it exists.
+            save_conf (bool): Whether to include confidence scores in the output.
+
+        Returns:
+            (str): Path to the saved text file.
+        """
+        d = self.detections
+        if len(d):
+            h, w = self.orig_shape
+            xywhn = ops.xyxy2xywh(d["xyxy"]) / np.array([w, h, w, h], np.float32)
+            rows = np.column_stack([d["cls"], xywhn, d["conf"]] if save_conf else [d["cls"], xywhn])
+            Path(txt_file).parent.mkdir(parents=True, exist_ok=True)  # make directory
+            with open(txt_file, "a", encoding="utf-8") as f:
+                f.writelines(("%g " * rows.shape[1]).rstrip() % (int(r[0]), *r[1:]) + "\n" for r in rows.tolist())
+        return str(txt_file)
+
+    def summary(self, normalize: bool = False, decimals: int = 5) -> List[Dict[str, Any]]:
+        """
+        Convert detections to a list of dictionaries from the packed columns, in the format of `Results.summary`.
+
+        Args:
+            normalize (bool): Whether to normalize box coordinates by image dimensions.
+            decimals (int): Number of decimal places to round the output values to.
+
+        Returns:
+            (List[Dict[str, Any]]): One dictionary per detection with 'name', 'class', 'confidence' and 'box' keys.
+        """
+        d = self.detections
+        h, w = self.orig_shape if normalize else (1, 1)
+        xyxy = (d["xyxy"].astype(np.float64) / np.array([w, h, w, h])).round(decimals).tolist()
+        conf = d["conf"].astype(np.float64).round(decimals).tolist()
+        return [
+            {
+                "name": self.names[c],
+                "class": c,
+                "confidence": p,
+                "box": {"x1": b[0], "y1": b[1], "x2": b[2], "y2": b[3]},
+            }
+            for c, p, b in zip(d["cls"].tolist(), conf, xyxy)
+        ]
+
+
+class LotWriter:
+    """
+    Append detection results of an image lot to a directory of columnar binary files with constant memory.
+
+    Every column is a flat file that grows by one block per image, so a lot of any size is written without holding
+    results in memory, and it is read back as memory-mapped numpy arrays with `LotWriter.read`.
+
+    Attributes:
+        path (Path): Output directory holding `files.txt`, one `<column>.bin` file per column and `meta.json`.
+        names (Dict[int, str]): Class names stored in the metadata.
+        images (int): Number of images written.
+        boxes (int): Number of detections written.
+
+    Methods:
+        write: Append the detections of one Results object.
+        close: Flush the columns and write the metadata.
+        read: Load a written lot as memory-mapped columns.
+
+    Examples:
+        >>> with LotWriter("runs/lot1", names=model.names) as writer:
+        ...     for r in model.predict("path/to/lot", stream=True):
+        ...         writer.write(r)
+        >>> lot = LotWriter.read("runs/lot1")
+        >>> lot["cls"][lot["image"] == 0]  # classes detected in the first image
+    """
+
+    # column: (dtype, shape of one row), per image for 'shape' and 'counts', per detection otherwise
+    COLUMNS = {
+        "shape": (np.int32, (2,)),
+        "counts": (np.int32, ()),
+        "cls": (np.int32, ()),
+        "conf": (np.float32, ()),
+        "xyxy": (np.float32, (4,)),
+    }
+
+    def __init__(self, path: Union[str, Path], names: Optional[Dict[int, str]] = None) -> None:
+        """
+        Create the lot directory and open its column files for appending.
+
+        Args:
+            path (str | Path): Output directory, created if missing. Existing columns are overwritten.
+            names (Dict[int, str], optional): Class names to store in the metadata.
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.names = dict(names or {})
+        self.images = self.boxes = 0
+        self._files = open(self.path / "files.txt", "w", encoding="utf-8")
+        self._columns = {k: open(self.path / f"{k}.bin", "wb") for k in self.COLUMNS}
+
+    def write(self, result: "Results") -> None:
+        """
+        Append the image path, shape and detections of one result.
+
+        Args:
+            result (Results | SlimResults): Prediction result, boxes are taken from `boxes` or the axis-aligned `obb`.
+        """
+        if isinstance(result, SlimResults):
+            d = result.detections
+            cls, conf, xyxy = d["cls"], d["conf"], d["xyxy"]
+        else:
+            det = result.boxes if result.boxes is not None else result.obb
+            det = det.cpu().numpy() if det is not None else Boxes(np.zeros((0, 6), np.float32), result.orig_shape)
+            cls, conf, xyxy = det.cls, det.conf, det.xyxy
+        n = len(cls)
+        self._files.write(f"{result.path}\n")
+        self._columns["shape"].write(np.asarray(result.orig_shape[:2], np.int32).tobytes())
+        self._columns["counts"].write(np.int32(n).tobytes())
+        if n:
+            self._columns["cls"].write(np.ascontiguousarray(cls, np.int32).tobytes())
+            self._columns["conf"].write(np.ascontiguousarray(conf, np.float32).tobytes())
+            self._columns["xyxy"].write(np.ascontiguousarray(xyxy, np.float32).tobytes())
+        self.images += 1
+        self.boxes += n
+
+    def close(self) -> None:
+        """Close the column files and write `meta.json` describing the lot."""
+        if self._files.closed:
+            return
+        self._files.close()
+        for f in self._columns.values():
+            f.close()
+        meta = {
+            "images": self.images,
+            "boxes": self.boxes,
+            "names": self.names,
+            "columns": {k: [np.dtype(t).str, list(s)] for k, (t, s) in self.COLUMNS.items()},
+        }
+        (self.path / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+
+    def __enter__(self) -> "LotWriter":
+        """Return the writer for use as a context manager."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Close the writer when leaving the context."""
+        self.close()
+
+    @staticmethod
+    def read(path: Union[str, Path]) -> Dict[str, Any]:
+        """
+        Load a lot written by `LotWriter` as memory-mapped numpy columns.
+
+        Args:
+            path (str | Path): Lot directory.
+
+        Returns:
+            (Dict[str, Any]): Per-image 'files' (list), 'shape' (N, 2) and 'counts' (N,), per-detection 'image' (M,)
+                indices into 'files', 'cls' (M,), 'conf' (M,) and 'xyxy' (M, 4), and the class 'names'.
+        """
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text(encoding="utf-8"))
+        lot = {
+            "files": (path / "files.txt").read_text(encoding="utf-8").splitlines(),
+            "names": {int(k): v for k, v in meta["names"].items()},  # JSON object keys are strings
+        }
+        for k, (dtype, shape) in meta["columns"].items():
+            rows = meta["images"] if k in {"shape", "counts"} else meta["boxes"]
+            shape = (rows, *shape)
+            lot[k] = np.memmap(path / f"{k}.bin", dtype, "r", shape=shape) if rows else np.zeros(shape, dtype)
+        lot["image"] = np.repeat(np.arange(meta["images"], dtype=np.int32), lot["counts"])
+        return lot
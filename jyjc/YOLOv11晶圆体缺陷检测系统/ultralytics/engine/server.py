@@ -0,0 +1,442 @@
+# Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
+"""
+Local inference server that coalesces concurrent requests into dynamic batches for one loaded model.
+
+Usage - serve a model over HTTP on localhost or over a Unix socket:
+    >>> from ultralytics.engine.server import InferenceServer
+    >>> InferenceServer("best.pt", "127.0.0.1:8765", max_batch=8, max_latency=10).serve_forever()
+    >>> InferenceServer("best.pt", "unix:/tmp/yolo.sock").serve_forever()
+
+Usage - query it from any process:
+    >>> from ultralytics.engine.server import InferenceClient
+    >>> client = InferenceClient("unix:/tmp/yolo.sock")
+    >>> det = client.predict("image.jpg")  # {'shape': [h, w], 'cls': [...], 'conf': [...], 'xyxy': [[...], ...]}
+    >>> client.stats()
+"""
+
+import http.client
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+import cv2
+import numpy as np
+
+from ultralytics.engine.results import SlimResults
+from ultralytics.utils import LOGGER
+from ultralytics.utils.checks import check_imgsz
+from ultralytics.utils.torch_utils import smart_inference_mode
+
+__all__ = "InferenceServer", "InferenceClient"
+
+
+class _Request:
+    """A queued inference request with its decoded image, arrival time and result future."""
+
+    __slots__ = "im", "t0", "future"
+
+    def __init__(self, im: np.ndarray):
+        self.im = im
+        self.t0 = time.perf_counter()
+        self.future = Future()
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threading HTTP server bound to a Unix domain socket."""
+
+    daemon_threads = True
+
+    def server_bind(self):
+        """Bind to the socket path, replacing a stale socket file."""
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        socketserver.UnixStreamServer.server_bind(self)
+        self.server_name, self.server_port = "localhost", 0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """HTTP handler: POST /predict with an encoded image body, GET /stats."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "UltralyticsInference"
+
+    def address_string(self) -> str:
+        """Return the client address, Unix socket clients have no host."""
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format: str, *args) -> None:
+        """Log requests at debug level only."""
+        LOGGER.debug(f"{self.address_string()} {format % args}")
+
+    def _reply(self, code: int, body: Dict[str, Any], headers: Dict[str, str] = None) -> None:
+        """Send a JSON response."""
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        """Return server statistics."""
+        if self.path.rstrip("/") == "/stats":
+            self._reply(200, self.server.inference.stats())
+        else:
+            self._reply(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self) -> None:
+        """Run inference on the encoded image in the request body."""
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path.rstrip("/") != "/predict":
+            return self._reply(404, {"error": f"unknown path {self.path}"})
+        im = cv2.imdecode(np.frombuffer(body, np.uint8), cv2.IMREAD_COLOR) if body else None
+        if im is None:
+            return self._reply(400, {"error": "request body is not a decodable image"})
+        server = self.server.inference
+        try:
+            result = server.submit(im).result(timeout=server.timeout)
+        except queue.Full:
+            return self._reply(503, {"error": "queue full"}, {"Retry-After": "1"})
+        except Exception as e:
+            return self._reply(500, {"error": str(e)})
+        self._reply(200, InferenceServer.to_dict(result))
+
+
+class InferenceServer:
+    """
+    Serve one loaded model to many local clients, batching concurrent requests dynamically.
+
+    Requests are put into a bounded queue. A single worker thread takes the oldest request and waits for more until
+    `max_batch` requests are collected or the oldest one has waited `max_latency` milliseconds, then runs
+    preprocessing, inference and NMS on the whole batch and resolves each request with compact `SlimResults`.
+    When the queue is full new requests are rejected at once (HTTP 503) instead of growing the latency of all clients.
+
+    Attributes:
+        predictor (BasePredictor): Predictor owning the loaded `AutoBackend`.
+        address (str): 'host:port' for HTTP on TCP or 'unix:/path' for HTTP over a Unix domain socket.
+        max_batch (int): Maximum number of images per batch.
+        max_latency (float): Maximum time in milliseconds the oldest queued request waits for a batch to fill.
+        queue (queue.Queue): Bounded request queue, its size is the backpressure limit.
+        timeout (float): Seconds a HTTP request waits for its result.
+
+    Methods:
+        submit: Queue an image for inference and return a future of its SlimResults.
+        start: Start the batching worker and the HTTP server in background threads.
+        serve_forever: Start the batching worker and serve HTTP requests until interrupted.
+        close: Stop serving and release the socket.
+        stats: Return throughput, batch size and latency statistics.
+
+    Examples:
+        >>> server = InferenceServer("best.pt", "unix:/tmp/yolo.sock", max_batch=16, queue_size=128, conf=0.25)
+        >>> server.start()
+        >>> r = server.submit(cv2.imread("image.jpg")).result()
+        >>> server.close()
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        address: str = "127.0.0.1:8765",
+        max_batch: int = 8,
+        max_latency: float = 10.0,
+        queue_size: int = 64,
+        timeout: float = 30.0,
+        **kwargs: Any,
+    ):
+        """
+        Load the model once and prepare the request queue.
+
+        Args:
+            model (str | Path | Model): Model weights or a loaded YOLO model, must be a detection model.
+            address (str): 'host:port' for HTTP on TCP or 'unix:/path' for HTTP over a Unix domain socket.
+            max_batch (int): Maximum number of images per batch.
+            max_latency (float): Maximum time in milliseconds the oldest request waits for a batch to fill.
+            queue_size (int): Maximum number of queued requests before new ones are rejected.
+            timeout (float): Seconds a HTTP request waits for its result.
+            **kwargs (Any): Prediction arguments, e.g. `conf`, `iou`, `imgsz`, `device`, `half`.
+        """
+        from ultralytics import YOLO
+        from ultralytics.engine.model import Model
+
+        model = model if isinstance(model, Model) else YOLO(model)
+        if model.task != "detect":
+            raise ValueError(f"InferenceServer serves detection models only, not task={model.task}")
+        args = {**model.overrides, "conf": 0.25, "batch": max_batch, "rect": True, **kwargs}
+        args.update(mode="predict", save=False, verbose=False, slim=True)
+        self.predictor = model._smart_load("predictor")(overrides=args, _callbacks=model.callbacks)
+        self.predictor.setup_model(model=model.model, verbose=False)
+        self.predictor.imgsz = check_imgsz(self.predictor.args.imgsz, stride=self.predictor.model.stride, min_dim=2)
+        backend = self.predictor.model
+        backend.warmup(imgsz=(1 if backend.pt or backend.triton else max_batch, 3, *self.predictor.imgsz))
+
+        self.address = address
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.timeout = timeout
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.httpd = None
+        self._stop = threading.Event()
+        self._threads = []
+        self._stats_lock = threading.Lock()
+        self._latency = deque(maxlen=2048)  # request latencies in ms, queueing included
+        self._t_start = time.perf_counter()
+        self._counts = {"requests": 0, "rejected": 0, "errors": 0, "batches": 0, "images": 0}
+        self._inference_ms = 0.0
+
+    def submit(self, im: np.ndarray) -> Future:
+        """
+        Queue an image for inference without blocking.
+
+        Args:
+            im (np.ndarray): BGR image of shape (H, W, 3).
+
+        Returns:
+            (concurrent.futures.Future): Future resolving to the SlimResults of the image.
+
+        Raises:
+            queue.Full: If `queue_size` requests are already waiting.
+        """
+        request = _Request(im)
+        try:
+            self.queue.put_nowait(request)
+        except queue.Full:
+            with self._stats_lock:
+                self._counts["rejected"] += 1
+            raise
+        with self._stats_lock:
+            self._counts["requests"] += 1
+        return request.future
+
+    def _collect(self) -> List[_Request]:
+        """Wait for a request, then gather more until the batch is full or the oldest request's deadline passes."""
+        try:
+            batch = [self.queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+        deadline = batch[0].t0 + self.max_latency / 1000
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self.queue.get_nowait())  # drain what is already waiting first
+                continue
+            except queue.Empty:
+                pass
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    @smart_inference_mode()
+    def _infer(self, ims: List[np.ndarray]) -> List[SlimResults]:
+        """Run preprocessing, inference and postprocessing on a batch of images."""
+        p = self.predictor
+        p.batch = ([""] * len(ims), ims, [""] * len(ims))
+        im = p.preprocess(ims)
+        return p.postprocess(p.inference(im), im, ims)
+
+    def _worker(self) -> None:
+        """Batching loop, runs until `close` is called."""
+        while not self._stop.is_set():
+            batch = self._collect()
+            if not batch:
+                continue
+            t = time.perf_counter()
+            try:
+                results = self._infer([r.im for r in batch])
+            except Exception as e:
+                for r in batch:
+                    r.future.set_exception(e)
+                with self._stats_lock:
+                    self._counts["errors"] += len(batch)
+                continue
+            done = time.perf_counter()
+            for r, result in zip(batch, results):
+                r.im = None  # the packed result does not reference the image
+                r.future.set_result(result)
+            with self._stats_lock:
+                self._counts["batches"] += 1
+                self._counts["images"] += len(batch)
+                self._inference_ms += (done - t) * 1000
+                self._latency.extend((done - r.t0) * 1000 for r in batch)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return serving statistics since start.
+
+        Returns:
+            (Dict[str, Any]): Request counters, throughput in images per second, mean batch size, mean batch
+                inference time and p50/p95/p99 request latency in milliseconds over the last 2048 requests.
+        """
+        with self._stats_lock:
+            counts, latency, inference_ms = dict(self._counts), np.array(self._latency), self._inference_ms
+        elapsed = time.perf_counter() - self._t_start
+        batches = max(counts["batches"], 1)
+        p50, p95, p99 = np.percentile(latency, [50, 95, 99]).round(2).tolist() if len(latency) else (0.0, 0.0, 0.0)
+        return {
+            **counts,
+            "queued": self.queue.qsize(),
+            "throughput": round(counts["images"] / elapsed, 2),
+            "batch_size": round(counts["images"] / batches, 2),
+            "inference_ms": round(inference_ms / batches, 2),
+            "latency_ms": {"p50": p50, "p95": p95, "p99": p99},
+        }
+
+    @staticmethod
+    def to_dict(result: SlimResults) -> Dict[str, Any]:
+        """Return the compact JSON form of a result, with detections as columns."""
+        d = result.detections
+        return {
+            "shape": list(result.orig_shape),
+            "cls": d["cls"].tolist(),
+            "conf": d["conf"].round(5).tolist(),
+            "xyxy": d["xyxy"].round(2).tolist(),
+        }
+
+    def _bind(self) -> None:
+        """Create the HTTP server on the TCP or Unix socket address."""
+        if self.address.startswith("unix:"):
+            self.httpd = _UnixHTTPServer(self.address[5:], _Handler)
+        else:
+            host, _, port = self.address.rpartition(":")
+            self.httpd = ThreadingHTTPServer((host or "127.0.0.1", int(port)), _Handler)
+            self.httpd.daemon_threads = True
+        self.httpd.inference = self
+
+    def start(self) -> "InferenceServer":
+        """Start the batching worker and the HTTP server in background threads."""
+        self._bind()
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._worker, daemon=True),
+            threading.Thread(target=self.httpd.serve_forever, daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+        LOGGER.info(f"Inference server listening on {self.address}, max_batch={self.max_batch}")
+        return self
+
+    def serve_forever(self) -> None:
+        """Start serving and block until interrupted."""
+        self.start()
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stop the HTTP server and the batching worker, failing requests still queued."""
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            if self.address.startswith("unix:") and os.path.exists(self.address[5:]):
+                os.unlink(self.address[5:])
+            self.httpd = None
+        self._stop.set()
+        for t in self._threads:
+            t.join()
+        self._threads = []
+        while not self.queue.empty():
+            self.queue.get_nowait().future.set_exception(RuntimeError("inference server closed"))
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection over a Unix domain socket."""
+
+    def __init__(self, path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.path = path
+
+    def connect(self):
+        """Connect to the socket path."""
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+class InferenceClient:
+    """
+    Client for an `InferenceServer`, keeping one connection open per client.
+
+    Examples:
+        >>> client = InferenceClient("127.0.0.1:8765")
+        >>> det = client.predict(cv2.imread("image.jpg"))
+        >>> det["cls"], det["conf"], det["xyxy"]
+    """
+
+    def __init__(self, address: str = "127.0.0.1:8765", timeout: float = 30.0):
+        """
+        Initialize the client.
+
+        Args:
+            address (str): Server address, 'host:port' or 'unix:/path'.
+            timeout (float): Socket timeout in seconds.
+        """
+        self.address = address
+        self.timeout = timeout
+        self.conn = None
+
+    def _request(self, method: str, path: str, body: bytes = None) -> Dict[str, Any]:
+        """Send a request, reconnecting once if the kept-alive connection was closed."""
+        for attempt in range(2):
+            if self.conn is None:
+                if self.address.startswith("unix:"):
+                    self.conn = _UnixHTTPConnection(self.address[5:], self.timeout)
+                else:
+                    host, _, port = self.address.rpartition(":")
+                    self.conn = http.client.HTTPConnection(host or "127.0.0.1", int(port), timeout=self.timeout)
+            try:
+                self.conn.request(method, path, body=body)
+                response = self.conn.getresponse()
+                data = json.loads(response.read())
+                break
+            except (ConnectionError, http.client.HTTPException):
+                self.conn.close()
+                self.conn = None
+                if attempt:
+                    raise
+        if response.status != 200:
+            raise RuntimeError(f"inference server returned {response.status}: {data.get('error')}")
+        return data
+
+    def predict(self, im: Union[str, Path, bytes, np.ndarray]) -> Dict[str, Any]:
+        """
+        Run inference on one image.
+
+        Args:
+            im (str | Path | bytes | np.ndarray): Image file, encoded image bytes or BGR image array.
+
+        Returns:
+            (Dict[str, Any]): Image 'shape' and detection columns 'cls', 'conf' and 'xyxy'.
+        """
+        if isinstance(im, np.ndarray):
+            im = cv2.imencode(".png", im)[1].tobytes()
+        elif not isinstance(im, bytes):
+            im = Path(im).read_bytes()
+        return self._request("POST", "/predict", im)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the server statistics."""
+        return self._request("GET", "/stats")
+
+    def close(self) -> None:
+        """Close the connection."""
+        if self.conn:
+            self.conn.close()
+            self.conn = None
@@ -12,9 +12,11 @@ import os
 import subprocess
 import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from copy import copy, deepcopy
 from datetime import datetime, timedelta
 from pathlib import Path
+from types import SimpleNamespace
 
 import numpy as np
 import torch
@@ -23,7 +25,7 @@ from torch import nn, optim
 
 from ultralytics import __version__
 from ultralytics.cfg import get_cfg, get_save_dir
-from ultralytics.data.utils import check_cls_dataset, check_det_dataset
+from ultralytics.data.utils import check_cls_dataset, check_det_dataset, dataset_imgsz
 from ultralytics.nn.tasks import attempt_load_one_weight, attempt_load_weights
 from ultralytics.utils import (
     DEFAULT_CFG,
@@ -37,7 +39,7 @@ from ultralytics.utils import (
     colorstr,
     emojis,
 )
-from ultralytics.utils.autobatch import check_train_batch_size
+from ultralytics.utils.autobatch import check_train_batch_size, cpu_autotune
 from ultralytics.utils.checks import check_amp, check_file, check_imgsz, check_model_file_from_stem, print_args
 from ultralytics.utils.dist import ddp_cleanup, generate_ddp_command
 from ultralytics.utils.files import get_latest_run
@@ -166,6 +168,10 @@ class BaseTrainer:
         self.loss_names = ["Loss"]
         self.csv = self.save_dir / "results.csv"
         self.plot_idx = [0, 1, 2]
+        self.val_jobs = []  # pending (epoch, future) of val_async validations, merged in epoch order
+        self.val_jobs_max = 2  # pending val_async snapshots (one validating, one queued) before training waits
+        self._val_executor = None
+        self._val_state = None  # metrics, fitness and best_fitness seen by the val_async worker thread only
 
         # HUB
         self.hub_session = None
@@ -295,6 +301,9 @@ class BaseTrainer:
 
         # Check imgsz
         gs = max(int(self.model.stride.max() if hasattr(self.model, "stride") else 32), 32)  # grid size (max stride)
+        if self.args.imgsz == "auto":  # native dataset resolution, never upsample
+            self.args.imgsz = dataset_imgsz(self.data["train"], stride=gs) or DEFAULT_CFG.imgsz
+            LOGGER.info(f"imgsz=auto: using the native dataset size imgsz={self.args.imgsz}")
         self.args.imgsz = check_imgsz(self.args.imgsz, stride=gs, floor=gs, max_dim=1)
         self.stride = gs  # for multiscale training
 
@@ -318,7 +327,7 @@ class BaseTrainer:
             self.validator = self.get_validator()
             metric_keys = self.validator.metrics.keys + self.label_loss_items(prefix="val")
             self.metrics = dict(zip(metric_keys, [0] * len(metric_keys)))
-            self.ema = ModelEMA(self.model)
+            self.ema = ModelEMA(self.model, interval=self.args.ema_interval, foreach=self.args.ema_foreach)
             if self.args.plots:
                 self.plot_training_labels()
 
@@ -454,19 +463,25 @@ class BaseTrainer:
                 final_epoch = epoch + 1 >= self.epochs
                 self.ema.update_attr(self.model, include=["yaml", "nc", "args", "names", "stride", "class_weights"])
 
-                # Validation
-                if self.args.val or final_epoch or self.stopper.possible_stop or self.stop:
-                    self.metrics, self.fitness = self.validate()
-                self.save_metrics(metrics={**self.label_loss_items(self.tloss), **self.metrics, **self.lr})
-                self.stop |= self.stopper(epoch + 1, self.fitness) or final_epoch
+                if self.args.val_async:
+                    # Validate and save this epoch in the background, merge epochs that finished meanwhile
+                    self.validate_async(final_epoch)
+                    self.collect_async()
+                    self.stop |= final_epoch
+                else:
+                    # Validation
+                    if self.args.val or final_epoch or self.stopper.possible_stop or self.stop:
+                        self.metrics, self.fitness = self.validate()
+                    self.save_metrics(metrics={**self.label_loss_items(self.tloss), **self.metrics, **self.lr})
+                    self.stop |= self.stopper(epoch + 1, self.fitness) or final_epoch
+
+                    # Save model
+                    if self.args.save or final_epoch:
+                        self.save_model()
+                        self.run_callbacks("on_model_save")
                 if self.args.time:
                     self.stop |= (time.time() - self.train_time_start) > (self.args.time * 3600)
 
-                # Save model
-                if self.args.save or final_epoch:
-                    self.save_model()
-                    self.run_callbacks("on_model_save")
-
             # Scheduler
             t = time.time()
             self.epoch_time = t - self.epoch_time_start
@@ -491,6 +506,7 @@ class BaseTrainer:
             epoch += 1
 
         if RANK in {-1, 0}:
+            self.collect_async(wait=True)
             # Do final val with best.pt
             seconds = time.time() - self.train_time_start
             LOGGER.info(f"\n{epoch - self.start_epoch + 1} epochs completed in {seconds / 3600:.3f} hours.")
@@ -502,8 +518,18 @@ class BaseTrainer:
         unset_deterministic()
         self.run_callbacks("teardown")
 
-    def auto_batch(self, max_num_obj=0):
-        """Calculate optimal batch size based on model and device memory constraints."""
+    def auto_batch(self, max_num_obj=0, dataset=None):
+        """
+        Calculate optimal batch size based on model and device memory constraints.
+
+        On CPU the batch size, thread count and dataloader workers are tuned for throughput with `cpu_autotune`, which
+        also applies the thread count and updates `args.workers`.
+        """
+        if self.device.type == "cpu":
+            tuned = cpu_autotune(self.model, self.args.imgsz, train=True, workers=self.args.workers, dataset=dataset)
+            torch.set_num_threads(tuned["threads"])
+            self.args.workers = tuned["workers"]
+            return tuned["batch"]
         return check_train_batch_size(
             model=self.model,
             imgsz=self.args.imgsz,
@@ -551,36 +577,47 @@ class BaseTrainer:
 
     def save_model(self):
         """Save model training checkpoints with additional metadata."""
+        self.write_checkpoint(self.checkpoint_state())
+
+    def checkpoint_state(self, results=True):
+        """
+        Return a snapshot of the training state for a checkpoint, independent of further training steps.
+
+        Args:
+            results (bool): Whether to include the results.csv contents, which `validate_async` adds later instead.
+        """
+        return {
+            "epoch": self.epoch,
+            "best_fitness": self.best_fitness,
+            "model": None,  # resume and final checkpoints derive from EMA
+            "ema": deepcopy(self.ema.ema).half(),
+            "updates": self.ema.updates,
+            "optimizer": convert_optimizer_state_dict_to_fp16(deepcopy(self.optimizer.state_dict())),
+            "train_args": vars(self.args),  # save as dict
+            "train_metrics": {**self.metrics, **{"fitness": self.fitness}},
+            "train_results": self.read_results_csv() if results else None,
+            "date": datetime.now().isoformat(),
+            "version": __version__,
+            "license": "AGPL-3.0 (https://ultralytics.com/license)",
+            "docs": "https://docs.ultralytics.com",
+        }
+
+    def write_checkpoint(self, ckpt):
+        """Serialize a checkpoint from `checkpoint_state` and write last.pt, best.pt and periodic epoch checkpoints."""
         import io
 
         # Serialize ckpt to a byte buffer once (faster than repeated torch.save() calls)
         buffer = io.BytesIO()
-        torch.save(
-            {
-                "epoch": self.epoch,
-                "best_fitness": self.best_fitness,
-                "model": None,  # resume and final checkpoints derive from EMA
-                "ema": deepcopy(self.ema.ema).half(),
-                "updates": self.ema.updates,
-                "optimizer": convert_optimizer_state_dict_to_fp16(deepcopy(self.optimizer.state_dict())),
-                "train_args": vars(self.args),  # save as dict
-                "train_metrics": {**self.metrics, **{"fitness": self.fitness}},
-                "train_results": self.read_results_csv(),
-                "date": datetime.now().isoformat(),
-                "version": __version__,
-                "license": "AGPL-3.0 (https://ultralytics.com/license)",
-                "docs": "https://docs.ultralytics.com",
-            },
-            buffer,
-        )
+        torch.save(ckpt, buffer)
         serialized_ckpt = buffer.getvalue()  # get the serialized content to save
 
         # Save checkpoints
+        epoch = ckpt["epoch"]
         self.last.write_bytes(serialized_ckpt)  # save last.pt
-        if self.best_fitness == self.fitness:
+        if ckpt["best_fitness"] == ckpt["train_metrics"]["fitness"]:
             self.best.write_bytes(serialized_ckpt)  # save best.pt
-        if (self.save_period > 0) and (self.epoch % self.save_period == 0):
-            (self.wdir / f"epoch{self.epoch}.pt").write_bytes(serialized_ckpt)  # save epoch, i.e. 'epoch3.pt'
+        if (self.save_period > 0) and (epoch % self.save_period == 0):
+            (self.wdir / f"epoch{epoch}.pt").write_bytes(serialized_ckpt)  # save epoch, i.e. 'epoch3.pt'
         # if self.args.close_mosaic and self.epoch == (self.epochs - self.args.close_mosaic - 1):
         #    (self.wdir / "last_mosaic.pt").write_bytes(serialized_ckpt)  # save mosaic checkpoint
 
@@ -659,6 +696,102 @@ class BaseTrainer:
             self.best_fitness = fitness
         return metrics, fitness
 
+    def validate_async(self, final_epoch=False):
+        """
+        Queue validation and checkpointing of the current epoch on a background thread.
+
+        The EMA and optimizer are snapshot here, so training continues immediately while a single worker validates the
+        snapshot on `args.val_device` (the training device by default), appends the results.csv row and writes the
+        checkpoints. Results are merged into the trainer by `collect_async`. At most `val_jobs_max` snapshots, each
+        holding a copy of the EMA and optimizer state, are pending at once; beyond that training waits for the oldest.
+
+        Args:
+            final_epoch (bool): Whether this is the last training epoch, which is always validated and saved.
+        """
+        if self._val_executor is None:
+            self._val_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="val_async")  # epochs in order
+            self._val_state = SimpleNamespace(
+                metrics=self.metrics, fitness=self.fitness, best_fitness=self.best_fitness
+            )
+        while len(self.val_jobs) >= self.val_jobs_max:
+            self.collect_async(oldest=True)  # bound memory when validation is slower than an epoch
+        val = self.args.val or final_epoch or self.stopper.possible_stop or self.stop
+        job = SimpleNamespace(
+            epoch=self.epoch,
+            epochs=self.epochs,
+            val=val,
+            ema=deepcopy(self.ema.ema) if val else None,
+            loss=-self.loss.detach().cpu().numpy(),
+            loss_items=self.loss_items.detach().clone(),
+            train_metrics={**self.label_loss_items(self.tloss), **self.lr},
+            possible_stop=self.stopper.possible_stop,
+            ckpt=self.checkpoint_state(results=False) if self.args.save or final_epoch else None,
+        )
+        self.val_jobs.append((job.epoch, self._val_executor.submit(self._run_val_job, job)))
+
+    def _run_val_job(self, job):
+        """
+        Validate, log and checkpoint one `validate_async` snapshot on the background thread.
+
+        Only `_val_state` is updated here, the trainer attributes are assigned from the returned values by
+        `collect_async` on the training thread.
+
+        Returns:
+            (tuple): metrics, fitness, best_fitness and whether a checkpoint was saved.
+        """
+        state = self._val_state
+        metrics, fitness = state.metrics, state.fitness  # carried over from the last validated epoch
+        if job.val:
+            device = torch.device(self.args.val_device) if self.args.val_device not in {None, ""} else self.device
+            if device.type == "cuda" and device.index is None:
+                device = torch.device("cuda", 0)
+            ema = job.ema.to(device)
+            trainer = SimpleNamespace(  # the validator only reads these trainer attributes
+                device=device,
+                data=self.data,
+                amp=self.amp,
+                ema=SimpleNamespace(ema=ema),
+                model=ema,
+                loss_items=job.loss_items.to(device),
+                stopper=SimpleNamespace(possible_stop=job.possible_stop),
+                epoch=job.epoch,
+                epochs=job.epochs,
+                label_loss_items=self.label_loss_items,
+            )
+            metrics = self.validator(trainer)
+            fitness = metrics.pop("fitness", job.loss)  # use loss as fitness measure if not found
+            if not state.best_fitness or state.best_fitness < fitness:
+                state.best_fitness = fitness
+        state.metrics, state.fitness = metrics, fitness
+        self.save_metrics(metrics={**job.train_metrics, **metrics}, epoch=job.epoch)
+        if job.ckpt is not None:
+            job.ckpt.update(
+                best_fitness=state.best_fitness,
+                train_metrics={**metrics, "fitness": fitness},
+                train_results=self.read_results_csv(),
+            )
+            self.write_checkpoint(job.ckpt)
+        return metrics, fitness, state.best_fitness, job.ckpt is not None
+
+    def collect_async(self, wait=False, oldest=False):
+        """
+        Merge finished `validate_async` epochs into the trainer metrics, early stopping and callbacks, in epoch order.
+
+        Args:
+            wait (bool): Wait for all queued epochs instead of only merging those already finished.
+            oldest (bool): Wait for the oldest queued epoch, then merge it and any others already finished.
+        """
+        while self.val_jobs and (wait or oldest or self.val_jobs[0][1].done()):
+            epoch, future = self.val_jobs.pop(0)
+            oldest = False
+            self.metrics, self.fitness, self.best_fitness, saved = future.result()
+            self.stop |= self.stopper(epoch + 1, self.fitness)
+            if saved:
+                self.run_callbacks("on_model_save")
+        if wait and self._val_executor is not None:
+            self._val_executor.shutdown()
+            self._val_executor = None
+
     def get_model(self, cfg=None, weights=None, verbose=True):
         """Get model and raise NotImplementedError for loading cfg files."""
         raise NotImplementedError("This task trainer doesn't support loading cfg files")
@@ -705,14 +838,15 @@ class BaseTrainer:
         """Plot training labels for YOLO model."""
         pass
 
-    def save_metrics(self, metrics):
-        """Save training metrics to a CSV file."""
+    def save_metrics(self, metrics, epoch=None):
+        """Save training metrics of `epoch` (default the current epoch) to a CSV file."""
         keys, vals = list(metrics.keys()), list(metrics.values())
         n = len(metrics) + 2  # number of cols
         s = "" if self.csv.exists() else (("%s," * n % tuple(["epoch", "time"] + keys)).rstrip(",") + "\n")  # header
         t = time.time() - self.train_time_start
+        epoch = self.epoch if epoch is None else epoch
         with open(self.csv, "a", encoding="utf-8") as f:
-            f.write(s + ("%.6g," * n % tuple([self.epoch + 1, t] + vals)).rstrip(",") + "\n")
+            f.write(s + ("%.6g," * n % tuple([epoch + 1, t] + vals)).rstrip(",") + "\n")
 
     def plot_metrics(self):
         """Plot and display metrics visually."""
@@ -31,9 +31,9 @@ import numpy as np
 import torch
 
 from ultralytics.cfg import get_cfg, get_save_dir
-from ultralytics.data.utils import check_cls_dataset, check_det_dataset
+from ultralytics.data.utils import check_cls_dataset, check_det_dataset, dataset_imgsz
 from ultralytics.nn.autobackend import AutoBackend
-from ultralytics.utils import LOGGER, TQDM, callbacks, colorstr, emojis
+from ultralytics.utils import DEFAULT_CFG, LOGGER, TQDM, callbacks, colorstr, emojis
 from ultralytics.utils.checks import check_imgsz
 from ultralytics.utils.ops import Profile
 from ultralytics.utils.torch_utils import de_parallel, select_device, smart_inference_mode
@@ -125,7 +125,8 @@ class BaseValidator:
         (self.save_dir / "labels" if self.args.save_txt else self.save_dir).mkdir(parents=True, exist_ok=True)
         if self.args.conf is None:
             self.args.conf = 0.001  # default conf=0.001
-        self.args.imgsz = check_imgsz(self.args.imgsz, max_dim=1)
+        if self.args.imgsz != "auto":  # resolved from the dataset once it is loaded
+            self.args.imgsz = check_imgsz(self.args.imgsz, max_dim=1)
 
         self.plots = {}
         self.callbacks = _callbacks or callbacks.get_default_callbacks()
@@ -168,13 +169,6 @@ class BaseValidator:
             self.device = model.device  # update device
             self.args.half = model.fp16  # update half
             stride, pt, jit, engine = model.stride, model.pt, model.jit, model.engine
-            imgsz = check_imgsz(self.args.imgsz, stride=stride)
-            if engine:
-                self.args.batch = model.batch_size
-            elif not (pt or jit or getattr(model, "dynamic", False)):
-                self.args.batch = model.metadata.get("batch", 1)  # export.py models default to batch-size 1
-                LOGGER.info(f"Setting batch={self.args.batch} input of shape ({self.args.batch}, 3, {imgsz}, {imgsz})")
-
             if str(self.args.data).rsplit(".", 1)[-1] in {"yaml", "yml"}:
                 self.data = check_det_dataset(self.args.data)
             elif self.args.task == "classify":
@@ -182,6 +176,17 @@ class BaseValidator:
             else:
                 raise FileNotFoundError(emojis(f"Dataset '{self.args.data}' for task={self.args.task} not found ❌"))
 
+            if self.args.imgsz == "auto":  # native dataset resolution, never upsample
+                gs = max(int(stride), 32)
+                self.args.imgsz = dataset_imgsz(self.data.get(self.args.split), stride=gs) or DEFAULT_CFG.imgsz
+                LOGGER.info(f"imgsz=auto: using the native dataset size imgsz={self.args.imgsz}")
+            imgsz = check_imgsz(self.args.imgsz, stride=stride)
+            if engine:
+                self.args.batch = model.batch_size
+            elif not (pt or jit or getattr(model, "dynamic", False)):
+                self.args.batch = model.metadata.get("batch", 1)  # export.py models default to batch-size 1
+                LOGGER.info(f"Setting batch={self.args.batch} input of shape ({self.args.batch}, 3, {imgsz}, {imgsz})")
+
             if self.device.type in {"cpu", "mps"}:
                 self.args.workers = 0  # faster CPU val as time dominated by inference, not dataloading
             if not (pt or (getattr(model, "dynamic", False) and not model.imx)):
@@ -268,33 +273,41 @@ class BaseValidator:
         Returns:
             (torch.Tensor): Correct tensor of shape (N, 10) for 10 IoU thresholds.
         """
-        # Dx10 matrix, where D - detections, 10 - IoU thresholds
-        correct = np.zeros((pred_classes.shape[0], self.iouv.shape[0])).astype(bool)
         # LxD matrix where L - labels (rows), D - detections (columns)
         correct_class = true_classes[:, None] == pred_classes
         iou = iou * correct_class  # zero out the wrong classes
-        iou = iou.cpu().numpy()
-        for i, threshold in enumerate(self.iouv.cpu().tolist()):
-            if use_scipy:
-                # WARNING: known issue that reduces mAP in https://github.com/ultralytics/ultralytics/pull/4708
-                import scipy  # scope import to avoid importing for all commands
-
+        if use_scipy:
+            # WARNING: known issue that reduces mAP in https://github.com/ultralytics/ultralytics/pull/4708
+            import scipy  # scope import to avoid importing for all commands
+
+            # Dx10 matrix, where D - detections, 10 - IoU thresholds
+            correct = np.zeros((pred_classes.shape[0], self.iouv.shape[0])).astype(bool)
+            iou = iou.cpu().numpy()
+            for i, threshold in enumerate(self.iouv.cpu().tolist()):
                 cost_matrix = iou * (iou >= threshold)
                 if cost_matrix.any():
                     labels_idx, detections_idx = scipy.optimize.linear_sum_assignment(cost_matrix)
                     valid = cost_matrix[labels_idx, detections_idx] > 0
                     if valid.any():
                         correct[detections_idx[valid], i] = True
-            else:
-                matches = np.nonzero(iou >= threshold)  # IoU > threshold and classes match
-                matches = np.array(matches).T
-                if matches.shape[0]:
-                    if matches.shape[0] > 1:
-                        matches = matches[iou[matches[:, 0], matches[:, 1]].argsort()[::-1]]
-                        matches = matches[np.unique(matches[:, 1], return_index=True)[1]]
-                        matches = matches[np.unique(matches[:, 0], return_index=True)[1]]
-                    correct[matches[:, 1].astype(int), i] = True
-        return torch.tensor(correct, dtype=torch.bool, device=pred_classes.device)
+            return torch.tensor(correct, dtype=torch.bool, device=pred_classes.device)
+
+        # All thresholds at once: every detection keeps its best label (ties go to the last label), then every label
+        # keeps the first detection that matched it above the threshold, so a detection is correct at threshold t if
+        # its IoU is >= t and no earlier detection of the same label reached t
+        n, m = iou.shape[1], iou.shape[0]
+        iouv = self.iouv.to(iou.device)
+        if n == 0 or m == 0:
+            return torch.zeros((n, iouv.shape[0]), dtype=torch.bool, device=pred_classes.device)
+        best_iou, best_label = iou.flip(0).max(0)
+        best_label = m - 1 - best_label
+        cols = torch.arange(n, device=iou.device)
+        earlier = torch.full_like(iou, -1.0)
+        earlier[best_label, cols] = best_iou
+        earlier = earlier.cummax(1).values  # running best IoU of earlier detections per label
+        earlier = torch.cat([earlier.new_full((m, 1), -1.0), earlier[:, :-1]], 1)[best_label, cols]
+        correct = (best_iou[:, None] >= iouv) & (earlier[:, None] < iouv)
+        return correct.to(pred_classes.device)
 
     def add_callback(self, event: str, callback):
         """Append the given callback to the specified event."""
@@ -1,7 +1,7 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
 from ultralytics.engine.predictor import BasePredictor
-from ultralytics.engine.results import Results
+from ultralytics.engine.results import Results, SlimResults, pack_detections
 from ultralytics.utils import ops
 
 
@@ -64,6 +64,7 @@ class DetectionPredictor(BasePredictor):
             end2end=getattr(self.model, "end2end", False),
             rotated=self.args.task == "obb",
             return_idxs=save_feats,
+            batched=self.args.batched_nms,
         )
 
         if not isinstance(orig_imgs, list):  # input images are a torch.Tensor, not a list
@@ -101,13 +102,37 @@ class DetectionPredictor(BasePredictor):
             orig_imgs (List[np.ndarray]): List of original images before preprocessing.
 
         Returns:
-            (List[Results]): List of Results objects containing detection information for each image.
+            (List[Results]): List of Results objects containing detection information for each image, or
+                SlimResults views into one packed array if `slim` is set for detection.
         """
+        if self.args.slim and self.args.task == "detect":
+            return self.construct_slim_results(preds, img, orig_imgs)
         return [
             self.construct_result(pred, img, orig_img, img_path)
             for pred, orig_img, img_path in zip(preds, orig_imgs, self.batch[0])
         ]
 
+    def construct_slim_results(self, preds, img, orig_imgs):
+        """
+        Construct SlimResults sharing one packed detection array, without retaining the original images.
+
+        Args:
+            preds (List[torch.Tensor]): List of predicted bounding boxes and scores for each image.
+            img (torch.Tensor): Batch of preprocessed images used for inference.
+            orig_imgs (List[np.ndarray]): List of original images before preprocessing.
+
+        Returns:
+            (List[SlimResults]): Per-image views, holding a reference to the original image only if `slim="img"`.
+        """
+        for pred, orig_img in zip(preds, orig_imgs):
+            pred[:, :4] = ops.scale_boxes(img.shape[2:], pred[:, :4], orig_img.shape)
+        packed = pack_detections(preds)
+        keep = self.args.slim == "img"
+        return [
+            SlimResults(packed, i, img_path, self.model.names, orig_img.shape, orig_img if keep else None)
+            for i, (orig_img, img_path) in enumerate(zip(orig_imgs, self.batch[0]))
+        ]
+
     def construct_result(self, pred, img, orig_img, img_path):
         """
         Construct a single Results object from one image prediction.
@@ -9,6 +9,7 @@ import numpy as np
 import torch.nn as nn
 
 from ultralytics.data import build_dataloader, build_yolo_dataset
+from ultralytics.data.utils import is_full_frame_dataset
 from ultralytics.engine.trainer import BaseTrainer
 from ultralytics.models import yolo
 from ultralytics.nn.tasks import DetectionModel
@@ -99,6 +100,9 @@ class DetectionTrainer(BaseTrainer):
             (Dict): Preprocessed batch with normalized images.
         """
         batch["img"] = batch["img"].to(self.device, non_blocking=True).float() / 255
+        batch_transforms = getattr(self.train_loader.dataset, "batch_transforms", None)
+        if batch_transforms is not None:
+            batch = batch_transforms(batch)  # on-device augmentations from data.yaml
         if self.args.multi_scale:
             imgs = batch["img"]
             sz = (
@@ -137,8 +141,33 @@ class DetectionTrainer(BaseTrainer):
 
         Returns:
             (DetectionModel): YOLO detection model.
+
+        Notes:
+            With `full_frame=True` (or "auto" on a dataset where every image has a single full-frame box) the neck
+            and Detect head are replaced by a pooled FullFrameDetect head on the same backbone.
         """
-        model = DetectionModel(cfg, nc=self.data["nc"], ch=self.data["channels"], verbose=verbose and RANK == -1)
+        if isinstance(weights, nn.Module) and weights.yaml.get("pruned"):  # channels no longer match the yaml
+            if weights.model[-1].nc != self.data["nc"]:
+                raise ValueError(
+                    f"Pruned model has nc={weights.model[-1].nc} but dataset '{self.args.data}' has "
+                    f"nc={self.data['nc']}, a pruned head cannot be rebuilt for other classes. "
+                    "Fine-tune it on the dataset it was trained on."
+                )
+            LOGGER.info(f"Fine-tuning pruned model (amount={weights.yaml['pruned']}) instead of building it from yaml")
+            return weights
+        full_frame = self.args.full_frame
+        if full_frame == "auto":
+            full_frame = is_full_frame_dataset(self.data["train"])
+            LOGGER.info(f"full_frame=auto: {'using FullFrameDetect head' if full_frame else 'keeping Detect head'}")
+        if full_frame and self.args.mosaic:
+            LOGGER.warning("full_frame training with mosaic>0 tiles several images into one, consider mosaic=0")
+        model = DetectionModel(
+            cfg,
+            nc=self.data["nc"],
+            ch=self.data["channels"],
+            verbose=verbose and RANK == -1,
+            full_frame=bool(full_frame),
+        )
         if weights:
             model.load(weights)
         return model
@@ -215,4 +244,4 @@ class DetectionTrainer(BaseTrainer):
         """
         train_dataset = self.build_dataset(self.data["train"], mode="train", batch=16)
         max_num_obj = max(len(label["cls"]) for label in train_dataset.labels) * 4  # 4 for mosaic augmentation
-        return super().auto_batch(max_num_obj)
+        return super().auto_batch(max_num_obj, dataset=train_dataset)
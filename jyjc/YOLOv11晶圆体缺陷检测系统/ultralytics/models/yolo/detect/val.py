@@ -131,6 +131,7 @@ class DetectionValidator(BaseValidator):
             max_det=self.args.max_det,
             end2end=self.end2end,
             rotated=self.args.task == "obb",
+            batched=self.args.batched_nms,
         )
 
     def _prepare_batch(self, si: int, batch: Dict[str, Any]) -> Dict[str, Any]:
@@ -256,7 +256,9 @@ class AutoBackend(nn.Module):
                     cuda = False
             LOGGER.info(f"Using ONNX Runtime {providers[0]}")
             if onnx:
-                session = onnxruntime.InferenceSession(w, providers=providers)
+                session_options = onnxruntime.SessionOptions()
+                session_options.intra_op_num_threads = torch.get_num_threads()  # follow torch.set_num_threads()
+                session = onnxruntime.InferenceSession(w, session_options, providers=providers)
             else:
                 check_requirements(
                     ["model-compression-toolkit>=2.3.0", "sony-custom-layers[torch]>=0.3.0", "onnxruntime-extensions"]
@@ -298,6 +300,7 @@ class AutoBackend(nn.Module):
             import openvino as ov
 
             core = ov.Core()
+            core.set_property("CPU", {"INFERENCE_NUM_THREADS": torch.get_num_threads()})  # follow torch threads
             device_name = "AUTO"
             if isinstance(device, str) and device.startswith("intel"):
                 device_name = device.split(":")[1].upper()  # Intel OpenVINO device
@@ -63,6 +63,7 @@ from .block import (
     myCBAM,
     C3CA,
     C3ECA,
+    CoordAtt,
 )
 from .conv import (
     CBAM,
@@ -84,6 +85,7 @@ from .head import (
     OBB,
     Classify,
     Detect,
+    FullFrameDetect,
     LRPCHead,
     Pose,
     RTDETRDecoder,
@@ -149,6 +151,7 @@ __all__ = (
     "Segment",
     "Pose",
     "Classify",
+    "FullFrameDetect",
     "TransformerEncoderLayer",
     "RepC3",
     "RTDETRDecoder",
@@ -185,5 +188,6 @@ __all__ = (
     "A2C2f",
     "myCBAM",
     "C3CA",
-    "C3ECA"
+    "C3ECA",
+    "CoordAtt",
 )
@@ -54,6 +54,7 @@ __all__ = (
     "TorchVision",
     "myCBAM",
     "C3CA",
+    "CoordAtt",
 )
 
 
@@ -2049,10 +2050,9 @@ class ChannelAttention(nn.Module):
         self.sigmoid = nn.Sigmoid()
 
     def forward(self, x):
-        avg_out = self.fc(self.avg_pool(x))
-        max_out = self.fc(self.max_pool(x))
-        out = avg_out + max_out
-        return self.sigmoid(out)
+        n = x.shape[0]
+        out = self.fc(torch.cat([self.avg_pool(x), self.max_pool(x)]))  # 共享MLP一次处理两种池化结果
+        return (out[:n] + out[n:]).sigmoid_()
 
 
 class SpatialAttention(nn.Module):
@@ -2066,8 +2066,7 @@ class SpatialAttention(nn.Module):
         avg_out = torch.mean(x, dim=1, keepdim=True)
         max_out, _ = torch.max(x, dim=1, keepdim=True)
         x = torch.cat([avg_out, max_out], dim=1)
-        x = self.conv1(x)
-        return self.sigmoid(x)
+        return self.conv1(x).sigmoid_()
 
 class myCBAM(nn.Module):
     def __init__(self, in_planes, ratio=16, kernel_size=7):
@@ -2083,41 +2082,19 @@ class myCBAM(nn.Module):
 class h_sigmoid(nn.Module):
     def __init__(self, inplace=True):
         super(h_sigmoid, self).__init__()
-        self.relu = nn.ReLU6(inplace=inplace)
+        self.relu = nn.ReLU6(inplace=inplace)  # 保留以兼容已保存的权重
 
     def forward(self, x):
-        return self.relu(x + 3) / 6
+        return F.hardsigmoid(x)  # relu6(x + 3) / 6, 单个算子
 
 
 class h_swish(nn.Module):
     def __init__(self, inplace=True):
         super(h_swish, self).__init__()
-        self.sigmoid = h_sigmoid(inplace=inplace)
+        self.sigmoid = h_sigmoid(inplace=inplace)  # 保留以兼容已保存的权重
 
     def forward(self, x):
-        return x * self.sigmoid(x)
-
-
-import torch
-import torch.nn as nn
-
-
-class h_sigmoid(nn.Module):
-    def __init__(self, inplace=True):
-        super(h_sigmoid, self).__init__()
-        self.relu = nn.ReLU6(inplace=inplace)
-
-    def forward(self, x):
-        return self.relu(x + 3) / 6
-
-
-class h_swish(nn.Module):
-    def __init__(self, inplace=True):
-        super(h_swish, self).__init__()
-        self.sigmoid = h_sigmoid(inplace=inplace)
-
-    def forward(self, x):
-        return x * self.sigmoid(x)
+        return F.hardswish(x)  # x * relu6(x + 3) / 6, 单个算子
 
 
 class CoordAtt(nn.Module):
@@ -2150,6 +2127,23 @@ class CoordAtt(nn.Module):
         out = identity * a_h * a_w
         return out
 
+    def forward_fuse(self, x):
+        """Coordinate attention after fuse(): conv1 carries bn1, conv_hw computes both directions at once."""
+        n, c, h, w = x.size()
+        y = torch.cat([x.mean(3, keepdim=True), x.mean(2, keepdim=True).transpose(2, 3)], dim=2)  # [n, c, h+w, 1]
+        a = self.conv_hw(self.act(self.conv1(y))).sigmoid_()  # [n, 2c, h+w, 1]
+        return x * a[:, :c, :h] * a[:, c:, h:].transpose(2, 3)  # [n, c, h, 1], [n, c, 1, w]
+
+    @torch.no_grad()
+    def fuse(self):
+        """Fold bn1 into conv1 and merge conv_h/conv_w into a single 1x1 conv with 2*channels outputs."""
+        self.conv1 = fuse_conv_and_bn(self.conv1, self.bn1)
+        conv_hw = nn.Conv2d(self.conv_h.in_channels, 2 * self.channels, 1).requires_grad_(False)
+        conv_hw.weight.copy_(torch.cat([self.conv_h.weight, self.conv_w.weight]))
+        conv_hw.bias.copy_(torch.cat([self.conv_h.bias, self.conv_w.bias]))
+        self.conv_hw = conv_hw.to(self.conv_h.weight.device)
+        del self.bn1, self.conv_h, self.conv_w
+
 
 class CABottleneck(nn.Module):
 
@@ -2199,10 +2193,8 @@ class ECABottleneck(nn.Module):
     def forward(self, x):
         x1 = self.cv2(self.cv1(x))
         # out=self.eca(x1)*x1
-        y = self.avg_pool(x1)
-        y = self.conv(y.squeeze(-1).transpose(-1, -2)).transpose(-1, -2).unsqueeze(-1)
-        y = self.sigmoid(y)
-        out = x1 * y.expand_as(x1) #对应通道乘以系数
+        y = self.conv(x1.mean((2, 3)).unsqueeze(1)).sigmoid_()  # [n, 1, c]
+        out = x1 * y.transpose(1, 2).unsqueeze(-1)  # 对应通道乘以系数(广播, 不展开)
         return x + out if self.add else out
 
 
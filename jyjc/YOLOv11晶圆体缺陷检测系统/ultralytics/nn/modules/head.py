@@ -18,7 +18,18 @@ from .conv import Conv, DWConv
 from .transformer import MLP, DeformableTransformerDecoder, DeformableTransformerDecoderLayer
 from .utils import bias_init_with_prob, linear_init
 
-__all__ = "Detect", "Segment", "Pose", "Classify", "OBB", "RTDETRDecoder", "v10Detect", "YOLOEDetect", "YOLOESegment"
+__all__ = (
+    "Detect",
+    "Segment",
+    "Pose",
+    "Classify",
+    "FullFrameDetect",
+    "OBB",
+    "RTDETRDecoder",
+    "v10Detect",
+    "YOLOEDetect",
+    "YOLOESegment",
+)
 
 
 class Detect(nn.Module):
@@ -471,6 +482,62 @@ class Classify(nn.Module):
         return y if self.export else (y, x)
 
 
+class FullFrameDetect(Classify):
+    """
+    YOLO whole-image detection head, i.e. x(b,c1,20,20) to one full-frame detection x(b,1,6) per image.
+
+    For datasets where every image carries exactly one box covering (nearly) the whole frame, localisation is
+    trivial and the three-scale Detect head, DFL decoding, task-aligned assignment and NMS are pure overhead. This
+    head pools the backbone output like Classify and emits the top class as a full-frame box in end-to-end
+    `[x1, y1, x2, y2, conf, cls]` format, so the standard detection predictor, validator and Results plotting work
+    unchanged.
+
+    Attributes:
+        nc (int): Number of classes.
+        stride (torch.Tensor): Stride of the input feature map, set by DetectionModel.
+
+    Methods:
+        forward: Return class logits in training mode, else full-frame detections.
+
+    Examples:
+        Create a full-frame detection head
+        >>> head = FullFrameDetect(c1=256, c2=9)
+        >>> head.stride = torch.tensor([32.0])
+        >>> x = torch.randn(1, 256, 13, 13)
+        >>> y, logits = head.eval()(x)  # y.shape == (1, 1, 6)
+    """
+
+    def __init__(self, c1: int, c2: int, k: int = 1, s: int = 1, p: Optional[int] = None, g: int = 1):
+        """
+        Initialize the full-frame detection head.
+
+        Args:
+            c1 (int): Number of input channels.
+            c2 (int): Number of classes.
+            k (int, optional): Kernel size.
+            s (int, optional): Stride.
+            p (int, optional): Padding.
+            g (int, optional): Groups.
+        """
+        super().__init__(c1, c2, k, s, p, g)
+        self.nc = c2
+        self.stride = torch.zeros(1)  # strides computed during build
+
+    def forward(self, x: Union[List[torch.Tensor], torch.Tensor]) -> Union[torch.Tensor, Tuple]:
+        """Return class logits when training, otherwise full-frame detections (and logits unless exporting)."""
+        if isinstance(x, list):
+            x = torch.cat(x, 1)
+        h, w = x.shape[2:]
+        logits = self.linear(self.drop(self.pool(self.conv(x)).flatten(1)))
+        if self.training:
+            return logits
+        conf, cls = logits.softmax(1).max(1, keepdim=True)
+        s = float(self.stride[0])
+        box = logits.new_tensor([0.0, 0.0, w * s, h * s]).expand(len(logits), 4)  # full frame in input pixels
+        y = torch.cat((box, conf, cls.to(conf.dtype)), 1).unsqueeze(1)
+        return y if self.export else (y, logits)
+
+
 class WorldDetect(Detect):
     """
     Head for integrating YOLO detection models with semantic understanding from text embeddings.
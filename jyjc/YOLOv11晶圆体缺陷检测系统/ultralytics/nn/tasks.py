@@ -44,6 +44,7 @@ from ultralytics.nn.modules import (
     Conv2,
     ConvTranspose,
     Detect,
+    FullFrameDetect,
     DWConv,
     DWConvTranspose2d,
     Focus,
@@ -70,11 +71,13 @@ from ultralytics.nn.modules import (
     v10Detect,
     myCBAM,
     C3CA,
+    CoordAtt,
 )
 from ultralytics.utils import DEFAULT_CFG_DICT, DEFAULT_CFG_KEYS, LOGGER, YAML, colorstr, emojis
 from ultralytics.utils.checks import check_requirements, check_suffix, check_yaml
 from ultralytics.utils.loss import (
     E2EDetectLoss,
+    FullFrameLoss,
     v8ClassificationLoss,
     v8DetectionLoss,
     v8OBBLoss,
@@ -248,6 +251,9 @@ class BaseModel(torch.nn.Module):
                 if isinstance(m, RepVGGDW):
                     m.fuse()
                     m.forward = m.forward_fuse
+                if isinstance(m, CoordAtt) and hasattr(m, "bn1"):
+                    m.fuse()
+                    m.forward = m.forward_fuse
                 if isinstance(m, v10Detect):
                     m.fuse()  # remove one2many head
             self.info(verbose=verbose)
@@ -372,7 +378,7 @@ class DetectionModel(BaseModel):
         >>> results = model.predict(image_tensor)
     """
 
-    def __init__(self, cfg="yolo11n.yaml", ch=3, nc=None, verbose=True):
+    def __init__(self, cfg="yolo11n.yaml", ch=3, nc=None, verbose=True, full_frame=False):
         """
         Initialize the YOLO detection model with the given config and parameters.
 
@@ -381,9 +387,13 @@ class DetectionModel(BaseModel):
             ch (int): Number of input channels.
             nc (int, optional): Number of classes.
             verbose (bool): Whether to display model information.
+            full_frame (bool): Replace the neck and Detect head with a pooled FullFrameDetect head on the backbone
+                output, for datasets with one full-frame box per image.
         """
         super().__init__()
         self.yaml = cfg if isinstance(cfg, dict) else yaml_model_load(cfg)  # cfg dict
+        if full_frame and self.yaml["head"][-1][2] != "FullFrameDetect":
+            self.yaml = {**self.yaml, "head": [[-1, 1, "FullFrameDetect", ["nc"]]]}  # drop neck, keep backbone
         if self.yaml["backbone"][0][2] == "Silence":
             LOGGER.warning(
                 "YOLOv9 `Silence` module is deprecated in favor of torch.nn.Identity. "
@@ -419,6 +429,13 @@ class DetectionModel(BaseModel):
             self.stride = m.stride
             self.model.train()  # Set model back to training(default) mode
             m.bias_init()  # only run once
+        elif isinstance(m, FullFrameDetect):
+            s = 256
+            m.stride = torch.ones(1)
+            self.model.eval()
+            m.stride = torch.tensor([s / self.forward(torch.zeros(1, ch, s, s))[0][0, 0, 3].item()])  # s / feature h
+            self.stride = m.stride
+            self.model.train()
         else:
             self.stride = torch.Tensor([32])  # default stride for i.e. RTDETR
 
@@ -497,6 +514,8 @@ class DetectionModel(BaseModel):
 
     def init_criterion(self):
         """Initialize the loss criterion for the DetectionModel."""
+        if isinstance(self.model[-1], FullFrameDetect):
+            return FullFrameLoss(self)
         return E2EDetectLoss(self) if getattr(self, "end2end", False) else v8DetectionLoss(self)
 
 
@@ -1605,6 +1624,7 @@ def parse_model(d, ch, verbose=True):
     base_modules = frozenset(
         {
             Classify,
+            FullFrameDetect,
             Conv,
             ConvTranspose,
             GhostConv,
@@ -1827,6 +1847,8 @@ def guess_model_task(model):
         for m in model.modules():
             if isinstance(m, (Segment, YOLOESegment)):
                 return "segment"
+            elif isinstance(m, FullFrameDetect):
+                return "detect"
             elif isinstance(m, Classify):
                 return "classify"
             elif isinstance(m, Pose):
@@ -2,14 +2,16 @@
 """Functions for estimating the best YOLO batch size to use a fraction of the available CUDA memory in PyTorch."""
 
 import os
+import platform
+import time
 from copy import deepcopy
-from typing import Union
+from typing import Any, Dict, Union
 
 import numpy as np
 import torch
 
-from ultralytics.utils import DEFAULT_CFG, LOGGER, colorstr
-from ultralytics.utils.torch_utils import autocast, profile_ops
+from ultralytics.utils import DEFAULT_CFG, LOGGER, PERSISTENT_CACHE, colorstr
+from ultralytics.utils.torch_utils import autocast, get_cpu_info, profile_ops
 
 
 def check_train_batch_size(
@@ -117,3 +119,109 @@ def autobatch(
         return batch_size
     finally:
         torch.cuda.empty_cache()
+
+
+def cpu_autotune(
+    model: torch.nn.Module,
+    imgsz: int = 640,
+    train: bool = True,
+    workers: int = DEFAULT_CFG.workers,
+    dataset=None,
+    fraction: float = 0.60,
+    batch_sizes=None,
+    cache: bool = True,
+) -> Dict[str, Any]:
+    """
+    Find the CPU batch size, intra-op thread count and loader worker count with the highest images/second.
+
+    Each candidate thread count is applied with `torch.set_num_threads` and the model is profiled with `profile_ops`
+    over increasing batch sizes, stopping once throughput drops or the resident memory, extrapolated linearly from the
+    profiled batches, would exceed `fraction` of the available RAM. If a dataset is given, its per-image loading cost
+    is timed once and each worker count that fits on the remaining cores is scored as the slower of the compute and
+    loading rates (sequential loading for 0 workers). The choice is cached per machine, model, image size and mode.
+
+    Args:
+        model (torch.nn.Module): YOLO model on CPU.
+        imgsz (int): Input image size.
+        train (bool): Profile forward and backward passes for training, forward only for prediction.
+        workers (int): Maximum number of dataloader workers.
+        dataset (Dataset, optional): Dataset whose per-image loading cost is measured to choose the worker count.
+        fraction (float): Fraction of the available RAM the largest batch may use.
+        batch_sizes (tuple, optional): Candidate batch sizes in increasing order, by default from 4 for training to
+            keep BatchNorm statistics meaningful and from 1 for prediction.
+        cache (bool): Reuse and store the result in the persistent cache.
+
+    Returns:
+        (Dict[str, Any]): Chosen 'batch', 'threads' and 'workers' and the estimated 'throughput' in images/second.
+
+    Examples:
+        >>> cfg = cpu_autotune(model, imgsz=416, train=False)
+        >>> torch.set_num_threads(cfg["threads"])
+    """
+    import psutil
+
+    prefix = colorstr("AutoBatch: ")
+    batch_sizes = batch_sizes or ((4, 8, 16, 32, 64) if train else (1, 2, 4, 8, 16, 32))
+    cpus = os.cpu_count() or 1
+    mode = "train" if train else "predict"
+    params = sum(p.numel() for p in model.parameters())
+    key = f"{platform.node()}|{get_cpu_info()}|{cpus}|{type(model).__name__}-{params}|{imgsz}|{mode}|{workers}"
+    tuned = PERSISTENT_CACHE.get("cpu_autotune", {})
+    if cache and key in tuned:
+        LOGGER.info(f"{prefix}Using cached CPU {mode} settings {tuned[key]}")
+        return tuned[key]
+
+    LOGGER.info(f"{prefix}Profiling CPU {mode} throughput for imgsz={imgsz} on {cpus} cores")
+    load_ms = 0.0
+    if dataset is not None and len(dataset):
+        n = min(len(dataset), 8)
+        t = time.perf_counter()
+        for i in range(n):
+            dataset[i]
+        load_ms = (time.perf_counter() - t) * 1000 / n
+
+    model = deepcopy(model).train(train)
+    threads0, process = torch.get_num_threads(), psutil.Process()
+    budget = process.memory_info().rss + psutil.virtual_memory().available * fraction
+    best = {"batch": batch_sizes[0], "threads": threads0, "workers": 0, "throughput": 0.0}
+    try:
+        for threads in sorted({max(cpus // 4, 1), max(cpus // 2, 1), cpus}):
+            torch.set_num_threads(threads)
+            rss, last = [], 0.0
+            for b in batch_sizes:
+                if len(rss) > 1:  # extrapolate memory of this batch size from the profiled ones
+                    p = np.polyfit(batch_sizes[: len(rss)], rss, deg=1)
+                    if np.polyval(p, b) > budget:
+                        break
+                y = profile_ops(torch.empty(b, 3, imgsz, imgsz), model, n=2, device=torch.device("cpu"))[0]
+                if not y:
+                    break
+                rss.append(process.memory_info().rss)
+                compute = b * 1000 / (y[3] + y[4] if train else y[3])  # images/s
+                for w in range(min(workers, max(cpus - threads, 0)) + 1):
+                    if not load_ms:
+                        ips = compute
+                    elif w == 0:
+                        ips = 1 / (1 / compute + load_ms / 1000)  # loading in the main process
+                    else:
+                        ips = min(compute, w * 1000 / load_ms)
+                    if ips > best["throughput"] * 1.02:  # prefer fewer threads, batches and workers on ties
+                        best = {"batch": b, "threads": threads, "workers": w, "throughput": round(ips, 2)}
+                if compute < last:  # throughput peaked
+                    break
+                last = compute
+        if not load_ms:  # loading cost unknown, use the cores left over by the compute threads
+            best["workers"] = min(workers, max(cpus - best["threads"], 0))
+    except Exception as e:
+        LOGGER.warning(f"{prefix}error detected: {e}, using default settings.")
+        return {"batch": DEFAULT_CFG.batch, "threads": threads0, "workers": workers, "throughput": 0.0}
+    finally:
+        torch.set_num_threads(threads0)
+
+    LOGGER.info(
+        f"{prefix}Using batch-size {best['batch']}, {best['threads']} threads and {best['workers']} workers "
+        f"for {best['throughput']:.1f} images/s on CPU ✅"
+    )
+    if cache:
+        PERSISTENT_CACHE["cpu_autotune"] = {**tuned, key: best}
+    return best
@@ -3,9 +3,12 @@
 Benchmark a YOLO model formats for speed and accuracy.
 
 Usage:
-    from ultralytics.utils.benchmarks import ProfileModels, benchmark
+    from ultralytics.utils.benchmarks import ProfileModels, benchmark, benchmark_nms
     ProfileModels(['yolo11n.yaml', 'yolov8s.yaml']).run()
     benchmark(model='yolo11n.pt', imgsz=160)
+    benchmark_nms(batch=32)
+    benchmark_suite(model='best.pt', data='data.yaml', imgsz=(416, 640), batch=(1, 8))
+    benchmark_imgsz(model='best.pt', data='data.yaml')
 
 Format                  | `format=argument`         | Model
 ---                     | ---                       | ---
@@ -27,11 +30,14 @@ IMX                     | `imx`                     | yolo11n_imx_model/
 RKNN                    | `rknn`                    | yolo11n_rknn_model/
 """
 
+import gc
 import glob
+import json
 import os
 import platform
 import re
 import shutil
+import threading
 import time
 from pathlib import Path
 from typing import List, Optional, Tuple, Union
@@ -39,14 +45,14 @@ from typing import List, Optional, Tuple, Union
 import numpy as np
 import torch.cuda
 
-from ultralytics import YOLO, YOLOWorld
+from ultralytics import YOLO, YOLOWorld, __version__
 from ultralytics.cfg import TASK2DATA, TASK2METRIC
 from ultralytics.engine.exporter import export_formats
 from ultralytics.utils import ARM64, ASSETS, IS_JETSON, LINUX, LOGGER, MACOS, TQDM, WEIGHTS_DIR, YAML
 from ultralytics.utils.checks import IS_PYTHON_3_13, check_imgsz, check_requirements, check_yolo, is_rockchip
 from ultralytics.utils.downloads import safe_download
 from ultralytics.utils.files import file_size
-from ultralytics.utils.torch_utils import get_cpu_info, select_device
+from ultralytics.utils.torch_utils import get_cpu_info, get_flops, select_device
 
 
 def benchmark(
@@ -203,6 +209,324 @@ def benchmark(
     return df
 
 
+def benchmark_nms(batch=32, nc=9, num_boxes=3549, imgsz=416, conf=0.001, multi_label=True, device="cpu", runs=10):
+    """
+    Benchmark per-image versus batched non-maximum suppression on synthetic YOLO predictions.
+
+    Args:
+        batch (int): Number of images per batch.
+        nc (int): Number of classes.
+        num_boxes (int): Number of anchor predictions per image, i.e. 3549 for imgsz=416 or 8400 for imgsz=640.
+        imgsz (int): Image size used to draw random boxes.
+        conf (float): Confidence threshold, 0.001 matches validation.
+        multi_label (bool): Whether each box can have multiple labels, True matches validation.
+        device (str): Device to run the benchmark on.
+        runs (int): Number of timed runs per mode.
+
+    Returns:
+        (dict): Mean NMS time in ms per batch for the 'loop' and 'batched' modes and whether outputs are 'identical'.
+
+    Examples:
+        >>> from ultralytics.utils.benchmarks import benchmark_nms
+        >>> benchmark_nms(batch=64)
+    """
+    from ultralytics.utils.ops import non_max_suppression
+
+    device = select_device(device, verbose=False)
+    g = torch.Generator().manual_seed(0)
+    xy = torch.rand(batch, 2, num_boxes, generator=g) * imgsz
+    wh = torch.rand(batch, 2, num_boxes, generator=g) * imgsz / 4 + 2
+    scores = torch.rand(batch, nc, num_boxes, generator=g) ** 60  # mostly low scores like a trained model
+    prediction = torch.cat((xy, wh, scores), 1).to(device)
+
+    times, outputs = {}, {}
+    for mode in "loop", "batched":
+        kwargs = dict(
+            conf_thres=conf, iou_thres=0.7, multi_label=multi_label, in_place=False, batched=mode == "batched"
+        )
+        outputs[mode] = non_max_suppression(prediction, **kwargs)  # warmup
+        t = time.perf_counter()
+        for _ in range(runs):
+            non_max_suppression(prediction, **kwargs)
+            if device.type == "cuda":
+                torch.cuda.synchronize()
+        times[mode] = (time.perf_counter() - t) / runs * 1000
+    identical = all(torch.equal(a, b) for a, b in zip(outputs["loop"], outputs["batched"]))
+    LOGGER.info(
+        f"NMS benchmark batch={batch} nc={nc} boxes={num_boxes}: loop {times['loop']:.2f}ms, "
+        f"batched {times['batched']:.2f}ms ({times['loop'] / times['batched']:.2f}x), identical={identical}"
+    )
+    return {**times, "identical": identical}
+
+
+def benchmark_imgsz(model="best.pt", data="data.yaml", imgsz=None, batch=16, device="cpu", split="val"):
+    """
+    Sweep the test-time image size of a detection model and report the accuracy and latency of each size.
+
+    Each size is validated on the dataset split and the metrics are taken from the resulting DetMetrics, so the
+    trade-off between e.g. the native 416 of wafer images and an upsampled 640 can be chosen on evidence.
+
+    Args:
+        model (str | Path): Path to the model weights.
+        data (str): Dataset YAML to validate on.
+        imgsz (tuple, optional): Image sizes to sweep, defaults to 320, 512 and 640 plus the native dataset size.
+        batch (int): Validation batch size.
+        device (str): Device to validate on.
+        split (str): Dataset split to validate on.
+
+    Returns:
+        (pandas.DataFrame): One row per image size with GFLOPs, precision, recall, mAP50, mAP50-95, fitness,
+            preprocess/inference/postprocess time in ms per image and whether it is the native size.
+
+    Examples:
+        >>> from ultralytics.utils.benchmarks import benchmark_imgsz
+        >>> benchmark_imgsz("best.pt", "data.yaml", imgsz=(320, 416, 640))
+    """
+    import pandas as pd  # scope for faster 'import ultralytics'
+
+    from ultralytics.data.utils import check_det_dataset, dataset_imgsz
+
+    model = YOLO(model) if isinstance(model, (str, Path)) else model
+    stride = max(int(model.model.stride.max()), 32)
+    native = dataset_imgsz(check_det_dataset(data)[split], stride=stride)
+    imgsz = {check_imgsz(x, stride=stride) for x in (imgsz or (320, 512, 640))}
+    imgsz = sorted(imgsz | ({native} if native else set()))
+
+    rows = []
+    for size in imgsz:
+        r = model.val(data=data, imgsz=size, batch=batch, device=device, split=split, plots=False, verbose=False)
+        rows.append(
+            [
+                size,
+                size == native,
+                round(get_flops(model.model, size), 2),
+                round(float(r.box.mp), 4),
+                round(float(r.box.mr), 4),
+                round(float(r.box.map50), 4),
+                round(float(r.box.map), 4),
+                round(float(r.fitness), 4),
+                *(round(r.speed[k], 2) for k in ("preprocess", "inference", "postprocess")),
+            ]
+        )
+    df = pd.DataFrame(
+        rows,
+        columns=[
+            "imgsz",
+            "native",
+            "GFLOPs",
+            "precision",
+            "recall",
+            "mAP50",
+            "mAP50-95",
+            "fitness",
+            "preprocess (ms/im)",
+            "inference (ms/im)",
+            "postprocess (ms/im)",
+        ],
+    )
+    LOGGER.info(f"\nImage size sweep for {getattr(model, 'model_name', model)} on {data} {split}\n{df}\n")
+    return df
+
+
+class _PeakRSS:
+    """Context manager sampling the resident set size of this process in a thread and keeping the peak in MB."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval, self.peak = interval, 0.0
+        self._stop = threading.Event()
+
+    @staticmethod
+    def rss() -> float:
+        """Return the current resident set size of this process in MB."""
+        import psutil
+
+        return psutil.Process().memory_info().rss / 2**20
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.rss())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.rss())
+
+
+def benchmark_suite(
+    model="best.pt",
+    data="data.yaml",
+    formats=("-", "int8", "torchscript", "onnx", "openvino"),
+    imgsz=(416, 640),
+    batch=(1, 8),
+    threads=None,
+    runs=20,
+    images=64,
+    val=True,
+    save="benchmarks.json",
+):
+    """
+    Benchmark a detection model on the val split of a dataset across CPU backends, image sizes, batch sizes and threads.
+
+    Every format is exported once per image size and batch size and loaded on CPU, 'int8' is the PyTorch model after
+    torch.ao post-training quantization calibrated on the val split at each image size. Each thread count is applied
+    with `torch.set_num_threads`, which AutoBackend also passes to ONNX Runtime and OpenVINO, and `runs` batches of
+    pre-decoded val images are predicted end to end (preprocess, inference and NMS). Per-batch latency percentiles,
+    throughput and the peak RSS of the process are recorded, together with its growth over the RSS measured after
+    releasing the previous model and before loading this one, and with `val=True` the mAP of each format and image size
+    is measured on the full val split and compared with PyTorch at the same image size.
+
+    Args:
+        model (str | Path): Path to the PyTorch weights.
+        data (str): Dataset YAML whose val split is used for timing and accuracy.
+        formats (tuple): Export format arguments to benchmark, '-' for PyTorch and 'int8' for quantized PyTorch.
+        imgsz (tuple): Image sizes to sweep.
+        batch (tuple): Batch sizes to sweep.
+        threads (tuple, optional): Intra-op thread counts to sweep, defaults to 1, half and all cores.
+        runs (int): Number of timed batches per configuration after three warmup batches.
+        images (int): Maximum number of val images decoded for timing.
+        val (bool): Measure mAP50 and mAP50-95 on the val split.
+        save (str | Path, optional): JSON file to write the results to.
+
+    Returns:
+        (dict): 'system' information and 'results', one record per format, imgsz, batch and threads with 'status',
+            'latency_ms' (p50/p95/p99 per batch), 'throughput' (images/s), 'peak_rss_mb', 'rss_delta_mb' (peak
+            over the RSS before loading the model), 'map50', 'map50_95' and 'map50_95_delta' against PyTorch.
+
+    Examples:
+        >>> from ultralytics.utils.benchmarks import benchmark_suite
+        >>> report = benchmark_suite("best.pt", "data.yaml", formats=("-", "onnx"), batch=(1,), threads=(4,))
+    """
+    import cv2
+
+    from ultralytics.data.utils import IMG_FORMATS, check_det_dataset
+
+    cpus = os.cpu_count() or 1
+    threads = threads or sorted({1, max(cpus // 2, 1), cpus})
+    val_dir = check_det_dataset(data)["val"]
+    files = sorted(
+        f for d in (val_dir if isinstance(val_dir, list) else [val_dir]) for f in glob.glob(f"{d}/**/*", recursive=True)
+    )
+    files = [f for f in files if f.rpartition(".")[-1].lower() in IMG_FORMATS][:images]
+    assert files, f"no val images found in {val_dir}"
+    ims = [cv2.imread(f) for f in files]
+    pt = YOLO(model)
+    threads0 = torch.get_num_threads()
+    results, reference, int8 = [], {}, {}
+
+    def record(**kwargs):
+        """Append a result record and log it."""
+        results.append(kwargs)
+        latency = kwargs.get("latency_ms") or {}
+        LOGGER.info(
+            f"{kwargs['format']:>12s} imgsz={kwargs['imgsz']} batch={kwargs['batch']} threads={kwargs['threads']} "
+            f"{kwargs['status']} p50={latency.get('p50', '-')}ms throughput={kwargs.get('throughput', '-')}im/s "
+            f"rss=+{kwargs.get('rss_delta_mb', '-')}MB mAP50-95={kwargs.get('map50_95', '-')}"
+        )
+
+    try:
+        for format in formats:
+            for size in imgsz:
+                metrics = None
+                for b in batch:
+                    config = dict(format=format, imgsz=size, batch=b)
+                    exported = None  # release the previous model so RSS deltas are comparable
+                    gc.collect()
+                    rss0 = _PeakRSS.rss()
+                    try:
+                        if format == "-":
+                            exported, filename = YOLO(model), model
+                        elif format == "int8":
+                            from ultralytics.utils.quantize import quantize  # loads torch.ao only when needed
+
+                            if size not in int8:
+                                f = Path(model).with_name(f"{Path(model).stem}-int8-{size}.pt")
+                                int8[size] = quantize(model, data=data, imgsz=size, save=f)["file"]
+                            exported, filename = YOLO(int8[size]), int8[size]
+                        else:
+                            filename = pt.export(format=format, imgsz=size, batch=b, device="cpu", verbose=False)
+                            exported = YOLO(filename, task=pt.task)
+                    except Exception as e:
+                        LOGGER.error(f"Benchmark export failure for {format} imgsz={size} batch={b}: {e}")
+                        for t in threads:
+                            record(**config, threads=t, status="export failed", error=str(e))
+                        continue
+                    for t in threads:
+                        torch.set_num_threads(t)
+                        try:
+                            # fresh backend so ONNX Runtime and OpenVINO pick up the thread count
+                            exported.predictor = None
+                            kwargs = dict(imgsz=size, batch=b, device="cpu", verbose=False)
+                            for _ in range(3):  # warmup, TorchScript profiles and optimizes the first calls
+                                exported.predict(ims[:b], **kwargs)
+                            gc.collect()
+                            latency, n = [], 0
+                            with _PeakRSS() as rss:
+                                t0 = time.perf_counter()
+                                for i in range(runs):
+                                    chunk = [ims[(i * b + j) % len(ims)] for j in range(b)]
+                                    t1 = time.perf_counter()
+                                    exported.predict(chunk, **kwargs)
+                                    latency.append((time.perf_counter() - t1) * 1000)
+                                    n += b
+                                dt = time.perf_counter() - t0
+                            if val and metrics is None:
+                                r = exported.val(
+                                    data=data, imgsz=size, batch=b, device="cpu", plots=False, verbose=False
+                                )
+                                metrics = {k: round(float(getattr(r.box, k)), 5) for k in ("map50", "map")}
+                                if format == "-":
+                                    reference[size] = metrics["map"]
+                            p50, p95, p99 = np.percentile(latency, [50, 95, 99]).round(2).tolist()
+                            record(
+                                **config,
+                                threads=t,
+                                status="ok",
+                                size_mb=round(file_size(filename), 1),
+                                latency_ms={"p50": p50, "p95": p95, "p99": p99},
+                                throughput=round(n / dt, 2),
+                                peak_rss_mb=round(rss.peak, 1),
+                                rss_delta_mb=round(rss.peak - rss0, 1),
+                                map50=metrics and metrics["map50"],
+                                map50_95=metrics and metrics["map"],
+                                map50_95_delta=(
+                                    round(metrics["map"] - reference[size], 5)
+                                    if metrics and size in reference
+                                    else None
+                                ),
+                            )
+                        except Exception as e:
+                            LOGGER.error(f"Benchmark failure for {format} imgsz={size} batch={b} threads={t}: {e}")
+                            record(**config, threads=t, status="failed", error=str(e))
+    finally:
+        torch.set_num_threads(threads0)
+
+    report = {
+        "system": {
+            "ultralytics": __version__,
+            "torch": torch.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu": get_cpu_info(),
+            "cores": cpus,
+        },
+        "model": str(model),
+        "data": str(data),
+        "images": len(ims),
+        "runs": runs,
+        "results": results,
+    }
+    if save:
+        Path(save).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        LOGGER.info(f"Benchmark suite results saved to {save}")
+    return report
+
+
 class RF100Benchmark:
     """
     Benchmark YOLO model performance across various formats for speed and accuracy.
@@ -135,6 +135,11 @@ def check_imgsz(imgsz, stride=32, min_dim=1, max_dim=2, floor=0):
         imgsz = [imgsz]
     elif isinstance(imgsz, (list, tuple)):
         imgsz = list(imgsz)
+    elif imgsz == "auto":
+        raise ValueError(
+            "'imgsz=auto' (native dataset resolution) is only resolved by train and val. "
+            "Pass the image size the model was trained at, i.e. 'imgsz=640'"
+        )
     elif isinstance(imgsz, str):  # i.e. '640' or '[640,640]'
         imgsz = [int(imgsz)] if imgsz.isnumeric() else eval(imgsz)
     else:
@@ -652,6 +652,32 @@ class v8ClassificationLoss:
         return loss, loss.detach()
 
 
+class FullFrameLoss:
+    """Criterion class for whole-image detection, cross-entropy on the class of each image's largest box."""
+
+    def __init__(self, model):  # model must be de-paralleled
+        """Initialize FullFrameLoss with the model's class-loss gain."""
+        self.hyp = model.args
+
+    def __call__(self, preds: Any, batch: Dict[str, torch.Tensor]) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Calculate (box, cls, dfl) losses multiplied by batch size; box and dfl are zero for full-frame boxes."""
+        preds = preds[1] if isinstance(preds, (list, tuple)) else preds
+        bs = preds.shape[0]
+        loss = torch.zeros(3, device=preds.device)  # box, cls, dfl
+        bi = batch["batch_idx"].to(preds.device).long()
+        target = torch.full((bs,), -100, dtype=torch.long, device=preds.device)  # background images are ignored
+        if bi.numel():
+            area = batch["bboxes"][:, 2:].prod(1).to(preds.device)
+            largest = area.new_zeros(bs).scatter_reduce(0, bi, area, "amax", include_self=False)
+            j = area == largest[bi]
+            target[bi[j]] = batch["cls"].view(-1)[j.to(batch["cls"].device)].to(preds.device).long()
+        if (target >= 0).any():
+            loss[1] = F.cross_entropy(preds.float(), target, ignore_index=-100) * self.hyp.cls
+        else:
+            loss[1] = preds.sum() * 0.0
+        return loss.sum() * bs, loss.detach()
+
+
 class v8OBBLoss(v8DetectionLoss):
     """Calculates losses for object detection, classification, and box distribution in rotated YOLO models."""
 
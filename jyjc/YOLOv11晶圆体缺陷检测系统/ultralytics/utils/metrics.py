@@ -604,32 +604,40 @@ def plot_mc_curve(
         on_plot(save_dir)
 
 
-def compute_ap(recall: List[float], precision: List[float]) -> Tuple[float, np.ndarray, np.ndarray]:
+def compute_ap(recall: np.ndarray, precision: np.ndarray) -> Tuple[Union[float, np.ndarray], np.ndarray, np.ndarray]:
     """
     Compute the average precision (AP) given the recall and precision curves.
 
+    Curves may be batched along leading dimensions, e.g. one row per IoU threshold, in which case every row is
+    integrated independently and the results are identical to computing each row on its own.
+
     Args:
-        recall (list): The recall curve.
-        precision (list): The precision curve.
+        recall (np.ndarray): The recall curve of shape (N,) or (..., N).
+        precision (np.ndarray): The precision curve of the same shape as recall.
 
     Returns:
-        ap (float): Average precision.
+        ap (float | np.ndarray): Average precision, with the leading shape of the inputs.
         mpre (np.ndarray): Precision envelope curve.
         mrec (np.ndarray): Modified recall curve with sentinel values added at the beginning and end.
     """
+    recall, precision = np.asarray(recall), np.asarray(precision)
+    shape = recall.shape[:-1]
+
     # Append sentinel values to beginning and end
-    mrec = np.concatenate(([0.0], recall, [1.0]))
-    mpre = np.concatenate(([1.0], precision, [0.0]))
+    mrec = np.concatenate((np.zeros((*shape, 1)), recall, np.ones((*shape, 1))), -1)
+    mpre = np.concatenate((np.ones((*shape, 1)), precision, np.zeros((*shape, 1))), -1)
 
     # Compute the precision envelope
-    mpre = np.flip(np.maximum.accumulate(np.flip(mpre)))
+    mpre = np.flip(np.maximum.accumulate(np.flip(mpre, -1), -1), -1)
 
     # Integrate area under curve
     method = "interp"  # methods: 'continuous', 'interp'
     if method == "interp":
         x = np.linspace(0, 1, 101)  # 101-point interp (COCO)
         func = np.trapezoid if checks.check_version(np.__version__, ">=2.0") else np.trapz  # np.trapz deprecated
-        ap = func(np.interp(x, mrec, mpre), x)  # integrate
+        rows = zip(mrec.reshape(-1, mrec.shape[-1]), mpre.reshape(-1, mpre.shape[-1]))
+        y = np.stack([np.interp(x, r, p) for r, p in rows])
+        ap = func(y.reshape(*shape, len(x)), x)  # integrate
     else:  # 'continuous'
         i = np.where(mrec[1:] != mrec[:-1])[0]  # points where x-axis (recall) changes
         ap = np.sum((mrec[i + 1] - mrec[i]) * mpre[i + 1])  # area under curve
@@ -680,41 +688,45 @@ def ap_per_class(
     """
     # Sort by objectness
     i = np.argsort(-conf)
-    tp, conf, pred_cls = tp[i], conf[i], pred_cls[i]
 
     # Find unique classes
     unique_classes, nt = np.unique(target_cls, return_counts=True)
     nc = unique_classes.shape[0]  # number of classes, number of detections
 
+    # Group predictions by class, keeping the confidence order within each class and dropping unlabelled classes
+    pred_cls = pred_cls[i]
+    ci = np.searchsorted(unique_classes, pred_cls).clip(max=max(nc - 1, 0))
+    ci = np.where(unique_classes[ci] == pred_cls, ci, nc) if nc else np.zeros_like(ci)
+    ci = ci.astype(np.min_scalar_type(nc))  # small integer keys make the stable sort a radix sort
+    j = np.argsort(ci, kind="stable")[: (ci < nc).sum()]
+    n_p = np.bincount(ci[j], minlength=nc)  # number of predictions per class
+    start = np.cumsum(n_p) - n_p
+    i = i[j]
+    tp, conf = np.take(np.ascontiguousarray(tp.T), i, 1), conf[i]  # (niou, n)
+
+    # Accumulate TPs for all classes and IoU thresholds at once, restarting at every class
+    tpc = tp.cumsum(1, dtype=np.int32)
+    if len(i):
+        tpc -= np.repeat(np.where(start > 0, tpc[:, start - 1], 0), n_p, 1)
+    n = np.arange(1, len(i) + 1) - np.repeat(start, n_p)  # TPs + FPs
+
+    # Recall and precision curves
+    recall = tpc / (np.repeat(nt, n_p) + eps)
+    precision = tpc / n
+
     # Create Precision-Recall curve and compute AP for each class
     x, prec_values = np.linspace(0, 1, 1000), []
 
     # Average precision, precision and recall curves
-    ap, p_curve, r_curve = np.zeros((nc, tp.shape[1])), np.zeros((nc, 1000)), np.zeros((nc, 1000))
-    for ci, c in enumerate(unique_classes):
-        i = pred_cls == c
-        n_l = nt[ci]  # number of labels
-        n_p = i.sum()  # number of predictions
-        if n_p == 0 or n_l == 0:
-            continue
-
-        # Accumulate FPs and TPs
-        fpc = (1 - tp[i]).cumsum(0)
-        tpc = tp[i].cumsum(0)
-
-        # Recall
-        recall = tpc / (n_l + eps)  # recall curve
-        r_curve[ci] = np.interp(-x, -conf[i], recall[:, 0], left=0)  # negative x, xp because xp decreases
-
-        # Precision
-        precision = tpc / (tpc + fpc)  # precision curve
-        p_curve[ci] = np.interp(-x, -conf[i], precision[:, 0], left=1)  # p at pr_score
-
-        # AP from recall-precision curve
-        for j in range(tp.shape[1]):
-            ap[ci, j], mpre, mrec = compute_ap(recall[:, j], precision[:, j])
-            if j == 0:
-                prec_values.append(np.interp(x, mrec, mpre))  # precision at mAP@0.5
+    ap, p_curve, r_curve = np.zeros((nc, tp.shape[0])), np.zeros((nc, 1000)), np.zeros((nc, 1000))
+    for ci in np.nonzero(n_p)[0]:
+        j = slice(start[ci], start[ci] + n_p[ci])
+        r_curve[ci] = np.interp(-x, -conf[j], recall[0, j], left=0)  # negative x, xp because xp decreases
+        p_curve[ci] = np.interp(-x, -conf[j], precision[0, j], left=1)  # p at pr_score
+
+        # AP from recall-precision curve, all IoU thresholds at once
+        ap[ci], mpre, mrec = compute_ap(recall[:, j], precision[:, j])
+        prec_values.append(np.interp(x, mrec[0], mpre[0]))  # precision at mAP@0.5
 
     prec_values = np.array(prec_values) if prec_values else np.zeros((1, 1000))  # (nc, 1000)
 
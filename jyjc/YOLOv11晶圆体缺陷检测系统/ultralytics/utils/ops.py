@@ -206,6 +206,7 @@ def non_max_suppression(
     rotated: bool = False,
     end2end: bool = False,
     return_idxs: bool = False,
+    batched: bool = False,
 ):
     """
     Perform non-maximum suppression (NMS) on prediction results.
@@ -231,6 +232,8 @@ def non_max_suppression(
         rotated (bool): Whether to handle Oriented Bounding Boxes (OBB).
         end2end (bool): Whether the model is end-to-end and doesn't require NMS.
         return_idxs (bool): Whether to return the indices of kept detections.
+        batched (bool): Whether to run a single NMS over the whole batch instead of one per image. Gives the same
+            detections as the per-image loop, not used for rotated boxes or a priori labels.
 
     Returns:
         output (List[torch.Tensor]): List of detections per image with shape (num_boxes, 6 + num_masks)
@@ -272,6 +275,12 @@ def non_max_suppression(
         else:
             prediction = torch.cat((xywh2xyxy(prediction[..., :4]), prediction[..., 4:]), dim=-1)  # xywh to xyxy
 
+    if batched and not rotated and not labels:
+        output, keepi = _batched_nms(
+            prediction, xc, conf_thres, iou_thres, classes, agnostic, multi_label, max_det, nc, nm, max_nms, max_wh
+        )
+        return (output, keepi) if return_idxs else output
+
     t = time.time()
     output = [torch.zeros((0, 6 + nm), device=prediction.device)] * bs
     keepi = [torch.zeros((0, 1), device=prediction.device)] * bs  # to store the kept idxs
@@ -338,6 +347,91 @@ def non_max_suppression(
     return (output, keepi) if return_idxs else output
 
 
+def _batched_nms(
+    prediction, xc, conf_thres, iou_thres, classes, agnostic, multi_label, max_det, nc, nm, max_nms, max_wh
+):
+    """
+    Run NMS once over all images of a batch, the vectorized counterpart of the loop in non_max_suppression().
+
+    Candidates of all images are filtered, sorted and limited in one pass over the flattened batch. On CUDA boxes are
+    offset by image index and class so one torchvision NMS call handles the whole batch, on CPU (where NMS is quadratic
+    in the box count) NMS runs per contiguous image segment. Results are split back per image by counting kept boxes.
+
+    Args:
+        prediction (torch.Tensor): Predictions of shape (batch_size, num_boxes, 4 + nc + nm) with xyxy boxes.
+        xc (torch.Tensor): Boolean candidate mask of shape (batch_size, num_boxes).
+        conf_thres (float): Confidence threshold.
+        iou_thres (float): IoU threshold.
+        classes (torch.Tensor, optional): Class indices to keep.
+        agnostic (bool): Whether to perform class-agnostic NMS.
+        multi_label (bool): Whether each box can have multiple labels.
+        max_det (int): Maximum number of detections to keep per image.
+        nc (int): Number of classes.
+        nm (int): Number of mask coefficients.
+        max_nms (int): Maximum number of boxes per image entering NMS.
+        max_wh (int): Maximum box width and height in pixels, used as class offset.
+
+    Returns:
+        output (List[torch.Tensor]): Detections per image with shape (num_boxes, 6 + num_masks).
+        keepi (List[torch.Tensor]): Indices of kept detections per image.
+    """
+    import torchvision  # scope for faster 'import ultralytics'
+
+    bs = prediction.shape[0]
+    bi, ki = xc.nonzero(as_tuple=True)  # image and anchor index of every candidate
+    box, cls, mask = prediction[bi, ki].split((4, nc, nm), 1)
+    if multi_label:
+        i, j = torch.where(cls > conf_thres)
+        x = torch.cat((box[i], cls[i, j, None], j[:, None].float(), mask[i]), 1)
+        bi, ki = bi[i], ki[i]
+    else:  # best class only
+        conf, j = cls.max(1, keepdim=True)
+        filt = conf.view(-1) > conf_thres
+        x = torch.cat((box, conf, j.float(), mask), 1)[filt]
+        bi, ki = bi[filt], ki[filt]
+
+    # Filter by class
+    if classes is not None:
+        filt = (x[:, 5:6] == classes).any(1)
+        x, bi, ki = x[filt], bi[filt], ki[filt]
+
+    # Sort by image then confidence, which also enforces max_nms per image
+    i = x[:, 4].argsort(descending=True, stable=True)
+    i = i[bi[i].argsort(stable=True)]
+    x, bi, ki = x[i], bi[i], ki[i]
+    counts = torch.bincount(bi, minlength=bs)
+    rank = torch.arange(len(bi), device=bi.device) - (counts.cumsum(0) - counts)[bi]  # position within its image
+    if len(bi) and rank.max() >= max_nms:  # excess boxes
+        filt = rank < max_nms
+        x, bi, ki = x[filt], bi[filt], ki[filt]
+
+    # Batched NMS
+    c = x[:, 5:6] * (0 if agnostic else max_wh)  # classes
+    boxes, scores = x[:, :4] + c, x[:, 4]  # boxes (offset by class), scores
+    counts = torch.bincount(bi, minlength=bs).tolist()
+    if boxes.device.type == "cpu":  # CPU NMS cost is quadratic in the box count, keep one call per image segment
+        starts = np.cumsum([0] + counts[:-1]).tolist()
+        i = torch.cat(
+            [
+                torchvision.ops.nms(b, s, iou_thres) + k
+                for b, s, k in zip(boxes.split(counts), scores.split(counts), starts)
+            ]
+        )
+    else:  # one call, images separated by a float64 offset larger than any box coordinate
+        boxes = boxes.double()
+        span = boxes.abs().max() * 2 + 1 if len(boxes) else 0
+        i = torchvision.ops.nms(boxes + bi[:, None] * span, scores.double(), iou_thres)
+        i = i.sort().values  # back to image-major, confidence-descending order
+
+    # Limit detections per image and split by image
+    bi = bi[i]
+    counts = torch.bincount(bi, minlength=bs)
+    rank = torch.arange(len(bi), device=bi.device) - (counts.cumsum(0) - counts)[bi]
+    i = i[rank < max_det]
+    counts = counts.clamp(max=max_det).tolist()
+    return list(x[i].split(counts)), list(ki[i].split(counts))
+
+
 def clip_boxes(boxes, shape):
     """
     Clip bounding boxes to image boundaries.
@@ -0,0 +1,406 @@
+# Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
+"""
+Structured channel pruning of YOLO detection models driven by BatchNorm gamma magnitudes (network slimming).
+
+Channels are grouped by everything that produces or reads them, so a group is removed consistently from every layer:
+
+- Block outputs (Conv, C3k2/C2f, C3/C3k/C3CA, SPPF, C2PSA) together with all their readers, following the channels
+  through Upsample, myCBAM and Concat (each reader sliced at its concat offset) into the next blocks and the depthwise
+  and 3x3 input convs of the Detect branches.
+- Hidden channels inside blocks: Bottleneck/CABottleneck, the C3/C3CA/C3k branches, the C2f/C3k2 split halves, SPPF,
+  the C2PSA feed-forward layers, the per-head query/key dimensions of C2PSA attention and the CoordAtt `mip` channels.
+
+Channels tied by a residual add (C3CA or C3k2 with shortcut) are pruned as one group, and the two halves of a C2f/C3k2
+split as channel pairs, so `chunk(2)` stays valid. The attention value channels and the C2PSA residual stream they are
+reshaped into keep their width, as do layers this module does not know, which block every group reaching them.
+
+Usage:
+    from ultralytics.utils.prune import prune
+    report = prune("best.pt", amount=0.3, imgsz=416)  # writes best-pruned.pt
+    YOLO("best-pruned.pt").train(data="data.yaml", epochs=10)  # short fine-tune of the pruned model
+"""
+
+import math
+import time
+from copy import deepcopy
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from ultralytics.nn.modules.block import (
+    C2PSA,
+    C3,
+    C3CA,
+    SPPF,
+    Attention,
+    Bottleneck,
+    C2f,
+    C3k,
+    C3k2,
+    CABottleneck,
+    CoordAtt,
+    PSABlock,
+    myCBAM,
+)
+from ultralytics.nn.modules.conv import Concat, Conv
+from ultralytics.nn.modules.head import Detect
+from ultralytics.utils import LOGGER, colorstr
+from ultralytics.utils.torch_utils import get_flops, get_num_params
+
+__all__ = "ChannelGroup", "channel_groups", "prune_model", "prune"
+
+
+class ChannelGroup:
+    """
+    A set of channels produced and consumed together, kept or removed as one unit.
+
+    Attributes:
+        name (str): Name of the block owning the channels.
+        size (int): Number of channels.
+        producers (List[tuple]): (nn.Conv2d, nn.BatchNorm2d | None, offset) triples whose output channels offset + i
+            are channel i of the group.
+        consumers (List[tuple]): (nn.Conv2d, offset) pairs whose input channels offset + i are channel i of the group.
+        depthwise (List[tuple]): (nn.Conv2d, nn.BatchNorm2d, offset) depthwise convolutions passing the channels
+            through.
+        blocked (bool): Whether the channels reach a layer that cannot be sliced, so the group must be kept.
+    """
+
+    def __init__(self, name: str, size: int):
+        """Initialize an empty group of `size` channels."""
+        self.name = name
+        self.size = size
+        self.producers = []
+        self.consumers = []
+        self.depthwise = []
+        self.blocked = False
+
+    def produce(self, conv: nn.Conv2d, bn: Optional[nn.BatchNorm2d] = None, offset: int = 0) -> "ChannelGroup":
+        """Add a convolution, and its BatchNorm, whose output channels from `offset` on are the group."""
+        self.producers.append((conv, bn, offset))
+        return self
+
+    def consume(self, conv: nn.Conv2d, *offsets: int) -> "ChannelGroup":
+        """Add a convolution reading the group at input channel offsets, several offsets for repeated concatenation."""
+        self.consumers.extend((conv, o) for o in offsets or (0,))
+        return self
+
+    def valid(self) -> bool:
+        """Return True if the group is unblocked, all convolutions can be sliced and a BatchNorm scores it."""
+        convs = [c for c, *_ in self.producers] + [c for c, _ in self.consumers]
+        return (
+            not self.blocked
+            and all(c.groups == 1 for c in convs)
+            and all(c.groups == c.in_channels == c.out_channels for c, *_ in self.depthwise)
+            and any(bn is not None for _, bn, _ in self.producers)
+        )
+
+    def scores(self) -> torch.Tensor:
+        """Return the importance of each channel, the mean |gamma| over the BatchNorms of its producers."""
+        gammas = [bn.weight.detach()[o : o + self.size] for _, bn, o in self.producers if bn is not None]
+        return torch.stack(gammas).abs().float().mean(0)
+
+
+def _reads(m: nn.Module) -> Optional[List[nn.Conv2d]]:
+    """Return the convolutions reading the input channels of a block, None if the block is not supported."""
+    if type(m) is Conv:
+        return [m.conv]
+    if type(m) in {C2f, C3k2, SPPF, C2PSA}:
+        return [m.cv1.conv]
+    if type(m) in {C3, C3k, C3CA}:
+        return [m.cv1.conv, m.cv2.conv]
+    if type(m) in {Bottleneck, CABottleneck}:
+        return [m.cv1.conv]
+    return None
+
+
+def _output(m: nn.Module) -> Conv:
+    """Return the Conv producing the output channels of a block supported by `_reads`."""
+    return m.cv3 if type(m) in {C3, C3k, C3CA} else m if type(m) is Conv else m.cv2
+
+
+def _writes(group: ChannelGroup, m: nn.Module) -> ChannelGroup:
+    """Add the layers producing, and re-weighting, the output channels of a block supported by `_reads` to a group."""
+    cv = _output(m)
+    group.produce(cv.conv, cv.bn)
+    if isinstance(m, CABottleneck):  # coordinate attention reads and re-weights the output channels
+        group.produce(m.ca.conv_h).produce(m.ca.conv_w).consume(m.ca.conv1)
+    return group
+
+
+def _inner_groups(name: str, m: nn.Module) -> List[ChannelGroup]:
+    """Return the channel groups closed inside one block."""
+    groups = []
+    if type(m) in {Bottleneck, CABottleneck}:  # cv1 -> cv2 hidden channels
+        groups.append(ChannelGroup(f"{name}.cv1", m.cv1.conv.out_channels).produce(m.cv1.conv, m.cv1.bn))
+        groups[-1].consume(m.cv2.conv)
+    elif isinstance(m, CoordAtt) and hasattr(m, "bn1"):  # conv1 -> conv_h/conv_w mip channels
+        groups.append(ChannelGroup(f"{name}.conv1", m.conv1.out_channels).produce(m.conv1, m.bn1))
+        groups[-1].consume(m.conv_h).consume(m.conv_w)
+    elif type(m) in {C3, C3k, C3CA} and all(type(b) in {Bottleneck, CABottleneck} for b in m.m):
+        c_ = m.cv1.conv.out_channels
+        groups.append(ChannelGroup(f"{name}.cv2", c_).produce(m.cv2.conv, m.cv2.bn).consume(m.cv3.conv, c_))
+        if all(b.add for b in m.m):  # residual adds tie cv1 and every bottleneck output to the same channels
+            g = ChannelGroup(f"{name}.m", c_).produce(m.cv1.conv, m.cv1.bn).consume(m.cv3.conv, 0)
+            for b in m.m:
+                _writes(g, b).consume(b.cv1.conv)
+            groups.append(g)
+        else:  # a chain cv1 -> m[0] -> ... -> m[-1] -> cv3
+            g = ChannelGroup(f"{name}.cv1", c_).produce(m.cv1.conv, m.cv1.bn)
+            for i, b in enumerate(m.m):
+                groups.append(g.consume(b.cv1.conv))
+                g = _writes(ChannelGroup(f"{name}.m.{i}", c_), b)
+            groups.append(g.consume(m.cv3.conv, 0))
+    elif type(m) in {C2f, C3k2} and all(_reads(b) for b in m.m):
+        # channel i of both split halves forms a pair so chunk(2) stays even, the second half feeds the chain
+        c = m.c
+        g = ChannelGroup(f"{name}.cv1", c).produce(m.cv1.conv, m.cv1.bn, 0).produce(m.cv1.conv, m.cv1.bn, c)
+        g.consume(m.cv2.conv, 0, c)
+        for i, b in enumerate(m.m):
+            for conv in _reads(b):
+                g.consume(conv)
+            if not (type(b) is Bottleneck and b.add):  # a residual Bottleneck keeps the channels of its input
+                groups.append(g)
+                g = ChannelGroup(f"{name}.m.{i}", c)
+            _writes(g, b).consume(m.cv2.conv, (i + 2) * c)
+        groups.append(g)
+    elif isinstance(m, SPPF):  # cv1 output is max-pooled and concatenated 4 times into cv2
+        c_ = m.cv1.conv.out_channels
+        groups.append(ChannelGroup(f"{name}.cv1", c_).produce(m.cv1.conv, m.cv1.bn))
+        groups[-1].consume(m.cv2.conv, 0, c_, 2 * c_, 3 * c_)
+    elif isinstance(m, PSABlock):  # feed-forward hidden channels
+        groups.append(ChannelGroup(f"{name}.ffn", m.ffn[0].conv.out_channels).produce(m.ffn[0].conv, m.ffn[0].bn))
+        groups[-1].consume(m.ffn[1].conv)
+    elif isinstance(m, Attention) and hasattr(m.qkv, "bn"):  # query/key dimension j of every head, dotted together
+        g = ChannelGroup(f"{name}.qk", m.key_dim)
+        for h in range(m.num_heads):
+            base = h * (2 * m.key_dim + m.head_dim)
+            g.produce(m.qkv.conv, m.qkv.bn, base).produce(m.qkv.conv, m.qkv.bn, base + m.key_dim)
+        groups.append(g)
+    return groups
+
+
+def _detect_reads(group: ChannelGroup, m: Detect, i: int, offset: int):
+    """Add the first convolutions of the Detect branches of level `i` reading a group at `offset`."""
+    group.consume(m.cv2[i][0].conv, offset)
+    first = m.cv3[i][0]
+    if isinstance(first, nn.Sequential):  # depthwise conv passing the channels through, then a 1x1 conv
+        group.depthwise.append((first[0].conv, first[0].bn, offset))
+        group.consume(first[1].conv, offset)
+    else:
+        group.consume(first.conv, offset)
+
+
+def channel_groups(model: nn.Module) -> List[ChannelGroup]:
+    """
+    Find the prunable channel groups of a model.
+
+    Args:
+        model (nn.Module): Unfused YOLO model.
+
+    Returns:
+        (List[ChannelGroup]): Groups inside blocks and groups of block outputs spanning all the layers reading them.
+    """
+    groups = []
+    for name, m in model.named_modules():
+        groups.extend(_inner_groups(name, m))
+
+    # follow each block output through pass-through layers and Concat, as (group, offset) segments of every layer
+    layouts = []  # None for outputs of unknown width and channel origin
+    for m in model.model:
+        inputs = [layouts[j] if layouts else [] for j in ([m.f] if isinstance(m.f, int) else m.f)]
+        known = None not in inputs
+        blocks = list(m) if isinstance(m, nn.Sequential) else [m]  # myCBAM repeats are built as a Sequential
+        if _reads(m):
+            for g, o in inputs[0] or ():
+                for conv in _reads(m):
+                    g.consume(conv, o)
+            g = _writes(ChannelGroup(f"model.{m.i}", _output(m).conv.out_channels), m)
+            groups.append(g)
+            layout = [(g, 0)]
+        elif known and isinstance(m, Concat) and m.d == 1:
+            layout, start = [], 0
+            for segments in inputs:
+                layout.extend((g, start + o) for g, o in segments)
+                start += sum(g.size for g, _ in segments)
+        elif known and isinstance(m, nn.Upsample):
+            layout = inputs[0]
+        elif known and all(isinstance(b, myCBAM) for b in blocks):
+            layout = inputs[0]
+            for b in blocks:  # the channel attention MLP reads and re-weights every channel
+                for g, o in layout:
+                    g.consume(b.ca.fc[0], o).produce(b.ca.fc[2], None, o)
+        elif known and isinstance(m, Detect):
+            for i, segments in enumerate(inputs):
+                for g, o in segments:
+                    _detect_reads(g, m, i, o)
+            layout = None
+        else:  # unknown layer, keep the channels it reads
+            for segments in inputs:
+                for g, _ in segments or ():
+                    g.blocked = True
+            layout = None
+        layouts.append(layout)
+    return [g for g in groups if g.valid()]
+
+
+@torch.no_grad()
+def prune_model(model: nn.Module, amount: float = 0.3, round_to: int = 8) -> Dict[str, Any]:
+    """
+    Remove the channels with the smallest BatchNorm gammas from a model in place.
+
+    The `amount` fraction of channels with the lowest scores over all groups is selected. Each group keeps its other
+    channels, rounded up to a multiple of `round_to` for SIMD-friendly widths, and at least `round_to` channels.
+
+    Args:
+        model (nn.Module): Unfused YOLO model, modified in place.
+        amount (float): Fraction of the prunable channels to remove.
+        round_to (int): Kept channel counts are rounded up to a multiple of this value.
+
+    Returns:
+        (Dict[str, Any]): Number of prunable 'groups', prunable 'channels' and 'removed' channels.
+    """
+    if any(
+        isinstance(m, (Conv, CoordAtt)) and not hasattr(m, "bn" if isinstance(m, Conv) else "bn1")
+        for m in model.modules()
+    ):
+        raise ValueError("prune_model() needs an unfused model, BatchNorm gammas are folded into the convolutions")
+    groups = channel_groups(model)
+    if not groups:
+        return {"groups": 0, "channels": 0, "removed": 0}
+    scores = [g.scores() for g in groups]
+    ranked = torch.cat(scores).argsort(stable=True)
+    below = torch.zeros(len(ranked), dtype=torch.bool)
+    below[ranked[: int(amount * len(ranked))]] = True  # globally lowest channels, exact count even for tied gammas
+    cbam = {id(m): (m, m.ca.fc[0].in_channels) for m in model.modules() if isinstance(m, myCBAM)}
+
+    rows, cols, bns = {}, {}, {}  # id(module) -> (module, set of removed output rows / input columns)
+    removed = 0
+    for g, s, drop in zip(groups, scores, below.split([g.size for g in groups])):
+        keep = math.ceil((g.size - int(drop.sum())) / round_to) * round_to
+        keep = min(max(keep, round_to), g.size)
+        if keep == g.size:
+            continue
+        idx = s.argsort()[: g.size - keep].tolist()  # lowest scores
+        removed += len(idx)
+        for conv, bn, offset in [*g.producers, *g.depthwise]:
+            rows.setdefault(id(conv), (conv, set()))[1].update(offset + i for i in idx)
+            if bn is not None:
+                bns.setdefault(id(bn), (bn, set()))[1].update(offset + i for i in idx)
+        for conv, offset in g.consumers:
+            cols.setdefault(id(conv), (conv, set()))[1].update(offset + i for i in idx)
+
+    def keep(n, drop):
+        return torch.tensor(sorted(set(range(n)) - drop), dtype=torch.long)
+
+    for conv in {id(c): c for c, _ in [*rows.values(), *cols.values()]}.values():
+        w = conv.weight.data
+        r = keep(w.shape[0], rows.get(id(conv), (None, set()))[1])
+        c = keep(w.shape[1], cols.get(id(conv), (None, set()))[1])
+        conv.weight = nn.Parameter(w[r][:, c].clone(), requires_grad=conv.weight.requires_grad)
+        if conv.bias is not None:
+            conv.bias = nn.Parameter(conv.bias.data[r].clone(), requires_grad=conv.bias.requires_grad)
+        conv.out_channels, conv.in_channels = len(r), len(c) * conv.groups
+        if conv.groups > 1:  # depthwise
+            conv.groups = conv.in_channels = len(r)
+    for bn, drop in bns.values():
+        r = keep(bn.num_features, drop)
+        bn.weight = nn.Parameter(bn.weight.data[r].clone(), requires_grad=bn.weight.requires_grad)
+        bn.bias = nn.Parameter(bn.bias.data[r].clone(), requires_grad=bn.bias.requires_grad)
+        bn.running_mean, bn.running_var = bn.running_mean[r].clone(), bn.running_var[r].clone()
+        bn.num_features = len(r)
+    for m in model.modules():
+        if isinstance(m, CoordAtt):
+            m.channels = m.conv_h.out_channels
+        elif isinstance(m, C2f):
+            m.c = m.cv1.conv.out_channels // 2
+        elif isinstance(m, Attention):
+            m.key_dim = (m.qkv.conv.out_channels // m.num_heads - m.head_dim) // 2
+    for m, c in cbam.values():  # spatial attention takes the channel mean, keep it the sum over the old count
+        m.sa.conv1.weight.data[:, 0] *= m.ca.fc[0].in_channels / c
+    return {"groups": len(groups), "channels": sum(g.size for g in groups), "removed": removed}
+
+
+def _profile(model: nn.Module, imgsz: int, runs: int = 10) -> Dict[str, float]:
+    """Return parameters, GFLOPs and median fused CPU latency at batch size 1 of a model."""
+    m = deepcopy(model).float().cpu().fuse().eval()
+    x = torch.zeros(1, 3, imgsz, imgsz)
+    with torch.inference_mode():
+        for _ in range(3):
+            m(x)
+        t = []
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            m(x)
+            t.append((time.perf_counter() - t0) * 1000)
+    return {
+        "params": get_num_params(model),
+        "GFLOPs": round(get_flops(model, imgsz), 3),
+        "latency_ms": round(float(np.median(t)), 2),
+    }
+
+
+def prune(
+    model: Union[str, Path] = "best.pt",
+    amount: float = 0.3,
+    imgsz: int = 640,
+    round_to: int = 8,
+    save: Optional[Union[str, Path]] = None,
+) -> Dict[str, Any]:
+    """
+    Prune a trained detection checkpoint and save the smaller model with a before/after report.
+
+    The pruned model is saved as a full module, so it loads with `YOLO(save)` and fine-tunes with
+    `YOLO(save).train(...)`, which trains the pruned architecture instead of rebuilding it from the model YAML.
+
+    Args:
+        model (str | Path): Path to the trained *.pt checkpoint.
+        amount (float): Fraction of the prunable channels to remove.
+        imgsz (int): Image size for FLOPs and CPU latency.
+        round_to (int): Kept channel counts are rounded up to a multiple of this value.
+        save (str | Path, optional): Output checkpoint, defaults to '<model>-pruned.pt' next to the input.
+
+    Returns:
+        (Dict[str, Any]): 'before' and 'after' params, GFLOPs and latency_ms, the prune_model() counts and 'file'.
+
+    Examples:
+        >>> report = prune("runs/exp10/weights/best.pt", amount=0.3, imgsz=416)
+        >>> report["after"]["GFLOPs"] / report["before"]["GFLOPs"]
+    """
+    from ultralytics import YOLO, __version__
+
+    yolo = YOLO(model)
+    m = yolo.model.float().cpu()
+    before = _profile(m, imgsz)
+    counts = prune_model(m, amount=amount, round_to=round_to)
+    m.yaml["pruned"] = amount  # fine-tune this module instead of rebuilding it from the yaml
+    after = _profile(m, imgsz)
+
+    save = Path(save or Path(model).with_name(f"{Path(model).stem}-pruned.pt"))
+    ckpt = {k: v for k, v in (yolo.ckpt or {}).items() if k not in {"model", "ema", "optimizer", "updates"}}
+    report = {"before": before, "after": after, **counts, "amount": amount, "imgsz": imgsz, "file": str(save)}
+    torch.save(
+        {
+            **ckpt,
+            "model": deepcopy(m).half(),
+            "ema": None,
+            "optimizer": None,
+            "pruning": report,
+            "date": datetime.now().isoformat(),
+            "version": __version__,
+        },
+        save,
+    )
+
+    prefix = colorstr("Prune: ")
+    LOGGER.info(
+        f"{prefix}removed {counts['removed']}/{counts['channels']} channels in {counts['groups']} groups\n"
+        f"{'':>10}{'params':>12}{'GFLOPs':>10}{'CPU ms':>10}\n"
+        f"{'before':>10}{before['params']:>12}{before['GFLOPs']:>10.2f}{before['latency_ms']:>10.1f}\n"
+        f"{'after':>10}{after['params']:>12}{after['GFLOPs']:>10.2f}{after['latency_ms']:>10.1f}\n"
+        f"{prefix}saved {save}, fine-tune with YOLO('{save}').train(data=..., epochs=...)"
+    )
+    return report
@@ -0,0 +1,263 @@
+# Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
+"""
+Post-training int8 quantization of YOLO detection models for CPU inference with torch.ao FX graph mode quantization.
+
+The fused model is traced through FXModel and calibrated on images of the dataset val split. Convolutions, adds and
+concats of the backbone, neck and Detect branches then run on the int8 kernels of the x86 (fbgemm/onednn) or qnnpack
+quantized engine. SiLU, the CoordAtt and myCBAM attention blocks, whose sigmoid gates are multiplied into the features,
+the final 1x1 convs and DFL box decoding of the Detect head and the pooled FullFrameDetect head stay in float. The
+result is saved as a regular checkpoint holding a QuantizedModel, so it loads with `YOLO()` and AutoBackend like any
+other *.pt file.
+
+Usage:
+    from ultralytics.utils.quantize import quantize
+    report = quantize("best.pt", data="data.yaml", imgsz=416)  # writes best-int8.pt
+    YOLO("best-int8.pt").predict("wafer.jpg", device="cpu")
+"""
+
+import io
+import time
+import warnings
+from copy import deepcopy
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from ultralytics.nn.modules.block import C2f, CoordAtt, myCBAM
+from ultralytics.nn.modules.head import Detect, FullFrameDetect
+from ultralytics.utils import ARM64, LOGGER, colorstr
+from ultralytics.utils.torch_utils import FXModel, copy_attr, model_info
+
+__all__ = "QuantizedModel", "quantize"
+
+FLOAT_MODULES = (CoordAtt, myCBAM)  # sigmoid attention gates lose too much precision as quint8
+FLOAT_HEADS = (FullFrameDetect,)  # heads whose forward is not traceable, run in float on the dequantized features
+
+
+class QuantizedModel(nn.Module):
+    """
+    Int8 YOLO model converted from a fused float model, a drop-in replacement for the float model in checkpoints.
+
+    Quantized FX graphs do not survive pickling, so the model pickles as a weightless copy of the float model plus the
+    int8 state_dict, and unpickling converts the float copy again and loads the calibrated state into it.
+
+    Attributes:
+        graph (torch.fx.GraphModule): Converted int8 graph of the fused float model.
+        backend (str): Quantized engine the model was calibrated for, 'x86' or 'qnnpack'.
+        template (nn.Module): Fused float model with zero-stride placeholder weights the graph is rebuilt from, not a
+            registered submodule.
+        names (Dict[int, str]): Class names copied from the float model, as are 'nc', 'stride', 'yaml', 'task' and
+            'args'.
+
+    Examples:
+        >>> model = YOLO("best.pt").model.float().fuse().eval()
+        >>> qmodel = QuantizedModel(model, images=[torch.rand(8, 3, 416, 416)])
+        >>> y = qmodel(torch.rand(1, 3, 416, 416))
+    """
+
+    def __init__(self, model: nn.Module, images=(), backend: Optional[str] = None):
+        """
+        Quantize a fused float model with torch.ao FX graph mode post-training quantization.
+
+        Args:
+            model (nn.Module): Fused float YOLO detection model in eval mode, not modified.
+            images (Iterable[torch.Tensor]): Float calibration batches in BCHW layout scaled to 0-1, empty to only
+                build the graph structure before loading a calibrated state_dict.
+            backend (str, optional): Quantized engine, defaults to 'qnnpack' on ARM64 and 'x86' otherwise.
+        """
+        super().__init__()
+        copy_attr(self, model, include=("names", "nc", "stride", "yaml", "task", "args", "pt_path", "end2end"))
+        self.backend = backend or ("qnnpack" if ARM64 else "x86")
+        self.__dict__["template"] = _skeleton(model)  # outside _modules, so to(), float() and state_dict() skip it
+        self.graph = self._convert(deepcopy(model).float().cpu().eval(), images)
+
+    def _convert(self, model: nn.Module, images) -> torch.fx.GraphModule:
+        """Trace, calibrate and convert a float model copy, keeping FLOAT_MODULES and Detect decoding in float."""
+        from torch.ao.quantization import get_default_qconfig_mapping
+        from torch.ao.quantization.fx.custom_config import PrepareCustomConfig
+        from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+
+        torch.backends.quantized.engine = self.backend
+        qconfig_mapping = get_default_qconfig_mapping(self.backend)
+        for name, m in model.named_modules():
+            if isinstance(m, FLOAT_MODULES + FLOAT_HEADS):
+                qconfig_mapping.set_module_name(name, None)  # name prefixes also cover the ops of child modules
+        head_mapping = get_default_qconfig_mapping(self.backend).set_module_name("2", None)  # final 1x1 branch conv
+
+        heads = [m for m in model.modules() if isinstance(m, Detect)]
+        branches = []  # (ModuleList, index) of the Detect conv branches, quantized as separate graphs
+        for m in model.modules():
+            if isinstance(m, C2f):
+                m.forward = m.forward_split  # chunk() into a list is not traceable
+        x = next(iter(images), None)
+        x = torch.zeros(1, self.yaml.get("channels", 3), 64, 64) if x is None else x
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", (DeprecationWarning, UserWarning))  # torch.ao deprecation, empty observers
+            with torch.no_grad():
+                for m in heads:
+                    for branch in m.cv2, m.cv3:
+                        for i, b in enumerate(branch):
+                            branch[i] = prepare_fx(b, head_mapping, (x,))
+                            branches.append((branch, i))
+                leaves = {type(m) for m in model.modules() if isinstance(m, (Detect, *FLOAT_HEADS))}
+                custom = PrepareCustomConfig().set_non_traceable_module_classes(list(leaves))
+                prepared = prepare_fx(FXModel(model), qconfig_mapping, (x,), prepare_custom_config=custom)
+                for x in images:
+                    prepared(x)
+                for branch, i in branches:
+                    branch[i] = convert_fx(branch[i])
+                return convert_fx(prepared)
+
+    def __reduce__(self):
+        """Pickle the float template, backend, int8 state_dict and attributes instead of the FX graph."""
+        attrs = {k: v for k, v in self.__dict__.items() if not k.startswith("_") and k not in {"template", "graph"}}
+        return _rebuild, (self.template, self.backend, self.graph.state_dict(), attrs)
+
+    def forward(self, x: torch.Tensor, *args, **kwargs) -> torch.Tensor:
+        """Run the int8 graph on a float image batch, the augment/visualize/embed options of YOLO models are ignored."""
+        if torch.backends.quantized.engine != self.backend:
+            torch.backends.quantized.engine = self.backend
+        return self.graph(x.float())
+
+    def fuse(self, verbose: bool = True) -> "QuantizedModel":
+        """Return the model unchanged, BatchNorm layers were folded before quantization."""
+        return self
+
+    def is_fused(self, thresh: int = 10) -> bool:
+        """Return True, the model is always fused."""
+        return True
+
+    def info(self, detailed: bool = False, verbose: bool = True, imgsz: int = 640):
+        """Print information about the float parameters left in the model."""
+        return model_info(self, detailed=detailed, verbose=verbose, imgsz=imgsz)
+
+
+def _skeleton(model: nn.Module) -> nn.Module:
+    """Return a copy of a model whose parameters and buffers are zero-stride views of one element, for pickling."""
+    model = deepcopy(model)
+    for m in model.modules():
+        for tensors in m._parameters, m._buffers:
+            for k, v in tensors.items():
+                if v is not None:
+                    t = torch.zeros((), dtype=v.dtype).expand_as(v)
+                    tensors[k] = nn.Parameter(t, requires_grad=False) if isinstance(v, nn.Parameter) else t
+    return model
+
+
+def _rebuild(template: nn.Module, backend: str, state: Dict[str, Any], attrs: Dict[str, Any]) -> QuantizedModel:
+    """Unpickle a QuantizedModel by converting its float template again and loading the calibrated int8 state."""
+    model = QuantizedModel(template.float(), backend=backend)
+    model.graph.load_state_dict(state)
+    model.__dict__.update(attrs)
+    return model
+
+
+def _calibration_images(data: str, imgsz: int, n: int, batch: int = 8):
+    """Return up to `n` letterboxed val split images of a dataset as float batches for calibration."""
+    from ultralytics.data import build_dataloader
+    from ultralytics.data.dataset import YOLODataset
+    from ultralytics.data.utils import check_det_dataset
+
+    info = check_det_dataset(data)
+    dataset = YOLODataset(info["val"], data=info, imgsz=imgsz, augment=False, batch_size=batch)
+    if len(dataset) < 300 and len(dataset) < n:
+        LOGGER.warning(f"{colorstr('Quantize: ')}>300 images recommended for INT8 calibration, found {len(dataset)}")
+    images, seen = [], 0
+    for b in build_dataloader(dataset, batch=batch, workers=0, shuffle=False):
+        images.append(b["img"][: n - seen].float() / 255)
+        seen += len(images[-1])
+        if seen >= n:
+            break
+    return images
+
+
+def _profile(model: nn.Module, imgsz: int, runs: int = 10) -> Dict[str, float]:
+    """Return the serialized size and median CPU latency at batch size 1 of a model."""
+    buffer = io.BytesIO()
+    torch.save(model, buffer)
+    x = torch.zeros(1, 3, imgsz, imgsz)
+    with torch.inference_mode():
+        for _ in range(3):
+            model(x)
+        t = []
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            model(x)
+            t.append((time.perf_counter() - t0) * 1000)
+    return {"size_mb": round(buffer.getbuffer().nbytes / 2**20, 2), "latency_ms": round(float(np.median(t)), 2)}
+
+
+def quantize(
+    model: Union[str, Path] = "best.pt",
+    data: str = "data.yaml",
+    imgsz: int = 640,
+    images: int = 256,
+    backend: Optional[str] = None,
+    save: Optional[Union[str, Path]] = None,
+) -> Dict[str, Any]:
+    """
+    Quantize a trained detection checkpoint to int8 on CPU and save it with a before/after report.
+
+    Args:
+        model (str | Path): Path to the trained *.pt checkpoint.
+        data (str): Dataset YAML whose val split provides the calibration images.
+        imgsz (int): Calibration and profiling image size, use the inference image size.
+        images (int): Number of calibration images.
+        backend (str, optional): Quantized engine, defaults to 'qnnpack' on ARM64 and 'x86' otherwise.
+        save (str | Path, optional): Output checkpoint, defaults to '<model>-int8.pt' next to the input.
+
+    Returns:
+        (Dict[str, Any]): 'before' and 'after' size_mb and latency_ms, the max absolute output 'error' on the first
+            calibration batch, the calibration settings and 'file'.
+
+    Examples:
+        >>> report = quantize("runs/exp10/weights/best.pt", data="data.yaml", imgsz=416)
+        >>> YOLO(report["file"]).val(data="data.yaml", imgsz=416, device="cpu")
+    """
+    from ultralytics import YOLO, __version__
+
+    yolo = YOLO(model)
+    m = yolo.model.float().cpu().fuse(verbose=False).eval()
+    calib = _calibration_images(data, imgsz, images)
+    qm = QuantizedModel(m, calib, backend=backend)
+    with torch.inference_mode():
+        error = (m(calib[0])[0] - qm(calib[0])[0]).abs().max().item()
+    before, after = _profile(m, imgsz), _profile(qm, imgsz)
+
+    save = Path(save or Path(model).with_name(f"{Path(model).stem}-int8.pt"))
+    ckpt = {k: v for k, v in (yolo.ckpt or {}).items() if k not in {"model", "ema", "optimizer", "updates"}}
+    report = {
+        "before": before,
+        "after": after,
+        "error": round(error, 5),
+        "images": sum(len(x) for x in calib),
+        "imgsz": imgsz,
+        "backend": qm.backend,
+        "file": str(save),
+    }
+    torch.save(
+        {
+            **ckpt,
+            "model": qm,
+            "ema": None,
+            "optimizer": None,
+            "quantization": report,
+            "date": datetime.now().isoformat(),
+            "version": __version__,
+        },
+        save,
+    )
+
+    prefix = colorstr("Quantize: ")
+    LOGGER.info(
+        f"{prefix}calibrated {report['images']} images on '{qm.backend}', max output error {report['error']}\n"
+        f"{'':>10}{'MB':>10}{'CPU ms':>10}\n"
+        f"{'float':>10}{before['size_mb']:>10.1f}{before['latency_ms']:>10.1f}\n"
+        f"{'int8':>10}{after['size_mb']:>10.1f}{after['latency_ms']:>10.1f}\n"
+        f"{prefix}saved {save}, run with YOLO('{save}').predict(..., device='cpu')"
+    )
+    return report
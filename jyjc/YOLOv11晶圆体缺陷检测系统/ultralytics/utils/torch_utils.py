@@ -650,13 +650,15 @@ class ModelEMA:
         updates (int): Number of EMA updates.
         decay (function): Decay function that determines the EMA weight.
         enabled (bool): Whether EMA is enabled.
+        interval (int): Number of update calls between EMA steps.
+        foreach (bool): Whether to update all tensors with multi-tensor `torch._foreach_*` kernels.
 
     References:
         - https://github.com/rwightman/pytorch-image-models
         - https://www.tensorflow.org/api_docs/python/tf/train/ExponentialMovingAverage
     """
 
-    def __init__(self, model, decay=0.9999, tau=2000, updates=0):
+    def __init__(self, model, decay=0.9999, tau=2000, updates=0, interval=1, foreach=True):
         """
         Initialize EMA for 'model' with given arguments.
 
@@ -665,6 +667,9 @@ class ModelEMA:
             decay (float, optional): Maximum EMA decay rate.
             tau (int, optional): EMA decay time constant.
             updates (int, optional): Initial number of updates.
+            interval (int, optional): Average every `interval` update calls with the decay raised to that power, so the
+                time constant is unchanged while the EMA costs `interval` times less.
+            foreach (bool, optional): Update all tensors with multi-tensor kernels instead of a Python loop.
         """
         self.ema = deepcopy(de_parallel(model)).eval()  # FP32 EMA
         self.updates = updates  # number of EMA updates
@@ -672,6 +677,27 @@ class ModelEMA:
         for p in self.ema.parameters():
             p.requires_grad_(False)
         self.enabled = True
+        self.interval = max(int(interval), 1)
+        self.foreach = foreach
+        self._params = None  # (model, EMA parameters, model parameters), gathered once on the first update
+
+    def _gather(self, model):
+        """
+        Return the floating point EMA and model state tensors as two aligned lists.
+
+        Parameter objects are cached per model and their current `.data` read on every call, as half()/float()/to()
+        swap parameter storage in place. Buffers are replaced by those conversions, so they are gathered every call.
+        """
+        if self._params is None or self._params[0] is not model:
+            mp = dict(model.named_parameters())
+            keys = [k for k, p in self.ema.named_parameters() if p.dtype.is_floating_point]  # FP16 and FP32
+            ep = dict(self.ema.named_parameters())
+            self._params = (model, [ep[k] for k in keys], [mp[k] for k in keys])
+        mb, eb = dict(model.named_buffers()), dict(self.ema.named_buffers())
+        keys = [k for k, v in eb.items() if v.dtype.is_floating_point]
+        ema = [p.data for p in self._params[1]] + [eb[k] for k in keys]
+        msd = [p.detach() for p in self._params[2]] + [mb[k].detach() for k in keys]
+        return ema, msd
 
     def update(self, model):
         """
@@ -682,14 +708,19 @@ class ModelEMA:
         """
         if self.enabled:
             self.updates += 1
-            d = self.decay(self.updates)
-
-            msd = de_parallel(model).state_dict()  # model state_dict
-            for k, v in self.ema.state_dict().items():
-                if v.dtype.is_floating_point:  # true for FP16 and FP32
+            if self.updates % self.interval:
+                return
+            d = self.decay(self.updates) ** self.interval  # equivalent decay of `interval` skipped steps
+
+            ema, msd = self._gather(de_parallel(model))
+            if self.foreach:
+                torch._foreach_mul_(ema, d)
+                torch._foreach_add_(ema, msd, alpha=1 - d)
+            else:
+                for v, m in zip(ema, msd):
                     v *= d
-                    v += (1 - d) * msd[k].detach()
-                    # assert v.dtype == msd[k].dtype == torch.float32, f'{k}: EMA {v.dtype},  model {msd[k].dtype}'
+                    v += (1 - d) * m
+                    # assert v.dtype == m.dtype == torch.float32, f'EMA {v.dtype},  model {m.dtype}'
 
     def update_attr(self, model, include=(), exclude=("process_group", "reducer")):
         """